@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Program: benchmark
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Headless benchmark of the simulation kernels at increasing particle numbers.
+Each case times one kernel per time-step; the free flight (or walls) that
+keeps the state changing between calls is not timed. Circles fill a fixed
+area fraction, so the domain grows with N.
+
+    python benchmark.py --sizes 100 1000 10000 100000 --out bench.json
+    python benchmark.py --compare bench.json          # ratios vs. baseline
+    python benchmark.py --startup                     # cold start of the scripts
+"""
+
+### IMPORTS
+import argparse
+import json
+import math as m
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from sim2d import (Particles, VerletList, Infection, Epidemic, boxBoundaries, circleBoundaries, collision,
+                   kernels)
+
+
+### SETTINGS
+phi    = 0.2     # Area fraction covered by circles
+radius = 0.05    # UNITS: meters
+vMax   = 10.0    # UNITS: m/s   Velocity components are uniform in [-vMax, vMax].
+gravity = -9.8   # UNITS: m/s^2
+scripts = ('ghost_box', 'ghost_circle', 'hard_box', 'hard_diffmass_box',
+           'hard_gravity_box', 'hard_circle', 'pentagon_zombie_apocalypse')
+
+
+### FUNCTIONS
+def boxStore(n,rng,radii=None):
+    """
+    n circles at random in a square box (overlaps allowed) with the area
+    fraction phi.
+
+    Returns
+    -------
+    Particles, TUPLE
+        Particle store and box walls (bL, bR, bD, bU).
+
+    """
+    rad = radius if radii is None else radii
+    L = m.sqrt(np.sum(np.pi*np.broadcast_to(rad, (n,))**2)/phi)
+    x, y = rng.uniform(0.0, L, (2, n))
+    vx, vy = rng.uniform(-vMax, vMax, (2, n))
+    return Particles(x, y, vx, vy, rad), (0.0, L, 0.0, L)
+
+def circleStore(n,rng):
+    """
+    n circles at random in a bounding circle with the area fraction phi.
+
+    Returns
+    -------
+    Particles, DOUBLE
+        Particle store and radius of bounding circle.
+
+    """
+    bcR = radius*m.sqrt(n/phi)
+    rho = (bcR - radius)*np.sqrt(rng.uniform(0.0, 1.0, n))
+    a = rng.uniform(0.0, 2.0*np.pi, n)
+    vx, vy = rng.uniform(-vMax, vMax, (2, n))
+    return Particles(rho*np.cos(a), rho*np.sin(a), vx, vy, radius), bcR
+
+def ghostCase(n,rng):
+    pars, box = boxStore(n, rng)
+    dt = pars.timeStep()
+    return (lambda: pars.move(dt)), (lambda: boxBoundaries(pars, *box, dt))
+
+def boxWallCase(n,rng):
+    pars, box = boxStore(n, rng)
+    dt = pars.timeStep()
+    return (lambda: boxBoundaries(pars, *box)), (lambda: pars.move(dt))
+
+def circleWallCase(n,rng):
+    pars, bcR = circleStore(n, rng)
+    dt = pars.timeStep()
+    return (lambda: circleBoundaries(pars, bcR, dt)), (lambda: pars.move(dt))
+
+def collisionCase(n,rng):
+    pars, box = boxStore(n, rng)
+    dt = pars.timeStep()
+    def advance():
+        pars.move(dt)
+        boxBoundaries(pars, *box)
+    return (lambda: collision(pars)), advance
+
+def verletCollisionCase(n,rng):
+    pars, box = boxStore(n, rng)
+    dt = pars.timeStep()
+    nl = VerletList(2.0*2.0*radius)          # Skin of two diameters
+    def advance():
+        pars.move(dt)
+        boxBoundaries(pars, *box)
+    return (lambda: collision(pars, neighbors=nl)), advance
+
+def massCollisionCase(n,rng):
+    pars, box = boxStore(n, rng, radius*rng.uniform(0.5, 1.5, n))
+    dt = pars.timeStep()
+    def advance():
+        pars.move(dt)
+        boxBoundaries(pars, *box)
+    return (lambda: collision(pars)), advance
+
+def gravityCase(n,rng):
+    pars, box = boxStore(n, rng)
+    dt = pars.timeStep(4.0)
+    a = np.array([0.0, gravity])
+    return (lambda: pars.move(dt, a)), (lambda: boxBoundaries(pars, *box))
+
+def _pentagon(n):
+    """
+    Pentagon hallway of the zombie script and the person radius giving the
+    area fraction phi (the script's Particle.radius is left as it is).
+    """
+    import pentagon_zombie_apocalypse as pza
+    return pza.Pentagon(), m.sqrt(phi*pza.Pentagon.area/(n*np.pi))
+
+def pentagonWallCase(n,rng):
+    geom, rad = _pentagon(n)
+    # Uniform in the annulus between the inscribed and circumscribed circles.
+    rI, rO = geom.vecMagI + rad, geom.vecMagO - rad
+    rho = np.sqrt(rng.uniform(rI**2, rO**2, n))
+    a = rng.uniform(0.0, 2.0*np.pi, n)
+    vx, vy = rng.uniform(-vMax, vMax, (2, n))
+    pars = Particles(rho*np.cos(a), rho*np.sin(a), vx, vy, rad)
+    dt = pars.timeStep()
+    return (lambda: geom.boundaryCheck(pars)), (lambda: pars.move(dt))
+
+def infectionCase(n,rng):
+    pars, box = boxStore(n, rng)
+    pars.tag[rng.uniform(0.0, 1.0, n) < 0.01] = 1     # Infected
+    infection = Infection()
+    infection.attach(pars)
+    dt = pars.timeStep()
+    def advance():
+        pars.move(dt)
+        boxBoundaries(pars, *box)
+    return (lambda: infection(pars)), advance
+
+def epidemicCase(n,rng):
+    pars, box = boxStore(n, rng)
+    pars.tag[rng.uniform(0.0, 1.0, n) < 0.01] = Epidemic.INFECTED
+    epidemic = Epidemic(pInfect=0.5, incubation=0.05, infectious=0.5)
+    epidemic.attach(pars)
+    dt = pars.timeStep()
+    def advance():
+        pars.move(dt)
+        boxBoundaries(pars, *box)
+    return (lambda: epidemic(pars)), advance
+
+CASES = {
+    'ghost':          ghostCase,          # ghost_box/ghost_circle free flight
+    'box_walls':      boxWallCase,        # hard_box wall reflection
+    'circle_walls':   circleWallCase,     # hard_circle/ghost_circle wall reflection
+    'collisions':     collisionCase,      # hard_box pair collisions
+    'verlet_collisions': verletCollisionCase, # pair collisions with a Verlet list
+    'mass_collisions': massCollisionCase, # hard_diffmass_box pair collisions
+    'gravity':        gravityCase,        # hard_gravity_box leapfrog
+    'pentagon_walls': pentagonWallCase,   # Pentagon.boundaryCheck
+    'infection':      infectionCase,      # Infection (one infected state)
+    'epidemic':       epidemicCase,       # Epidemic (pentagon zombification, SEIR)
+}
+
+def bench(case,n,minTime=1.0,maxSteps=1000,seed=0):
+    """
+    Time one kernel.
+
+    Parameters
+    ----------
+    case : STRING
+        Key of CASES.
+    n : INT
+        Number of particles.
+    minTime : DOUBLE, optional
+        Kernel time [s] after which to stop. The default is 1.0.
+    maxSteps : INT, optional
+        Maximum number of time-steps. The default is 1000.
+    seed : INT, optional
+        Random seed of the initial state. The default is 0.
+
+    Returns
+    -------
+    DICT
+        kernel, n, steps, seconds, stepsPerSec, updatesPerSec.
+
+    """
+    kernel, advance = CASES[case](n, np.random.default_rng(seed))
+    kernel()                             # Warm up (JIT compilation, caches).
+    advance()
+    steps, total = 0, 0.0
+    while steps < maxSteps and (steps < 3 or total < minTime):
+        t0 = time.perf_counter()
+        kernel()
+        total += time.perf_counter() - t0
+        steps += 1
+        advance()
+    return dict(kernel=case, n=n, steps=steps, seconds=total,
+                stepsPerSec=steps/total, updatesPerSec=n*steps/total)
+
+def startup(script,runs=5,numpy=False):
+    """
+    Cold-start time of a short headless job: a fresh interpreter running one
+    time-step of a script (imports, set-up, first kernel calls), best of
+    runs. Script None times the floor, an interpreter importing NumPy.
+
+    Parameters
+    ----------
+    script : STRING
+        Script name (see scripts), or None.
+    runs : INT, optional
+        Number of runs. The default is 5.
+    numpy : BOOL, optional
+        Skip numba (SIM2D_NUMBA=0). The default is False.
+
+    Returns
+    -------
+    DICT
+        script, numba, seconds.
+
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    cmd = [sys.executable, '-c', 'import numpy']
+    if script is not None:
+        cmd = [sys.executable, script + '.py', '--headless', '--steps', '1']
+    env = dict(os.environ, SIM2D_NUMBA='0') if numpy else None
+    best = np.inf
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=here, env=env, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - t0)
+    return dict(script=script or 'numpy', numba=kernels.available and not numpy, seconds=best)
+
+def environment():
+    """
+    Versions and settings the results depend on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return dict(date=time.strftime('%Y-%m-%d %H:%M:%S'), commit=commit,
+                python=platform.python_version(), numpy=np.__version__,
+                numba=kernels.numba.__version__ if kernels.available else None,
+                jit=kernels.useJit, machine=platform.machine(),
+                processor=platform.processor())
+
+def report(results,base=None,header=True):
+    """
+    Print a results table (with the speed-up over base results if given).
+    """
+    old = {}
+    if base is not None:
+        old = {(b['kernel'], b['n']): b for b in base['results']}
+    if header:
+        print('%-16s %8s %7s %12s %16s %s' % ('kernel', 'N', 'steps', 'steps/s',
+                                              'updates/s', 'vs. base' if old else ''))
+    for res in results:
+        line = '%-16s %8i %7i %12.1f %16.4g' % (res['kernel'], res['n'], res['steps'],
+                                                res['stepsPerSec'], res['updatesPerSec'])
+        b = old.get((res['kernel'], res['n']))
+        if b is not None:
+            line += '  x%.2f' % (res['stepsPerSec']/b['stepsPerSec'])
+        print(line)
+### END: FUNCTIONS
+
+
+if '__main__' == __name__:
+    parser = argparse.ArgumentParser(prog='benchmark')
+    parser.add_argument('--kernels', nargs='+', default=list(CASES), choices=list(CASES),
+                        help='kernels to time (default: all)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='particle numbers (default: 100 1000 10000 100000)')
+    parser.add_argument('--time', type=float, default=1.0,
+                        help='kernel seconds per case (default %(default)s)')
+    parser.add_argument('--max-steps', type=int, default=1000,
+                        help='time-steps per case at most (default %(default)s)')
+    parser.add_argument('--numpy', action='store_true',
+                        help='time the NumPy kernels even if numba is installed')
+    parser.add_argument('--startup', action='store_true',
+                        help='time the cold start of the headless scripts instead')
+    parser.add_argument('--out', default=None, help='write results to this JSON file')
+    parser.add_argument('--compare', default=None,
+                        help='JSON results to compare against')
+    args = parser.parse_args()
+    if args.startup:
+        results = []
+        print('%-28s %6s %10s' % ('script', 'numba', 'seconds'))
+        for script in (None,) + scripts:
+            results.append(startup(script, numpy=args.numpy))
+            print('%-28s %6s %10.3f' % tuple(results[-1].values()))
+        if args.out:
+            with open(args.out, 'w') as f:
+                json.dump(dict(environment=environment(), startup=results), f, indent=1)
+        sys.exit()
+    if args.numpy:
+        kernels.useJit = False
+    base = None
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        if 'results' not in base:
+            parser.error('--compare: %s holds no kernel results (a --startup file?)'
+                         % args.compare)
+    results = []
+    for case in args.kernels:
+        for n in args.sizes:
+            results.append(bench(case, n, args.time, args.max_steps))
+            report(results[-1:], base, header=len(results) == 1)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(dict(environment=environment(), results=results), f, indent=1)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Program: ensemble
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Run many seeded replicas of a scenario (any script with a module level
+replica(seed) function) on a process pool and aggregate their summary time
+series (see sim2d.ensemble).
+
+    python ensemble.py pentagon_zombie_apocalypse --replicas 200 --steps 2000 --tmax 20 --out zombies
+    python ensemble.py hard_box --replicas 500 --steps 1000 --stride 10 --out hb_ens
+"""
+
+### IMPORTS
+import argparse
+import importlib
+import time
+import numpy as np
+from sim2d.ensemble import runEnsemble, runBatch
+
+
+### FUNCTIONS
+def report(ens,q):
+    """
+    Print the statistics of the last frame of every summary key.
+    """
+    print('%-10s %12s %12s %s' % ('key', 'mean', 'std', '  '.join('q%g' % p for p in q)))
+    for key, s in ens.stats(q).items():
+        print('%-10s %12.5g %12.5g %s' % (key, s['mean'][-1], s['std'][-1],
+                                          '  '.join('%.5g' % v for v in s['q'][:,-1])))
+### END: FUNCTIONS
+
+
+if '__main__' == __name__:
+    parser = argparse.ArgumentParser(prog='ensemble')
+    parser.add_argument('scenario', help='script (module) with a replica(seed) function')
+    parser.add_argument('--replicas', type=int, default=100,
+                        help='number of replicas (default %(default)s)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first replica; the others count up (default %(default)s)')
+    parser.add_argument('--steps', type=int, default=1000,
+                        help='time-steps per replica (default %(default)s)')
+    parser.add_argument('--stride', type=int, default=1,
+                        help='time-steps per snapshot (default %(default)s)')
+    parser.add_argument('--tmax', type=float, default=None,
+                        help='sample the summaries at --frames common times up to '
+                             'this time [s] instead of per snapshot')
+    parser.add_argument('--frames', type=int, default=101,
+                        help='common times with --tmax (default %(default)s)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--quantiles', type=float, nargs='+', default=[0.05, 0.5, 0.95],
+                        help='quantiles (default: 0.05 0.5 0.95)')
+    parser.add_argument('--batch', action='store_true',
+                        help='step all replicas together in this process '
+                             '(scenario needs a batch(stores) function)')
+    parser.add_argument('--out', default=None, help='results directory')
+    args = parser.parse_args()
+    scenario = importlib.import_module(args.scenario)
+    seeds = args.seed + np.arange(args.replicas)
+    times = None if args.tmax is None else np.linspace(0.0, args.tmax, args.frames)
+    t0 = time.perf_counter()
+    progress = lambda k, done: print('Replica %i done (%i/%i)' % (k, done, args.replicas))
+    if args.batch:
+        ens = runBatch(scenario.replica, scenario.batch, seeds, args.steps, args.stride,
+                       args.out, times, q=args.quantiles, progress=progress)
+    else:
+        ens = runEnsemble(scenario.replica, seeds, args.steps, args.stride, args.out,
+                          args.workers, times, q=args.quantiles, progress=progress)
+    print('%i replicas in %.1f s' % (args.replicas, time.perf_counter() - t0))
+    report(ens, args.quantiles)
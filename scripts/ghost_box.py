@@ -10,19 +10,18 @@ Created: Apr 2020
 import random
 import math as m
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.ticker import AutoMinorLocator
-from matplotlib import cm
+from sim2d import Particles, Engine, BoxWalls, Ghost
+from sim2d.placement import poissonDisk
+from sim2d.runner import runArgs, snapshots, profiler, report
 
 
 ### SET COLOR MAP
-# colors = cm.get_cmap('gist_rainbow')
-colors = cm.get_cmap('seismic')
+# cmap = 'gist_rainbow'
+cmap = 'seismic'
 
 
 ### CLASSES
-class GC:
+class GC(Engine):
     """
     GC: Ghost Circle Class
 
@@ -30,10 +29,12 @@ class GC:
         NOTE: Circles do interact with the walls of the box (Ghosts are trapped
               by magic and stuff. They bounce of walls like Sir Isaac Newton
               told us they should).
+        NOTE: All ghosts live in one Particles store (one array row per
+              circle) and are moved together.
     """
     # Class Variables
-    numInstances = 0         # #         Number of instanciations of this class.
-    dt     = 0.01            # seconds   Time-Step
+    dtMax  = 0.01            # seconds   Time-Step (fixed)
+    analytic = False         #           Closed-form free flight (exact at any time-step).
     boxU   = 10.0            # meters    Top of Box (Up)
     boxD   = 0.0             # meters    Bottom of Box (Down)
     boxL   = 0.0             # meters    Left Side of Box (Left)
@@ -42,172 +43,76 @@ class GC:
     figW   = 8               # inches    Width of Figure (Plot)
     figH   = 8               # inches    Height of Figure (Plot)
 
-    def __init__(self,x=0,y=0,vx=0,vy=0,r=0.1):
+    def __init__(self,x,y,vx,vy,r=0.1):
         """
         Ghost Circle Constructor
 
         Parameters
         ----------
-        x : DOUBLE, optional
-            X-coordinate of circle center [m]. The default is 0.
-        y : DOUBLE, optional
-            Y-coordinate of circle center [m]. The default is 0.
-        vx : DOUBLE, optional
-            X-component of circle velocity [m/s].The default is 0.
-        vy : DOUBLE, optional
-            Y-component of circle velocity [m/s]. The default is 0.
-        r : DOUBLE, optional
-            Radius of circle [m]. The default is 0.1.
+        x : ARRAY
+            X-coordinates of circle centers [m].
+        y : ARRAY
+            Y-coordinates of circle centers [m].
+        vx : ARRAY
+            X-components of circle velocities [m/s].
+        vy : ARRAY
+            Y-components of circle velocities [m/s].
+        r : DOUBLE or ARRAY, optional
+            Radius of circles [m]. The default is 0.1.
 
         Returns
         -------
         None.
 
         """
-        GC.numInstances += 1
-        self.x  = x
-        self.xC = x/GC.boxR
-        self.y  = y
-        self.vx = vx
-        self.vy = vy
-        self.r  = r
-        self.t  = 0.0
-        v = m.hypot(vx,vy)
-        dt = r/(2.0*v)          # Time step control. Prevent circle centers
-                                # from crossing in a single time-step.
-        GC.dt = min(GC.dt,dt)
-        self.graphic = plt.Circle((x,y), radius=r, fill=False,
-                                  color=colors(self.xC), linewidth=3)
-    def __del__(self):
-        """
-        Ghost Circle Destructor
-        """
-        GC.numInstances -= 1
-
-    def move(self):
-        """
-        Move ghost (circle) according to its velocity.
-        """
-        dt = GC.dt
-        # X
-        self.x += self.vx*dt
-        # Y
-        self.y += self.vy*dt
-        # Collision with wall?
-        self.__boundaries()
-        # Time
-        self.t += dt
-        # Graphic
-        self.__updateGraphic()
-
-    def __boundaries(self):
-        dt = GC.dt
-        x  = self.x
-        y  = self.y
-        vx = self.vx
-        vy = self.vy
-        r  = self.r
-        bD = GC.boxD
-        bU = GC.boxU
-        bL = GC.boxL
-        bR = GC.boxR
-        # Y
-        if( y < bD+r ):
-            tD = dt - abs( (bD - y)/vy )
-            self.vy *= -1.0
-            self.y = bD + vy*tD + r
-        elif( y > bU-r ):
-            tU = dt - abs( (bU - y)/vy )
-            self.vy *= -1.0
-            self.y = bU + vy*tU - r
-        # X
-        if( x < bL+r ):
-            tL = dt - abs( (bL - x)/vx )
-            self.vx *= -1.0
-            self.x = bL + vx*tL + r
-        elif( x > bR-r ):
-            tR = dt - abs( (bR - x)/vx )
-            self.vx *= -1.0
-            self.x = bR + vx*tR - r
-
-    def __updateGraphic(self):
-        """
-        Update graphic after a move.
-        """
-        self.graphic = plt.Circle((self.x,self.y), radius=self.r,
-                                  color=colors(self.xC),
-                                  fill=False, linewidth=3)
+        # fac=2.0: Time step control. Prevent circle centers from crossing in
+        #          a single time-step.
+        Engine.__init__(self,Particles(x,y,vx,vy,r),
+                        BoxWalls(GC.boxL,GC.boxR,GC.boxD,GC.boxU,advance=True),Ghost(),
+                        fac=2.0,dtMax=GC.dtMax,adaptive=False,analytic=GC.analytic)
+        self.xC = self.pars.x/GC.boxR
 # END: GC
 ### END: CLASSES
 
 
 ### FUNCTIONS
-# correctIC
-def correctIC(gcList):
+# randomIC
+def randomIC(n,r):
     """
-    Look for overlapping circles after initial conditions/set-up
-    as random number generator doesn't know any better (if random
-    positions are chosen). IMPORTANT: As this check is only
-    pair-wise it will not work for a large number of particles
-    as multiple circles will simultaneously overlap.
+    Random initial positions that do not overlap (Poisson-disk sampling,
+    see sim2d.placement), fast even for a large number of circles.
 
     NOTE: Unused. Included for user who may wish to use a random
-          initial distribution of circles (see limitations above).
+          initial distribution of circles instead of the grid.
 
     Parameters
     ----------
-    gcList : GC
-        Python list of GC instances.
+    n : INT
+        Number of circles.
+    r : DOUBLE
+        Radius of circles [m].
 
     Returns
     -------
-    None.
+    xList, yList : LISTS
+        Coordinates of circle centers [m].
 
     """
-    for i in np.arange(GC.numInstances-1):
-        for j in np.arange(i+1,GC.numInstances):
-            drx = gcList[i].x - gcList[j].x
-            dry = gcList[i].y - gcList[j].y
-            dr = m.hypot(drx,dry)
-            d = gcList[i].r + gcList[j].r
-            if( dr < d ):
-                offset = (d - dr)/2.0
-                dx = offset*drx/dr
-                dy = offset*dry/dr
-                gcList[i].x += dx
-                gcList[i].y += dy
-                gcList[j].x -= dx
-                gcList[j].y -= dy
-# END: correctIC
+    xy = poissonDisk(n,r,box=(GC.boxL,GC.boxR,GC.boxD,GC.boxU))
+    return list(xy[:,0]), list(xy[:,1])
+# END: randomIC
 
 ## Animation Functions:
 def init():
-    patches = []
+    patches = renderer.update(gc.pars.r)
+    patches.append(tText)
     return patches
 
-def animate(i):
-    ax.clear()
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Ghost Circles')
-    ax.axis('scaled')
-    ax.set_xlim([GC.boxL,GC.boxR])
-    ax.set_ylim([GC.boxD,GC.boxU])
-    tText = ax.text(4, 9.5, '')
-
-    patches = []
-    if( i > 0 ):
-        # 10 time-steps per graphics update
-        for j in np.arange(10):
-            for gc in gcList:
-                gc.move()
-    # Graphics update
-    s = 'Time = %.2f s' % gcList[0].t
+def animate(snap):
+    # Graphics update (the physics is advanced by the snapshot generator)
+    patches = renderer.update(snap['r'])
+    s = 'Time = %.2f s' % snap['t']
     tText.set_text(s)
-    for gc in gcList:
-        patches.append(ax.add_patch(gc.graphic))
     patches.append(tText)
     return patches
 ## END: Animation Functions
@@ -215,12 +120,15 @@ def animate(i):
 
 
 if __name__ == '__main__':
+    args = runArgs('ghost_box',steps=1000,stride=10,analytic=True)
+    if args.analytic:
+        GC.analytic, GC.dtMax = True, args.analytic
     numCircles = 3                     # Number of circles along an axis. Total number of
                                        # circles is numCircles**2
     dW = GC.boxR/(numCircles+1)
     dH = GC.boxU/(numCircles+1)
     rC = m.hypot(dW, dH)/10.0          # Diameter of circle is 1/5 of initial circle spacing.
-    gcList = []
+    xList, yList, vxList, vyList = [], [], [], []
     for i in np.arange(numCircles):
         for j in np.arange(numCircles):
             x = dW*(j+1)
@@ -232,23 +140,47 @@ if __name__ == '__main__':
             #       adjustments to the physics.
             vxR = random.uniform(-10,10)   # Want ghosts to move faster? Crank this up!
             vyR = random.uniform(-10,10)   # Want ghosts to move faster? Crank this up!
-            gcList.append( GC(x,y,vxR,vyR,rC) )
-    fig, ax = plt.subplots()
-    fig.set_size_inches(GC.figW,GC.figH)
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Ghost Circles')
-    ax.axis('scaled')
-    ax.set_xlim([GC.boxL,GC.boxR])
-    ax.set_ylim([GC.boxD,GC.boxU])
-    tText = ax.text(4, 9.5, 'Time = ')
-    ani = animation.FuncAnimation(fig, animate, frames=101,
-                                  interval=100, blit=True,
-                                  init_func=init, repeat=False)
-
-    # Uncomment next two lines to write file to disk.
-    # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
-    # ani.save('../movies/ghost_box.gif',writer=pwriter)
-    plt.show()
+            xList.append(x)
+            yList.append(y)
+            vxList.append(vxR)
+            vyList.append(vyR)
+    # xList, yList = randomIC(len(xList),rC)   # Random positions instead of the grid.
+    gc = GC(xList,yList,vxList,vyList,rC)
+    if args.headless:
+        gc.runHeadless(args,static=dict(color=gc.xC),
+                       info=dict(title='Ghost Circles',cmap=cmap,linewidth=3))
+    else:
+        # Graphics are only imported to animate.
+        import matplotlib.animation as animation
+        from matplotlib.ticker import AutoMinorLocator
+        from sim2d.render import ParticleRenderer, pyplot
+        plt = pyplot()
+        colors = plt.get_cmap(cmap)
+        fig, ax = plt.subplots()
+        fig.set_size_inches(GC.figW,GC.figH)
+        ax.grid(b=True, which='major', color='lightgrey')
+        # ax.grid(b=True, which='minor', color='lightgrey')
+        ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.set_title('Ghost Circles')
+        ax.axis('scaled')
+        ax.set_xlim([GC.boxL,GC.boxR])
+        ax.set_ylim([GC.boxD,GC.boxU])
+        tText = ax.text(4, 9.5, 'Time = ')
+        renderer = ParticleRenderer(ax,gc.pars.r,gc.pars.radius,colors(gc.xC),
+                                    fill=False,linewidth=3)
+        prof = profiler(args)             # --profile/--trace: time the physics and the graphics.
+        gc.profile(prof)
+        if prof is not None:
+            animate = prof.wrap('render',animate)
+        frames = snapshots(gc.step,gc.pars,args.steps,args.stride,copy=False)
+        ani = animation.FuncAnimation(fig, animate, frames=frames,
+                                      save_count=args.steps//args.stride+1,
+                                      interval=100, blit=True,
+                                      init_func=init, repeat=False)
+
+        # Uncomment next two lines to write file to disk.
+        # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
+        # ani.save('../movies/ghost_box.gif',writer=pwriter)
+        plt.show()
+        report(prof,args)
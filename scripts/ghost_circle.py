@@ -10,206 +10,101 @@ Created: Apr 2020
 import random
 import math as m
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.ticker import AutoMinorLocator
-from matplotlib import cm
+from sim2d import Particles, Engine, CircleWalls, Ghost
+from sim2d.placement import poissonDisk
+from sim2d.runner import runArgs, snapshots, profiler, report
 
 
 ### SET COLOR MAP
-colors = cm.get_cmap('gist_rainbow')
-# colors = cm.get_cmap('seismic')
+cmap = 'gist_rainbow'
+# cmap = 'seismic'
 
 ### CLASSES
-class GC:
+class GC(Engine):
     """
     GC: Ghost Circle Class
 
+        NOTE: All ghosts live in one Particles store (one array row per
+              circle) and are moved together.
     """
     # Class Variables
-    numInstances = 0         # #         Number of instanciations of this class.
-    dt           = 0.01      # seconds   Time-Step
+    dtMax        = 0.01      # seconds   Time-Step (fixed)
+    analytic     = False     #           Closed-form free flight (exact at any time-step).
     bcR          = 5.0       # meters    Radius of bounding circle.
     # mass       = 1.0       # units    Future: Mass of Circle (Do ghosts have mass?)
     figW         = 8         # inches    Width of Figure (Plot)
     figH         = 8         # inches    Height of Figure (Plot)
 
-    def __init__(self,x=0,y=0,vx=0,vy=0,r=0.1):
+    def __init__(self,x,y,vx,vy,r=0.1):
         """
         Ghost Circle Constructor
 
         Parameters
         ----------
-        x : DOUBLE, optional
-            X-coordinate of circle center [m]. The default is 0.
-        y : DOUBLE, optional
-            Y-coordinate of circle center [m]. The default is 0.
-        vx : DOUBLE, optional
-            X-component of circle velocity [m/s].The default is 0.
-        vy : DOUBLE, optional
-            Y-component of circle velocity [m/s]. The default is 0.
-        r : DOUBLE, optional
-            Radius of circle [m]. The default is 0.1.
+        x : ARRAY
+            X-coordinates of circle centers [m].
+        y : ARRAY
+            Y-coordinates of circle centers [m].
+        vx : ARRAY
+            X-components of circle velocities [m/s].
+        vy : ARRAY
+            Y-components of circle velocities [m/s].
+        r : DOUBLE or ARRAY, optional
+            Radius of circles [m]. The default is 0.1.
 
         Returns
         -------
         None.
 
         """
-        GC.numInstances += 1
-        self.x  = x
-        self.y  = y
-        self.vx = vx
-        self.vy = vy
-        self.r  = r
-        self.t  = 0.0
-        v = m.hypot(vx,vy)
-        dt = r/(2.0*v)          # Time step control. Prevent circle centers
-                                # from crossing in a single time-step.
-        GC.dt = min(GC.dt,dt)
-        self.xC = m.sqrt(2)*m.hypot(x, y)/GC.bcR
-        self.graphic = plt.Circle((x,y), radius=r, fill=False,
-                                  color=colors(self.xC), linewidth=3)
-    def __del__(self):
-        """
-        Ghost Circle Destructor
-        """
-        GC.numInstances -= 1
-
-    def move(self):
-        """
-        Move ghost (circle) according to its velocity.
-        """
-        dt = GC.dt
-        # X
-        self.x += self.vx*dt
-        # Y
-        self.y += self.vy*dt
-        # Collision with wall?
-        self.__boundaries()
-        # Time
-        self.t += dt
-        # Graphic
-        self.__updateGraphic()
-
-    def __boundaries(self):
-        dt  = GC.dt
-        x   = self.x
-        y   = self.y
-        vx  = self.vx
-        vy  = self.vy
-        r   = self.r
-        bcR = GC.bcR
-        d   = m.hypot(x, y)   # Distance of particle center from origin of boundary circle.
-        # R
-        if( d+r > bcR ):
-            # Mid-point approximation to true circle crossing. This method could be iterated
-            # to a given tolerance. The time-step control should work well with this
-            # approximation. If larger time-steps are used a few iterations may be needed.
-            xm = x - vx*dt/2.0
-            ym = y - vy*dt/2.0
-            rm = m.hypot(xm, ym)
-            frac = bcR/rm
-            xc = frac*xm
-            yc = frac*ym
-            # rc = m.hypot(xc, yc)
-            # rcx = xc/rc
-            # rcy = yc/rc
-            rux = xm/rm   # X-component of unit vector
-            ruy = ym/rm   # Y-component of unit vector
-            vc = vx*rux + vy*ruy
-            vcx = vc*rux
-            vcy = vc*ruy
-            self.vx -= 2.0*vcx
-            self.vy -= 2.0*vcy
-            self.x = xc - r*rux
-            self.y = yc - r*ruy
-
-    def __updateGraphic(self):
-        """
-        Update graphic after a move.
-        """
-        self.graphic = plt.Circle((self.x,self.y), radius=self.r,
-                                  color=colors(self.xC),
-                                  fill=False, linewidth=3)
+        # fac=2.0: Time step control. Prevent circle centers from crossing in
+        #          a single time-step.
+        Engine.__init__(self,Particles(x,y,vx,vy,r),
+                        CircleWalls(GC.bcR),Ghost(),
+                        fac=2.0,dtMax=GC.dtMax,adaptive=False,analytic=GC.analytic)
+        self.xC = m.sqrt(2)*np.hypot(self.pars.x, self.pars.y)/GC.bcR
 # END: GC
 ### END: CLASSES
 
 
 ### FUNCTIONS
-# correctIC
-def correctIC(gcList):
+# randomIC
+def randomIC(n,r):
     """
-    Look for overlapping circles after initial conditions/set-up
-    as random number generator doesn't know any better (if random
-    positions are chosen). IMPORTANT: As this check is only
-    pair-wise it will not work for a large number of particles
-    as multiple circles will simultaneously overlap.
+    Random initial positions that do not overlap (Poisson-disk sampling,
+    see sim2d.placement), fast even for a large number of circles.
 
     NOTE: Unused. Included for user who may wish to use a random
-          initial distribution of circles (see limitations above).
+          initial distribution of circles instead of the grid.
 
     Parameters
     ----------
-    gcList : GC
-        Python list of GC instances.
+    n : INT
+        Number of circles.
+    r : DOUBLE
+        Radius of circles [m].
 
     Returns
     -------
-    None.
+    xList, yList : LISTS
+        Coordinates of circle centers [m].
 
     """
-    for i in np.arange(GC.numInstances-1):
-        for j in np.arange(i+1,GC.numInstances):
-            drx = gcList[i].x - gcList[j].x
-            dry = gcList[i].y - gcList[j].y
-            dr = m.hypot(drx,dry)
-            d = gcList[i].r + gcList[j].r
-            if( dr < d ):
-                offset = (d - dr)/2.0
-                dx = offset*drx/dr
-                dy = offset*dry/dr
-                gcList[i].x += dx
-                gcList[i].y += dy
-                gcList[j].x -= dx
-                gcList[j].y -= dy
-# END: correctIC
+    xy = poissonDisk(n,r,bcR=GC.bcR)
+    return list(xy[:,0]), list(xy[:,1])
+# END: randomIC
 
 ## Animation Functions:
 def init():
-    patches = []
-    boundaryCircle = plt.Circle((0,0), radius=GC.bcR,
-                                  color='black',
-                                  fill=False, linewidth=1)
-    patches.append(ax.add_patch(boundaryCircle))
+    patches = renderer.update(gc.pars.r)
+    patches.append(tText)
     return patches
 
-def animate(i):
-    ax.clear()
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Ghost Circles')
-    ax.axis('scaled')
-    ax.set_xlim([-1.1*GC.bcR,1.1*GC.bcR])
-    ax.set_ylim([-1.1*GC.bcR,1.1*GC.bcR])
-    tText = ax.text(-GC.bcR+0.1, GC.bcR-0.1, 'Time = ')
-    patches = []
-    boundaryCircle = plt.Circle((0,0), radius=GC.bcR,
-                                  color='black',
-                                  fill=False, linewidth=1)
-    patches.append(ax.add_patch(boundaryCircle))
-    if( i > 0 ):
-        # 10 time-steps per graphics update
-        for j in np.arange(10):
-            for gc in gcList:
-                gc.move()
-    # Graphics update
-    s = 'Time = %.2f s' % gcList[0].t
+def animate(snap):
+    # Graphics update (the physics is advanced by the snapshot generator)
+    patches = renderer.update(snap['r'])
+    s = 'Time = %.2f s' % snap['t']
     tText.set_text(s)
-    for gc in gcList:
-        patches.append(ax.add_patch(gc.graphic))
     patches.append(tText)
     return patches
 ## END: Animation Functions
@@ -217,12 +112,15 @@ def animate(i):
 
 
 if __name__ == '__main__':
+    args = runArgs('ghost_circle',steps=1000,stride=10,analytic=True)
+    if args.analytic:
+        GC.analytic, GC.dtMax = True, args.analytic
     numCircles = 10                        # Number of circles along an axis. Total number of
                                           # circles is numCircles**2
     sq2 = m.sqrt(2)
     dS = sq2*GC.bcR/(numCircles+1)
     rC = dS/6.0                          # Diameter of circle is 1/3 of initial circle spacing.
-    gcList = []
+    xList, yList, vxList, vyList = [], [], [], []
     for i in np.arange(numCircles):
         for j in np.arange(numCircles):
             x = dS*(j+1) - GC.bcR/sq2
@@ -234,29 +132,50 @@ if __name__ == '__main__':
             #       adjustments to the physics.
             vxR = random.uniform(-3,3)   # Want ghosts to move faster? Crank this up!
             vyR = random.uniform(-3,3)   # Want ghosts to move faster? Crank this up!
-            gcList.append( GC(x,y,vxR,vyR,rC) )
-    fig, ax = plt.subplots()
-    fig.set_size_inches(GC.figW,GC.figH)
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Ghost Circles')
-    ax.axis('scaled')
-    ax.set_xlim([-1.1*GC.bcR,1.1*GC.bcR])
-    ax.set_ylim([-1.1*GC.bcR,1.1*GC.bcR])
-    tText = ax.text(-GC.bcR+0.1, GC.bcR-0.1, 'Time = ')
-    ani = animation.FuncAnimation(fig, animate, frames=101,
-                                  interval=60, blit=True,
-                                  init_func=init, repeat=False)
-    # patches = []
-    # boundaryCircle = plt.Circle((0,0), radius=GC.bcR,
-    #                               color='black',
-    #                               fill=False, linewidth=1)
-    # patches.append(ax.add_patch(boundaryCircle))
-    # for gc in gcList:
-    #     patches.append(ax.add_patch(gc.graphic))
-    # Uncomment next two lines to write file to disk.
-    # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
-    # ani.save('../movies/ghost_circle.gif',writer=pwriter)
-    plt.show()
+            xList.append(x)
+            yList.append(y)
+            vxList.append(vxR)
+            vyList.append(vyR)
+    # xList, yList = randomIC(len(xList),rC)   # Random positions instead of the grid.
+    gc = GC(xList,yList,vxList,vyList,rC)
+    if args.headless:
+        gc.runHeadless(args,static=dict(color=gc.xC),
+                       info=dict(title='Ghost Circles',cmap=cmap,linewidth=3))
+    else:
+        # Graphics are only imported to animate.
+        import matplotlib.animation as animation
+        from matplotlib.ticker import AutoMinorLocator
+        from sim2d.render import ParticleRenderer, pyplot
+        plt = pyplot()
+        colors = plt.get_cmap(cmap)
+        fig, ax = plt.subplots()
+        fig.set_size_inches(GC.figW,GC.figH)
+        ax.grid(b=True, which='major', color='lightgrey')
+        # ax.grid(b=True, which='minor', color='lightgrey')
+        ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.set_title('Ghost Circles')
+        ax.axis('scaled')
+        ax.set_xlim([-1.1*GC.bcR,1.1*GC.bcR])
+        ax.set_ylim([-1.1*GC.bcR,1.1*GC.bcR])
+        tText = ax.text(-GC.bcR+0.1, GC.bcR-0.1, 'Time = ')
+        boundaryCircle = plt.Circle((0,0), radius=GC.bcR,
+                                    color='black',
+                                    fill=False, linewidth=1)
+        ax.add_patch(boundaryCircle)
+        renderer = ParticleRenderer(ax,gc.pars.r,gc.pars.radius,colors(gc.xC),
+                                    fill=False,linewidth=3)
+        prof = profiler(args)             # --profile/--trace: time the physics and the graphics.
+        gc.profile(prof)
+        if prof is not None:
+            animate = prof.wrap('render',animate)
+        frames = snapshots(gc.step,gc.pars,args.steps,args.stride,copy=False)
+        ani = animation.FuncAnimation(fig, animate, frames=frames,
+                                      save_count=args.steps//args.stride+1,
+                                      interval=60, blit=True,
+                                      init_func=init, repeat=False)
+        # Uncomment next two lines to write file to disk.
+        # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
+        # ani.save('../movies/ghost_circle.gif',writer=pwriter)
+        plt.show()
+        report(prof,args)
@@ -10,29 +10,35 @@ Created: Apr 2020
 import random
 import math as m
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.ticker import AutoMinorLocator
-from matplotlib import cm
+from sim2d import Particles, Engine, BoxWalls, Hard
+from sim2d.scenario import batched
+from sim2d.runner import runArgs, snapshots, profiler, report
 
 
 ### SET COLOR MAP
-colors = cm.get_cmap('gist_rainbow')
-# colors = cm.get_cmap('seismic')
+cmap = 'gist_rainbow'
+# cmap = 'seismic'
 
 
 ### CLASSES
-class HB:
+class HB(Engine):
     """
     HB: Hard Box Class
 
         NOTE: Circles interact with each other via elastic collisions, i.e.
               2D version of hard sphere scattering.
         NOTE: Circles interact with the walls of the box.
+        NOTE: All circles live in one Particles store (one array row per
+              circle) and are moved together.
+        NOTE: The physics is the shared engine (see sim2d.scenario); this
+              class only configures it.
     """
     # Class Variables
-    numInstances = 0         # #         Number of instanciations of this class.
-    dt     = 0.01            # seconds   Time-Step
+    dtMax  = 0.01            # seconds   Largest Time-Step
+    adaptive = True          #           Recompute the time-step from the current velocities.
+    skin     = 2.0           # diameters Verlet list skin (0: fresh cell list every step)
+    eventDriven = False      #           Exact event-driven collisions (no overlaps).
+    numProcs    = 1          #           Worker processes (domain decomposition, not with eventDriven).
     boxU   = 10.0            # meters    Top of Box (Up)
     boxD   = 0.0             # meters    Bottom of Box (Down)
     boxL   = 0.0             # meters    Left Side of Box (Left)
@@ -40,217 +46,71 @@ class HB:
     figW   = 8               # inches    Width of Figure (Plot)
     figH   = 8               # inches    Height of Figure (Plot)
 
-    def __init__(self,x=0,y=0,vx=0,vy=0,r=0.1):
+    def __init__(self,x,y,vx,vy,r=0.1):
         """
         Hard Box Constructor
 
         Parameters
         ----------
-        x : DOUBLE, optional
-            X-coordinate of circle center [m]. The default is 0.
-        y : DOUBLE, optional
-            Y-coordinate of circle center [m]. The default is 0.
-        vx : DOUBLE, optional
-            X-component of circle velocity [m/s].The default is 0.
-        vy : DOUBLE, optional
-            Y-component of circle velocity [m/s]. The default is 0.
-        r : DOUBLE, optional
-            Radius of circle [m]. The default is 0.1.
+        x : ARRAY
+            X-coordinates of circle centers [m].
+        y : ARRAY
+            Y-coordinates of circle centers [m].
+        vx : ARRAY
+            X-components of circle velocities [m/s].
+        vy : ARRAY
+            Y-components of circle velocities [m/s].
+        r : DOUBLE or ARRAY, optional
+            Radius of circles [m]. The default is 0.1.
 
         Returns
         -------
         None.
 
         """
-        HB.numInstances += 1
-        self.x  = x
-        self.xC = x/HB.boxR
-        self.y  = y
-        self.vx = vx
-        self.vy = vy
-        self.r  = r
-        self.t  = 0.0
-        v = m.hypot(vx,vy)
-        dt = r/(2.0*v)          # Time step control. Prevent circle centers
-                                # from crossing in a single time-step.
-        HB.dt = min(HB.dt,dt)
-        self.graphic = plt.Circle((x,y), radius=r, fill=False,
-                                  color=colors(self.xC), linewidth=1)
-    def __del__(self):
-        """
-        Hard Box Destructor
-        """
-        HB.numInstances -= 1
-
-    def move(self):
-        """
-        Move circle according to its velocity.
-        """
-        dt = HB.dt
-        vx = self.vx
-        vy = self.vy
-        # X
-        self.x += vx*dt
-        # Y
-        self.y += vy*dt
-        # Collision with wall?
-        self.__boundaries()
-        # Time
-        self.t += dt
-        # Graphic
-        # self.updateGraphic()
-
-    def __boundaries(self):
-        # dt = HB.dt
-        x  = self.x
-        y  = self.y
-        # vx = self.vx
-        # vy = self.vy
-        r  = self.r
-        bD = HB.boxD
-        bU = HB.boxU
-        bL = HB.boxL
-        bR = HB.boxR
-        # Y
-        if( y < bD+r ):
-            # tD = dt - abs( (bD - y)/vy )
-            self.vy *= -1.0
-            # self.y = bD + vy*tD + r
-            self.y = bD + r
-        elif( y > bU-r ):
-            # tU = dt - abs( (bU - y)/vy )
-            self.vy *= -1.0
-            # self.y = bU + vy*tU - r
-            self.y = bU - r
-        # X
-        if( x < bL+r ):
-            # tL = dt - abs( (bL - x)/vx )
-            self.vx *= -1.0
-            # self.x = bL + vx*tL + r
-            self.x = bL + r
-        elif( x > bR-r ):
-            # tR = dt - abs( (bR - x)/vx )
-            self.vx *= -1.0
-            # self.x = bR + vx*tR - r
-            self.x = bR - r
-
-    def updateGraphic(self):
-        """
-        Update graphic after a move.
-        """
-        self.graphic = plt.Circle((self.x,self.y), radius=self.r,
-                                  color=colors(self.xC),
-                                  fill=False, linewidth=1)
-# END: GC
+        Engine.__init__(self,Particles(x,y,vx,vy,r),
+                        BoxWalls(HB.boxL,HB.boxR,HB.boxD,HB.boxU),Hard(HB.skin),
+                        fac=2.0,dtMax=HB.dtMax,adaptive=HB.adaptive,
+                        eventDriven=HB.eventDriven,numProcs=HB.numProcs)
+        self.xC = self.pars.x/HB.boxR
+# END: HB
 ### END: CLASSES
 
 ### FUNCTIONS
-## Collision Functions:
-def collision(balls):
-    """
-    Step 1: Detect collisions
-        TODO: Algorithm Documentation ...
-    Step 2: Handle collisions
-        TODO: Algorithm Documentation ...
-
-    Parameters
-    ----------
-    balls : Python list.
-        List of HB instances.
-
-    Returns
-    -------
-    None.
-
-    """
-    for i in np.arange(HB.numInstances-1):
-        for j in np.arange(i+1,HB.numInstances):
-            d   = balls[i].r + balls[j].r
-            drx = balls[i].x - balls[j].x
-            dry = balls[i].y - balls[j].y
-            dr  = m.hypot(drx, dry)
-            if( dr < d ):
-                # COLLISION! Case #1: Penetration
-                # Game Engine Style Collision Correction
-                offset = (d - dr)/2.0
-                dx = offset*drx/dr
-                dy = offset*dry/dr
-                xiNew = balls[i].x + dx
-                yiNew = balls[i].y + dy
-                xjNew = balls[j].x - dx
-                yjNew = balls[j].y - dy
-                drx = xiNew - xjNew
-                dry = yiNew - yjNew
-                dvx = balls[i].vx - balls[j].vx
-                dvy = balls[i].vy - balls[j].vy
-                fac = (dvx*drx + dvy*dry)/(d*d)
-                delvx = fac*drx
-                delvy = fac*dry
-                balls[i].vx -= delvx
-                balls[i].vy -= delvy
-                balls[j].vx += delvx
-                balls[j].vy += delvy
-                balls[i].x = xiNew
-                balls[i].y = yiNew
-                balls[j].x = xjNew
-                balls[j].y = yjNew
-            elif( dr == d ):
-                # COLLISTION! Case #2: Perfect
-                # This is going to be a VERY rare event ...
-                dvx = balls[i].vx - balls[j].vx
-                dvy = balls[i].vy - balls[j].vy
-                fac = (dvx*drx + dvy*dry)/(d*d)
-                delvx = fac*drx
-                delvy = fac*dry
-                balls[i].vx -= delvx
-                balls[i].vy -= delvy
-                balls[j].vx += delvx
-                balls[j].vy += delvy
-### END: Collision Functions
-
 ## Animation Functions:
 def init():
-    patches = []
+    patches = renderer.update(hb.pars.r)
+    patches.append(tText)
     return patches
 
-def animate(i):
-    ax.clear()
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Impenetrable Circles')
-    ax.axis('scaled')
-    ax.set_xlim([HB.boxL,HB.boxR])
-    ax.set_ylim([HB.boxD,HB.boxU])
-    tText = ax.text(4, 9.5, '')
-    patches = []
-    if( i > 0 ):
-        # N time-steps per graphics update
-        for j in np.arange(1):
-            for hb in hbList:
-                hb.move()
-            collision(hbList)
-        for hb in hbList:
-                hb.updateGraphic()
-    # Graphics update
-    s = 'Time = %.2f s' % hbList[0].t
+def animate(snap):
+    # Graphics update (the physics is advanced by the snapshot generator)
+    patches = renderer.update(snap['r'])
+    s = 'Time = %.2f s' % snap['t']
     tText.set_text(s)
-    for hb in hbList:
-        patches.append(ax.add_patch(hb.graphic))
     patches.append(tText)
     return patches
 ## END: Animation Functions
-### END: FUNCTIONS
 
+def setUp(numCircles=3):
+    """
+    Circles on a grid with random velocities.
 
-if __name__ == '__main__':
-    numCircles = 3                     # Number of circles along an axis. Total number of
-                                       # circles is numCircles**2
+    Parameters
+    ----------
+    numCircles : INT, optional
+        Number of circles along an axis. Total number of circles is
+        numCircles**2. The default is 3.
+
+    Returns
+    -------
+    HB
+
+    """
     dW = HB.boxR/(numCircles+1)
     dH = HB.boxU/(numCircles+1)
     rC = m.hypot(dW, dH)/6.0          # Diameter of circle is 1/3 of initial circle spacing.
-    hbList = []
+    xList, yList, vxList, vyList = [], [], [], []
     for i in np.arange(numCircles):
         for j in np.arange(numCircles):
             x = dW*(j+1)
@@ -262,25 +122,72 @@ if __name__ == '__main__':
             #       adjustments to the physics.
             vxR = random.uniform(-10,10)   # Want ghosts to move faster? Crank this up!
             vyR = random.uniform(-10,10)   # Want ghosts to move faster? Crank this up!
-            hbList.append( HB(x,y,vxR,vyR,rC) )
-    fig, ax = plt.subplots()
-    fig.set_size_inches(HB.figW,HB.figH)
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Impenetrable Circles')
-    ax.axis('scaled')
-    ax.set_xlim([HB.boxL,HB.boxR])
-    ax.set_ylim([HB.boxD,HB.boxU])
-    tText = ax.text(4, 9.5, 'Time = ')
-    ani = animation.FuncAnimation(fig, animate, frames=101,
-                                  interval=100, blit=True,
-                                  init_func=init, repeat=False)
+            xList.append(x)
+            yList.append(y)
+            vxList.append(vxR)
+            vyList.append(vyR)
+    return HB(xList,yList,vxList,vyList,rC)
 
-    # Uncomment next two lines to write file to disk.
-    # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
-    # ani.save('../movies/hard_box.gif',writer=pwriter)
-    plt.show()
+def replica(seed):
+    """
+    Ensemble member (see sim2d.ensemble). The random number generators are
+    seeded by the ensemble runner.
+    """
+    hb = setUp()
+    return hb.step, hb.pars, None
+
+def batch(stores):
+    """
+    Ensemble members stepped together (see sim2d.batch): stores are the
+    initial states of the replicas.
+    """
+    return batched(stores,BoxWalls(HB.boxL,HB.boxR,HB.boxD,HB.boxU),Hard(),
+                   fac=2.0,dtMax=HB.dtMax)
+### END: FUNCTIONS
+
+
+if __name__ == '__main__':
+    args = runArgs('hard_box',steps=100,stride=1,procs=True)
+    HB.numProcs = args.procs
+    hb = setUp(numCircles=3)           # 9 circles
+    if args.headless:
+        hb.runHeadless(args,static=dict(color=hb.xC),
+                       info=dict(title='Impenetrable Circles',cmap=cmap))
+    else:
+        # Graphics are only imported to animate.
+        import matplotlib.animation as animation
+        from matplotlib.ticker import AutoMinorLocator
+        from sim2d.render import ParticleRenderer, pyplot
+        plt = pyplot()
+        colors = plt.get_cmap(cmap)
+        fig, ax = plt.subplots()
+        fig.set_size_inches(HB.figW,HB.figH)
+        ax.grid(b=True, which='major', color='lightgrey')
+        # ax.grid(b=True, which='minor', color='lightgrey')
+        ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.set_title('Impenetrable Circles')
+        ax.axis('scaled')
+        ax.set_xlim([HB.boxL,HB.boxR])
+        ax.set_ylim([HB.boxD,HB.boxU])
+        tText = ax.text(4, 9.5, 'Time = ')
+        renderer = ParticleRenderer(ax,hb.pars.r,hb.pars.radius,colors(hb.xC),
+                                    fill=False,linewidth=1)
+        prof = profiler(args)             # --profile/--trace: time the physics and the graphics.
+        hb.profile(prof)
+        if prof is not None:
+            animate = prof.wrap('render',animate)
+        frames = snapshots(hb.step,hb.pars,args.steps,args.stride,copy=False)
+        ani = animation.FuncAnimation(fig, animate, frames=frames,
+                                      save_count=args.steps//args.stride+1,
+                                      interval=100, blit=True,
+                                      init_func=init, repeat=False)
+
+        # Uncomment next two lines to write file to disk.
+        # pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
+        # ani.save('../movies/hard_box.gif',writer=pwriter)
+        plt.show()
+        hb.close()                        # Stop the --procs workers.
+        report(prof,args)
 
 
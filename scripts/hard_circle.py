@@ -10,234 +10,74 @@ Created: Apr 2020
 import random
 import math as m
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.ticker import AutoMinorLocator
-from matplotlib import cm
+from sim2d import Particles, Engine, CircleWalls, Hard
+from sim2d.runner import runArgs, snapshots, profiler, report
 
 ### SET COLOR MAP
-colors = cm.get_cmap('gist_rainbow')
-# colors = cm.get_cmap('seismic')
+cmap = 'gist_rainbow'
+# cmap = 'seismic'
 
 ### CLASSES
-class HC:
+class HC(Engine):
     """
     HC: Hard Circle Class
 
+        NOTE: All circles live in one Particles store (one array row per
+              circle) and are moved together.
+        NOTE: The physics is the shared engine (see sim2d.scenario); this
+              class only configures it.
     """
     # Class Variables
-    numInstances = 0         # #         Number of instanciations of this class.
-    dt           = 0.01      # seconds   Time-Step
+    dtMax        = 0.01      # seconds   Largest Time-Step
+    adaptive     = True      #           Recompute the time-step from the current velocities.
+    skin         = 2.0       # diameters Verlet list skin (0: fresh cell list every step)
+    eventDriven  = False     #           Exact event-driven collisions (no overlaps).
+    numProcs     = 1         #           Worker processes (domain decomposition, not with eventDriven).
     bcR          = 5.0       # meters    Radius of bounding circle.
     figW         = 8         # inches    Width of Figure (Plot)
     figH         = 8         # inches    Height of Figure (Plot)
 
-    def __init__(self,x=0,y=0,vx=0,vy=0,r=0.1):
+    def __init__(self,x,y,vx,vy,r=0.1):
         """
         Hard Circle Constructor
 
         Parameters
         ----------
-        x : DOUBLE, optional
-            X-coordinate of circle center [m]. The default is 0.
-        y : DOUBLE, optional
-            Y-coordinate of circle center [m]. The default is 0.
-        vx : DOUBLE, optional
-            X-component of circle velocity [m/s].The default is 0.
-        vy : DOUBLE, optional
-            Y-component of circle velocity [m/s]. The default is 0.
-        r : DOUBLE, optional
-            Radius of circle [m]. The default is 0.1.
+        x : ARRAY
+            X-coordinates of circle centers [m].
+        y : ARRAY
+            Y-coordinates of circle centers [m].
+        vx : ARRAY
+            X-components of circle velocities [m/s].
+        vy : ARRAY
+            Y-components of circle velocities [m/s].
+        r : DOUBLE or ARRAY, optional
+            Radius of circles [m]. The default is 0.1.
 
         Returns
         -------
         None.
 
         """
-        HC.numInstances += 1
-        self.x  = x
-        self.y  = y
-        self.vx = vx
-        self.vy = vy
-        self.r  = r
-        self.t  = 0.0
-        v = m.hypot(vx,vy)
-        if( v != 0 ):
-            dt = r/(4.0*v)          # Time step control. Prevent circle centers
-                                    # from crossing in a single time-step.
-            HC.dt = min(HC.dt,dt)
-        self.xC = m.sqrt(2)*m.hypot(x, y)/HC.bcR
-        self.graphic = plt.Circle((x,y), radius=r, fill=False,
-                                  color=colors(self.xC), linewidth=1)
-    def __del__(self):
-        """
-        Hard Circle Destructor
-        """
-        HC.numInstances -= 1
-
-    def move(self):
-        """
-        Move hard circle according to its velocity.
-        """
-        dt = HC.dt
-        vx = self.vx
-        vy = self.vy
-        # X
-        self.x += vx*dt
-        # Y
-        self.y += vy*dt
-        # Collision with wall?
-        self.__boundaries()
-        # Time
-        self.t += dt
-        # Graphic
-        # self.updateGraphic()
-
-    def __boundaries(self):
-        dt  = HC.dt
-        x   = self.x
-        y   = self.y
-        vx  = self.vx
-        vy  = self.vy
-        r   = self.r
-        bcR = HC.bcR
-        d   = m.hypot(x, y)   # Distance of particle center from origin of boundary circle.
-        # R
-        if( d+r > bcR ):
-            # Mid-point approximation to true circle crossing. This method could be iterated
-            # to a given tolerance. The time-step control should work well with this
-            # approximation. If larger time-steps are used a few iterations may be needed.
-            xm = x - vx*dt/2.0
-            ym = y - vy*dt/2.0
-            rm = m.hypot(xm, ym)
-            frac = bcR/rm
-            xc = frac*xm
-            yc = frac*ym
-            # rc = m.hypot(xc, yc)
-            # rcx = xc/rc
-            # rcy = yc/rc
-            rux = xm/rm   # X-component of unit vector
-            ruy = ym/rm   # Y-component of unit vector
-            vc = vx*rux + vy*ruy
-            vcx = vc*rux
-            vcy = vc*ruy
-            self.vx -= 2.0*vcx
-            self.vy -= 2.0*vcy
-            self.x = xc - r*rux
-            self.y = yc - r*ruy
-
-    def updateGraphic(self):
-        """
-        Update graphic after a move or collision.
-        """
-        self.graphic = plt.Circle((self.x,self.y), radius=self.r,
-                                  color=colors(self.xC),
-                                  fill=False, linewidth=1)
+        Engine.__init__(self,Particles(x,y,vx,vy,r),CircleWalls(HC.bcR),Hard(HC.skin),
+                        fac=4.0,dtMax=HC.dtMax,adaptive=HC.adaptive,
+                        eventDriven=HC.eventDriven,numProcs=HC.numProcs)
+        self.xC = m.sqrt(2)*np.hypot(self.pars.x, self.pars.y)/HC.bcR
 # END: HC
 ### END: CLASSES
 
 ### FUNCTIONS
-## Collision Functions
-def collision(balls):
-    """
-    Step 1: Detect collisions
-        TODO: Algorithm Documentation ...
-    Step 2: Handle collisions
-        TODO: Algorithm Documentation ...
-
-    Parameters
-    ----------
-    balls : Python list.
-        List of HC instances.
-
-    Returns
-    -------
-    None.
-
-    """
-    for i in np.arange(HC.numInstances-1):
-        for j in np.arange(i+1,HC.numInstances):
-            d   = balls[i].r + balls[j].r
-            drx = balls[i].x - balls[j].x
-            dry = balls[i].y - balls[j].y
-            dr  = m.hypot(drx, dry)
-            if( dr < d ):
-                # COLLISION! Case #1: Penetration
-                # Game Engine Style Collision Correction
-                offset = (d - dr)/2.0
-                dx = offset*drx/dr
-                dy = offset*dry/dr
-                xiNew = balls[i].x + dx
-                yiNew = balls[i].y + dy
-                xjNew = balls[j].x - dx
-                yjNew = balls[j].y - dy
-                drx = xiNew - xjNew
-                dry = yiNew - yjNew
-                dvx = balls[i].vx - balls[j].vx
-                dvy = balls[i].vy - balls[j].vy
-                fac = (dvx*drx + dvy*dry)/(d*d)
-                delvx = fac*drx
-                delvy = fac*dry
-                balls[i].vx -= delvx
-                balls[i].vy -= delvy
-                balls[j].vx += delvx
-                balls[j].vy += delvy
-                balls[i].x = xiNew
-                balls[i].y = yiNew
-                balls[j].x = xjNew
-                balls[j].y = yjNew
-            elif( dr == d ):
-                # COLLISTION! Case #2: Perfect
-                # This is going to be a VERY rare event ...
-                dvx = balls[i].vx - balls[j].vx
-                dvy = balls[i].vy - balls[j].vy
-                fac = (dvx*drx + dvy*dry)/(d*d)
-                delvx = fac*drx
-                delvy = fac*dry
-                balls[i].vx -= delvx
-                balls[i].vy -= delvy
-                balls[j].vx += delvx
-                balls[j].vy += delvy
-## END: Collision Functions
-
 ## Animation Functions:
 def init():
-    patches = []
-    boundaryCircle = plt.Circle((0,0), radius=HC.bcR,
-                                  color='black',
-                                  fill=False, linewidth=1)
-    patches.append(ax.add_patch(boundaryCircle))
+    patches = renderer.update(hc.pars.r)
+    patches.append(tText)
     return patches
 
-def animate(i):
-    ax.clear()
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Hard Circles in a Hard Circle')
-    ax.axis('scaled')
-    ax.set_xlim([-1.1*HC.bcR,1.1*HC.bcR])
-    ax.set_ylim([-1.1*HC.bcR,1.1*HC.bcR])
-    tText = ax.text(-HC.bcR+0.1, HC.bcR-0.1, 'Time = ')
-    patches = []
-    boundaryCircle = plt.Circle((0,0), radius=HC.bcR,
-                                  color='black',
-                                  fill=False, linewidth=1)
-    patches.append(ax.add_patch(boundaryCircle))
-    if( i > 0 ):
-        # N time-steps per graphics update
-        for j in np.arange(10):
-            for hc in hcList:
-                hc.move()
-            collision(hcList)
-        for hc in hcList:
-                hc.updateGraphic()
-    # Graphics update
-    s = 'Time = %.2f s' % hcList[0].t
+def animate(snap):
+    # Graphics update (the physics is advanced by the snapshot generator)
+    patches = renderer.update(snap['r'])
+    s = 'Time = %.2f s' % snap['t']
     tText.set_text(s)
-    for hc in hcList:
-        patches.append(ax.add_patch(hc.graphic))
     patches.append(tText)
     return patches
 ## END: Animation Functions
@@ -245,12 +85,14 @@ def animate(i):
 
 
 if __name__ == '__main__':
+    args = runArgs('hard_circle',steps=1000,stride=10,procs=True)
+    HC.numProcs = args.procs
     numCircles = 20                       # Number of circles along an axis. Total number of
                                           # circles is numCircles**2
     sq2 = m.sqrt(2)
     dS = sq2*HC.bcR/(numCircles+1)
     rC = dS/6.0                           # Diameter of circle is 1/3 of initial circle spacing.
-    hcList = []
+    xList, yList, vxList, vyList = [], [], [], []
     for i in np.arange(numCircles):
         for j in np.arange(numCircles):
             x = dS*(j+1) - HC.bcR/sq2
@@ -262,30 +104,51 @@ if __name__ == '__main__':
             #       adjustments to the physics.
             vxR = random.uniform(-3,3)   # Want ghosts to move faster? Crank this up!
             vyR = random.uniform(-3,3)   # Want ghosts to move faster? Crank this up!
-            hcList.append( HC(x,y,vxR,vyR,rC) )
-    fig, ax = plt.subplots()
-    fig.set_size_inches(HC.figW,HC.figH)
-    ax.grid(b=True, which='major', color='lightgrey')
-    # ax.grid(b=True, which='minor', color='lightgrey')
-    ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-    ax.set_title('Ghost Circles')
-    ax.axis('scaled')
-    ax.set_xlim([-1.1*HC.bcR,1.1*HC.bcR])
-    ax.set_ylim([-1.1*HC.bcR,1.1*HC.bcR])
-    tText = ax.text(-HC.bcR+0.1, HC.bcR-0.1, 'Time = ')
-    ani = animation.FuncAnimation(fig, animate, frames=101,
-                                  interval=100, blit=True,
-                                  init_func=init, repeat=False)
-    # patches = []
-    # boundaryCircle = plt.Circle((0,0), radius=HC.bcR,
-    #                               color='black',
-    #                               fill=False, linewidth=1)
-    # patches.append(ax.add_patch(boundaryCircle))
-    # for hc in hcList:
-    #     patches.append(ax.add_patch(hc.graphic))
-    # ***** Uncomment next two lines to write file to disk. *****
-    pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
-    ani.save('../movies/hard_circle.gif',writer=pwriter)
-    plt.show()
+            xList.append(x)
+            yList.append(y)
+            vxList.append(vxR)
+            vyList.append(vyR)
+    hc = HC(xList,yList,vxList,vyList,rC)
+    if args.headless:
+        hc.runHeadless(args,static=dict(color=hc.xC),
+                       info=dict(title='Hard Circles in a Hard Circle',cmap=cmap))
+    else:
+        # Graphics are only imported to animate.
+        import matplotlib.animation as animation
+        from matplotlib.ticker import AutoMinorLocator
+        from sim2d.render import ParticleRenderer, pyplot
+        plt = pyplot()
+        colors = plt.get_cmap(cmap)
+        fig, ax = plt.subplots()
+        fig.set_size_inches(HC.figW,HC.figH)
+        ax.grid(b=True, which='major', color='lightgrey')
+        # ax.grid(b=True, which='minor', color='lightgrey')
+        ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.set_title('Hard Circles in a Hard Circle')
+        ax.axis('scaled')
+        ax.set_xlim([-1.1*HC.bcR,1.1*HC.bcR])
+        ax.set_ylim([-1.1*HC.bcR,1.1*HC.bcR])
+        tText = ax.text(-HC.bcR+0.1, HC.bcR-0.1, 'Time = ')
+        boundaryCircle = plt.Circle((0,0), radius=HC.bcR,
+                                    color='black',
+                                    fill=False, linewidth=1)
+        ax.add_patch(boundaryCircle)
+        renderer = ParticleRenderer(ax,hc.pars.r,hc.pars.radius,colors(hc.xC),
+                                    fill=False,linewidth=1)
+        prof = profiler(args)             # --profile/--trace: time the physics and the graphics.
+        hc.profile(prof)
+        if prof is not None:
+            animate = prof.wrap('render',animate)
+        frames = snapshots(hc.step,hc.pars,args.steps,args.stride,copy=False)
+        ani = animation.FuncAnimation(fig, animate, frames=frames,
+                                      save_count=args.steps//args.stride+1,
+                                      interval=100, blit=True,
+                                      init_func=init, repeat=False)
+        # ***** Uncomment next two lines to write file to disk. *****
+        pwriter = animation.PillowWriter(fps=10, metadata=dict(artist='Dr. Ryan Clement'))
+        ani.save('../movies/hard_circle.gif',writer=pwriter)
+        plt.show()
+        hc.close()                        # Stop the --procs workers.
+        report(prof,args)
 
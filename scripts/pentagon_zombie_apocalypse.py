@@ -9,9 +9,10 @@ Created: Apr 2020
 ### IMPORTS
 import math as m
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.ticker import AutoMinorLocator
+from sim2d import Particles, Polygon, Engine, PolygonWalls, Epidemic
+from sim2d.scenario import batched
+from sim2d.placement import poissonDisk
+from sim2d.runner import runArgs, snapshots, profiler, report
 
 
 ### CLASSES
@@ -26,7 +27,6 @@ class Pentagon:
     def __init__(self):
         # Inner Pentagon
         self.pVertsI = self.__calcVerts(Pentagon.rI)
-        self.pGraphI = self.__createGraphic(self.pVertsI)
         self.pVecsI  = self.__calcVecs(self.pVertsI)        # These vectors are perpendicular to the
                                                             # faces of the inner pentagon.
         self.vecMagI = np.linalg.norm(self.pVecsI[0])
@@ -34,10 +34,13 @@ class Pentagon:
                                                             # both pentagons (faces are parallel).
         # Outer Pentagon
         self.pVertsO = self.__calcVerts(Pentagon.rO)
-        self.pGraphO = self.__createGraphic(self.pVertsO)
         self.pVecsO  = self.__calcVecs(self.pVertsO)        # These vectors are perpendicular to the
                                                             # faces of the outer pentagon.
         self.vecMagO = np.linalg.norm(self.pVecsO[0])
+        # Both pentagons as arrays of face normals (vectorized boundary check).
+        self.walls   = Polygon.regular(Pentagon.numVerts,Pentagon.rO,Pentagon.rI)
+        self.pGraphI = None                                 # Graphics are only created when
+        self.pGraphO = None                                 # rendering (see createGraphics).
 
     def __del__(self):
         pass
@@ -58,6 +61,13 @@ class Pentagon:
         pVecs.append(v)
         return pVecs
 
+    def createGraphics(self):
+        """
+        Create the line graphics of both pentagons.
+        """
+        self.pGraphI = self.__createGraphic(self.pVertsI)
+        self.pGraphO = self.__createGraphic(self.pVertsO)
+
     def __createGraphic(self,pVerts):
         x = []
         y = []
@@ -66,72 +76,25 @@ class Pentagon:
             y.append(pVerts[i][1])
         x.append(pVerts[0][0])
         y.append(pVerts[0][1])
-        graphic = plt.plot(x,y,c='black')
+        graphic = pyplot().plot(x,y,c='black')
         return graphic
 
-    def boundaryCheck(self,parList):
-        for p in parList:
-            d = 0
-            indP = -1
-            # Where is particle?
-            for j in np.arange(Pentagon.numVerts):
-                test = np.dot(self.pUVecs[j], p.r)
-                if test > 0:
-                    if test > d:
-                        d = test
-                        indX = j
-                    # Corner case check (literally)
-                    if j != indX and abs(d - test) < 1.0e-13:
-                        indP = j
-            # Has it crossed a boundary?
-            dI = d - self.vecMagI - Particle.radius
-            dO = self.vecMagO - d - Particle.radius
-            if ( dI <= 0 ):
-                # Crossed inner boundary
-                if indP == -1:
-                    vDpU = np.dot(self.pUVecs[indX],p.v)
-                    delt = dI/vDpU
-                    p.r -= delt*p.v
-                    p.v += -2.0*vDpU*self.pUVecs[indX]
-                else:   # Corner case
-                    uVec = (self.pUVecs[indX] + self.pUVecs[indP])/2.0
-                    mag  = np.linalg.norm(uVec)
-                    uVec /= mag
-                    p.r += Particle.radius*uVec
-                    p.v *= -1.0
-
-            elif ( dO <= 0 ):
-                # Crossed outer boundary
-                if indP == -1:
-                    vDpU = np.dot(self.pUVecs[indX],p.v)
-                    delt = dO/vDpU
-                    p.r += delt*p.v
-                    p.v += -2.0*vDpU*self.pUVecs[indX]
-                else:   # Corner case
-                    uVec = (self.pUVecs[indX] + self.pUVecs[indP])/2.0
-                    mag  = np.linalg.norm(uVec)
-                    uVec /= mag
-                    p.r -= Particle.radius*uVec
-                    p.v *= -1.0
+    def boundaryCheck(self,pars):
+        """
+        Reflect every person off the hallway walls (all at once, see
+        sim2d.Polygon.boundaries).
+        """
+        self.walls.boundaries(pars)
 
     def wallDistancing(self,x,y):
-        d = 0
-        xy = np.array([x,y])
-        for i in np.arange(Pentagon.numVerts):
-            test = np.dot(self.pUVecs[i], xy)
-            if test > d:
-                d = test
-                # indX = i
-        dI = d - self.vecMagI - 1.0*Particle.radius
-        dO = self.vecMagO - d - 1.0*Particle.radius
-        if dI < 0 or dO < 0:
-            ans = False
-        else:
-            ans = True
-        return ans
+        """
+        True if a person at (x, y) fits between the walls.
+        """
+        return bool(self.walls.inside((x,y),Particle.radius)[0])
 
     def plotVecs(self):
         # Plot Vectors
+        plt = pyplot()
         originX = originY = np.zeros(5)
         xI = []
         yI = []
@@ -152,175 +115,46 @@ class Pentagon:
 # END: Pentagon
 
 class Particle:
+    """
+    Particle: Properties shared by every person. The per-person state
+    (position, velocity, form) lives in a Particles store where the tag
+    holds the form.
+    """
     # Class Variables
-    numInst = 0
     radius  = 0.1
     area = m.pi*radius**2
     boxArea = 4*radius**2
     # print('Area of Particle: ', area)
-
-    def __init__(self, x, y, form, vx=0.0, vy=0.0):
-        Particle.numInst += 1
-        self.form = form
-        if form == 'zombie':
-            self.color = 'lime'
-        elif form == 'human':
-            self.color = 'blue'
-        else:
-            self.color = 'red'
-        self.mass = Particle.radius**2
-        self.r = np.array([x,y])
-        self.v = np.array([vx,vy])
-
-    def __del__(self):
-        Particle.numInst -= 1
-
-    @property
-    def x(self):
-        return self.r[0]
-    @x.setter
-    def x(self, value):
-        self.r[0] = value
-    @property
-    def y(self):
-        return self.r[1]
-    @y.setter
-    def y(self, value):
-        self.r[1] = value
-    @property
-    def vx(self):
-        return self.v[0]
-    @vx.setter
-    def vx(self, value):
-        self.v[0] = value
-    @property
-    def vy(self):
-        return self.v[1]
-    @vy.setter
-    def vy(self, value):
-        self.v[1] = value
+    HUMAN   = Epidemic.SUSCEPTIBLE   # Particles tag of a human.
+    ZOMBIE  = Epidemic.INFECTED      # Particles tag of a zombie.
+    BITTEN  = Epidemic.EXPOSED       # Particles tag of a bitten human (turns later).
+    IMMUNE  = Epidemic.RECOVERED     # Particles tag of a cured zombie.
+    forms   = ('human', 'zombie', 'bitten', 'immune')   # Form of each tag.
+    colors  = ('blue', 'lime', 'orange', 'grey')        # Color of each tag.
 # END: Particle
 
 class Physics:
+    """
+    Physics: Settings of the shared engine (see sim2d.scenario). People are
+    hard circles between the pentagon walls; a zombie colliding with a
+    human bites the human, who turns into a zombie.
+    """
     # Class Variables
-    dt = 0.1
-    time = 0.0
-
-    def __init__(self, parList):
-        self.setTimeStep(parList)
-
-    def __del__(self):
-        pass
-
-    def setTimeStep(self,parList):
+    dtMax = 0.1
+    adaptive = True      # Recompute the time-step from the current velocities.
+    skin = 2.0           # Verlet list skin in diameters (0: fresh cell list every step).
+    pBite = 1.0          # Probability that a zombie collision bites.
+    incubation = 0.0     # seconds  Bitten humans turn after this long (0: at once).
+    cure = np.inf        # seconds  Zombies become immune humans after this long (inf: never).
+
+    @staticmethod
+    def interaction():
         """
-        Time step control. Prevent circle centers
-        from crossing in a single time-step.
-
-        Parameters
-        ----------
-        parList : Python List
-            List of particles used in simulation.
-
-        Returns
-        -------
-        None.
-
-        """
-        for p in parList:
-            vMag = m.hypot(p.vx,p.vy)
-            if( vMag != 0 ):
-                dt = Particle.radius/(2.0*vMag)
-                Physics.dt = min(Physics.dt,dt)
-
-    def move(self,parList):
-        """
-        Move particles one timestep.
-
-        Parameters
-        ----------
-        parList : Python List.
-            List of particles used in simulation.
-
-        Returns
-        -------
-        None.
-
-        """
-        for p in parList:
-            p.r += p.v*Physics.dt
-        Physics.time += Physics.dt
-
-    def collision(self,parList):
-        """
-        Particle collision handler.
-
-        Parameters
-        ----------
-        parList : Python List.
-            List of particles used in simulation.
-
-        Returns
-        -------
-        None.
-
+        Zombification (see sim2d.Epidemic): counts as humans, zombies and,
+        if the model has them, bitten and immune people.
         """
-        zombified = 0
-        listLen = len(parList)
-        for i in np.arange(listLen-1):
-            for j in np.arange(i+1,listLen):
-                d   = parList[i].radius + parList[j].radius
-                rij = parList[i].r - parList[j].r
-                rijN = np.linalg.norm( rij )
-                if( rijN < d ):
-                    # COLLISION! Case #1: Penetration
-                    # Game Engine Style Collision Correction
-                    mi = parList[i].mass
-                    mj = parList[j].mass
-                    M  = mi + mj
-                    rijU = rij/rijN                               # Unit Vector
-                    offset = (d - rijN)/2.0
-                    dr = offset*rijU
-                    parList[i].r += dr
-                    parList[j].r -= dr
-                    vij = parList[i].v - parList[j].v
-                    dv = 2.0*np.dot(vij,rijU)*rijU/M
-                    parList[i].v -= mj*dv
-                    parList[j].v += mi*dv
-                    # Zombification!
-                    if parList[i].form == 'zombie':
-                        if parList[j].form != 'zombie':
-                            parList[j].form = 'zombie'
-                            parList[j].color = 'lime'
-                            zombified += 1
-                    elif parList[j].form == 'zombie':
-                        if parList[i].form != 'zombie':
-                            parList[i].form = 'zombie'
-                            parList[i].color = 'lime'
-                            zombified += 1
-                elif( rijN == d ):
-                    # COLLISTION! Case #2: Perfect
-                    # This is going to be a VERY rare event ...
-                    mi = parList[i].mass
-                    mj = parList[j].mass
-                    M  = mi + mj
-                    rijU = rij/rijN                               # Unit Vector
-                    vij = parList[i].v - parList[j].v
-                    dv = 2.0*np.dot(vij,rijU)*rijU/M
-                    parList[i].v -= mj*dv
-                    parList[j].v += mi*dv
-                    # Zombification!
-                    if parList[i].form == 'zombie':
-                        if parList[j].form != 'zombie':
-                            parList[j].form = 'zombie'
-                            parList[j].color = 'lime'
-                            zombified += 1
-                    elif parList[j].form == 'zombie':
-                        if parList[i].form != 'zombie':
-                            parList[i].form = 'zombie'
-                            parList[i].color = 'lime'
-                            zombified += 1
-        return zombified
+        return Epidemic(Physics.skin,Physics.pBite,Physics.incubation,Physics.cure,
+                        names=('humans','zombies','bitten','immune'))
 # END: Physics
 
 class Simulation:
@@ -331,24 +165,19 @@ class Simulation:
     def __init__(self,numPars = 1):
         print('Welcome to the Pentagon Zombie Apocalypse!\n')
         self.numPars = numPars
-        self.humans = numPars - 1
-        self.zombies = 1
         self.parCnt = 0
-        self.fig, self.ax = plt.subplots()
-        self.fig.set_size_inches(Simulation.figW,Simulation.figH)
-        self.ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-        self.ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-        self.ax.set_title('Pentagon Zombie Apocalypse')
-        self.ax.axis('scaled')
-        self.ax.set_xlim([-Pentagon.rO*1.2,Pentagon.rO*1.2])
-        self.ax.set_ylim([-Pentagon.rO,Pentagon.rO*1.2])
+        self.engine = None
+        self.fig = None               # Figure is only created when rendering (see run).
+        self.ax = None
         self.geom = Pentagon()
-        self.particles = []
-        self.parPatchs = []
+        self.pars = None
         self.axList = []
         self.__limits()
         self.__setUp()
-        self.phys = Physics(self.particles)
+        walls = PolygonWalls(self.geom.walls,
+                             dict(polygon=[Pentagon.numVerts,Pentagon.rO,Pentagon.rI]))
+        self.engine = Engine(self.pars,walls,Physics.interaction(),fac=2.0,
+                             dtMax=Physics.dtMax,adaptive=Physics.adaptive)
 
     def __del__(self):
         pass
@@ -356,29 +185,70 @@ class Simulation:
     def initAnimate(self):
         return self.axList
 
-    def animate(self,i):
-        self.__cleanPlot()
-        self.axList = []
-        self.phys.move(self.particles)
-        self.geom.boundaryCheck(self.particles)
-        newZoms = self.phys.collision(self.particles)
-        self.humans -= newZoms
-        self.zombies += newZoms
-        self.axList.append(self.ax.text(-5, 4.5, 'Time = %.4f s'%Physics.time))
-        self.axList.append(self.ax.text(2.5, 4.75, 'Humans  = %i'%self.humans))
-        self.axList.append(self.ax.text(2.5, 4.25, 'Zombies = %i'%self.zombies))
-        for par in self.particles:
-            pp = plt.Circle(par.r, radius=Particle.radius, fill=True, color=par.color)
-            self.axList.append(self.ax.add_patch(pp))
+    def step(self):
+        """
+        Advance the apocalypse one time-step (no graphics).
+        """
+        self.engine.step()
+
+    def counts(self):
+        """
+        Extra snapshot entries: number of humans and zombies.
+        """
+        return self.engine.extra()
+
+    def animate(self,snap):
+        self.renderer.update(snap['r'],self.tagColors[snap['tag']])
+        self.tText.set_text('Time = %.4f s'%snap['t'])
+        self.hText.set_text('Humans  = %i'%snap['humans'])
+        self.zText.set_text('Zombies = %i'%snap['zombies'])
         return self.axList
 
-    def run(self,movie=False):
-        ani = animation.FuncAnimation(self.fig, self.animate, frames=269,
-                                      blit=True, init_func=self.initAnimate,
-                                      repeat=False)
+    def run(self,movie=False,nSteps=268,stride=1,prof=None):
+        import matplotlib.animation as animation   # Graphics are only imported to animate.
+        self.__setUpPlot()
+        self.engine.profile(prof)                   # Phase timers (see sim2d.profiling).
+        animate = self.animate if prof is None else prof.wrap('render',self.animate)
+        frames = snapshots(self.step,self.pars,nSteps,stride,copy=False,extra=self.counts)
+        self.ani = animation.FuncAnimation(self.fig, animate, frames=frames,
+                                           save_count=nSteps//stride+1,
+                                           blit=True, init_func=self.initAnimate,
+                                           repeat=False)
         if movie:
             pwriter = animation.PillowWriter(fps=60, metadata=dict(artist='Dr. Ryan Clement'))
-            ani.save('../movies/pentagon_zombie_apocalypse.gif',writer=pwriter)
+            self.ani.save('../movies/pentagon_zombie_apocalypse.gif',writer=pwriter)
+
+    def runHeadless(self,args):
+        """
+        Advance without graphics as requested on the command line.
+        """
+        info = dict(title='Pentagon Zombie Apocalypse',
+                    xlim=[-Pentagon.rO*1.2,Pentagon.rO*1.2],
+                    ylim=[-Pentagon.rO,Pentagon.rO*1.2],
+                    tagColors=list(Particle.colors),fill=True)
+        self.engine.runHeadless(args,info)
+
+    def __setUpPlot(self):
+        from matplotlib.ticker import AutoMinorLocator
+        from matplotlib.colors import to_rgba_array
+        from sim2d.render import ParticleRenderer
+        self.fig, self.ax = pyplot().subplots()
+        self.fig.set_size_inches(Simulation.figW,Simulation.figH)
+        self.ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        self.ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        self.ax.set_title('Pentagon Zombie Apocalypse')
+        self.ax.axis('scaled')
+        self.ax.set_xlim([-Pentagon.rO*1.2,Pentagon.rO*1.2])
+        self.ax.set_ylim([-Pentagon.rO,Pentagon.rO*1.2])
+        self.geom.createGraphics()
+        # Artists are created once; animate only updates them.
+        self.tagColors = to_rgba_array(Particle.colors)
+        self.renderer = ParticleRenderer(self.ax,self.pars.r,Particle.radius,
+                                         self.tagColors[self.pars.tag],fill=True)
+        self.tText = self.ax.text(-5, 4.5, 'Time = ')
+        self.hText = self.ax.text(2.5, 4.75, 'Humans  = ')
+        self.zText = self.ax.text(2.5, 4.25, 'Zombies = ')
+        self.axList = [self.renderer.artist, self.tText, self.hText, self.zText]
 
     def __limits(self):
         maxParticles = m.floor(Pentagon.area/Particle.boxArea)   # Estimate
@@ -387,97 +257,62 @@ class Simulation:
             print("Seriously! ... You MUST have at least one person (particle)")
             print("I choose 10 very unlucky people.")
             self.numPars = 10
-            self.humans = 9
-        if self.numPars > 500:
-            print("Set-up may take some time with this many particles.")
         if self.numPars > numParLim:
             print("Estimated Number of particles that will fit: ", maxParticles)
             print("Reducing requested number of particles to: ", numParLim)
             print("Please wait...")
             self.numPars = numParLim
-            self.humans = numParLim - 1
 
     def __setUp(self):
-        rCir = self.geom.rO         # Circumbscribed (Outer Pentagon)
-        rIns = self.geom.vecMagI    # Inscribed (Inner Pentagon)
-        while True:
-            randD  = (rCir - rIns)*np.random.random_sample() + rIns
-            randA  = 2.0*np.pi*np.random.random_sample()
-            rX     = randD*m.cos(randA)
-            rY     = randD*m.sin(randA)
-            testWD = self.geom.wallDistancing(rX,rY)
-            if not testWD:
-                continue
-            randV = 10.0*np.random.random_sample(2) - 5.0
-            par = Particle(rX,rY,'zombie',randV[0],randV[1])  # ZOMBIE!
-            self.parCnt += 1
-            self.parPatchs.append(plt.Circle(par.r, radius=Particle.radius, fill=True, color=par.color))
-            self.particles.append(par)
-            break
-        if self.numPars > 1:
-            # NOTE: Assuming we won't sample another particle overlapping the first.
-            while True:
-                randD  = (rCir - rIns)*np.random.random_sample() + rIns
-                randA  = 2.0*np.pi*np.random.random_sample()
-                rX     = randD*m.cos(randA)
-                rY     = randD*m.sin(randA)
-                testWD = self.geom.wallDistancing(rX,rY)
-                if not testWD:
-                    continue
-                randV = 10.0*np.random.random_sample(2) - 5.0
-                par = Particle(rX,rY,'human',randV[0],randV[1])
-                self.parCnt += 1
-                self.parPatchs.append(plt.Circle(par.r, radius=Particle.radius, fill=True, color=par.color))
-                self.particles.append(par)
-                break
-            while self.parCnt < self.numPars:
-                while True:
-                    randD  = (rCir - rIns)*np.random.random_sample() + rIns
-                    randA  = 2.0*np.pi*np.random.random_sample()
-                    rX     = randD*m.cos(randA)
-                    rY     = randD*m.sin(randA)
-                    testWD = self.geom.wallDistancing(rX,rY)
-                    if not testWD:
-                        continue
-                    testSD = self.__socialDistancing(rX,rY)
-                    if not testSD:
-                        continue
-                    randV = 10.0*np.random.random_sample(2) - 5.0
-                    par = Particle(rX,rY,'human',randV[0],randV[1])
-                    self.parCnt += 1
-                    self.parPatchs.append(plt.Circle(par.r, radius=Particle.radius, fill=True, color=par.color))
-                    self.particles.append(par)
-                    break
-
-    def __socialDistancing(self,x,y):
-        res = True
-        d   = 2.0*Particle.radius
-        new = np.array([x,y])
-        for j in np.arange(self.parCnt):
-            rnj = new - self.particles[j].r
-            rnjN = np.linalg.norm( rnj )
-            if( rnjN < d ):
-                res = False
-        return res
-
-    def __cleanPlot(self):
-        self.ax.clear()
-        self.ax.xaxis.set_minor_locator(AutoMinorLocator(10))
-        self.ax.yaxis.set_minor_locator(AutoMinorLocator(10))
-        self.ax.set_title('Pentagon Zombie Apocalypse')
-        self.ax.axis('scaled')
-        self.ax.set_xlim([-Pentagon.rO*1.2,Pentagon.rO*1.2])
-        self.ax.set_ylim([-Pentagon.rO,Pentagon.rO*1.2])
-        self.tText = self.ax.text(-5, 4.5, 'Time = ')
-        self.ax.add_line(self.geom.pGraphI[0])
-        self.ax.add_line(self.geom.pGraphO[0])
+        # Random non-overlapping positions between the walls (Poisson-disk
+        # sampling); the first person is patient zero.
+        rng = np.random.default_rng(np.random.randint(2**31))
+        placed = poissonDisk(self.numPars,Particle.radius,poly=self.geom.walls,rng=rng)
+        vels = 10.0*np.random.random_sample((self.numPars,2)) - 5.0
+        tags = np.full(self.numPars,Particle.HUMAN)
+        tags[0] = Particle.ZOMBIE                           # ZOMBIE!
+        self.parCnt = self.numPars
+        self.pars = Particles(placed[:,0],placed[:,1],vels[:,0],vels[:,1],
+                              Particle.radius,tag=tags)
 # END: Simulation
 ### END: CLASSES
 
+### FUNCTIONS
+def pyplot():
+    """
+    matplotlib.pyplot, imported on first use so that headless runs only
+    import NumPy (see sim2d.render.pyplot).
+    """
+    from sim2d.render import pyplot
+    return pyplot()
+
+def replica(seed,numPeople=250):
+    """
+    Ensemble member (see sim2d.ensemble): a fresh apocalypse with one
+    zombie. The random number generators are seeded by the ensemble runner.
+    """
+    sim = Simulation(numPeople+1)
+    return sim.step, sim.pars, sim.counts
+
+def batch(stores):
+    """
+    Ensemble members stepped together (see sim2d.batch): stores are the
+    initial states of the replicas.
+    """
+    return batched(stores,PolygonWalls.regular(Pentagon.numVerts,Pentagon.rO,Pentagon.rI),
+                   Physics.interaction(),fac=2.0,dtMax=Physics.dtMax)
+### END: FUNCTIONS
+
 if '__main__' == __name__:
+    args = runArgs('pentagon_zombie_apocalypse',steps=268,stride=1,contacts=True)
     numPeople = 250
     numFlag   = 1
     sim = Simulation(numPeople+1)
-    sim.run(movie=False)
-    plt.show()
+    if args.headless:
+        sim.runHeadless(args)
+    else:
+        prof = profiler(args)                       # --profile/--trace
+        sim.run(movie=False,nSteps=args.steps,stride=args.stride,prof=prof)
+        pyplot().show()
+        report(prof,args)
 
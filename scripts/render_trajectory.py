@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Program: render_trajectory
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Render a trajectory saved by a headless run (--headless --out traj) to a
+GIF or MP4 movie, drawing frames in parallel worker processes.
+
+    python hard_circle.py --headless --steps 1000 --stride 10 --out hc_traj
+    python render_trajectory.py hc_traj ../movies/hard_circle.gif --fps 10
+"""
+
+### IMPORTS
+import argparse
+import time
+from sim2d.movie import renderMovie
+
+
+if '__main__' == __name__:
+    parser = argparse.ArgumentParser(prog='render_trajectory')
+    parser.add_argument('trajectory', help='trajectory directory')
+    parser.add_argument('movie', help='output movie (.gif or .mp4)')
+    parser.add_argument('--fps', type=int, default=10,
+                        help='frames per second (default %(default)s)')
+    parser.add_argument('--every', type=int, default=1,
+                        help='use every n-th saved frame (default %(default)s)')
+    parser.add_argument('--start', type=int, default=0,
+                        help='first frame (default %(default)s)')
+    parser.add_argument('--stop', type=int, default=None,
+                        help='stop before this frame (default: last)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--size', type=float, nargs=2, default=(8,8),
+                        help='figure width and height in inches (default 8 8)')
+    parser.add_argument('--dpi', type=int, default=100,
+                        help='figure resolution (default %(default)s)')
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    n = renderMovie(args.trajectory, args.movie, args.fps, args.every,
+                    args.start, args.stop, args.workers, tuple(args.size), args.dpi)
+    print('Wrote %i frames to %s in %.1f s' % (n, args.movie, time.perf_counter() - t0))
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Package: sim2d
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Shared particle engine used by the scripts in this directory.
+"""
+
+from .particles import Particles
+from .boundaries import boxBoundaries, circleBoundaries
+from .polygon import Polygon
+from .collisions import collision, resolvePairs
+from .grid import cellPairs, allPairs
+from .events import EventDriven
+from .freeflight import FreeFlight
+from .observables import Observables
+from .profiling import Profiler
+from .contacts import ContactLog
+from .neighbors import VerletList
+from .scenario import (Engine, BoxWalls, CircleWalls, PolygonWalls, Ghost, Hard,
+                       Infection, Epidemic, Gravity)
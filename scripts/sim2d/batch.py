@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Program: batch
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+from .particles import Particles
+from .boundaries import boxBoundaries, circleBoundaries
+from .collisions import resolvePairs
+from .grid import cellPairs
+
+
+### CLASSES
+class Batch:
+    """
+    Batch: Many Small Systems Stepped Together
+
+        * M independent replicas of N circles each live in one Particles
+          store (replica k holds rows k*N to (k+1)*N - 1); r, v, radius,
+          mass and tag are also available as (M, N, ...) views.
+        * Every replica has its own time-step, clock and walls (a box or a
+          bounding circle per replica, or one Polygon for all), so each
+          replica evolves exactly as it would alone, but one move, one wall
+          check (the boundaries routines with walls per row) and one
+          collision pass handle all of them.
+        * The impulse on the walls is added up per replica (impulse, for
+          the pressure, see observables).
+        * Broad phase: replicas are laid side by side (shifted along x)
+          for the cell list, so circles of different replicas are never
+          paired; the collision mask keeps only pairs within one active
+          replica.
+        * Inactive replicas (see active) are frozen.
+    """
+
+    def __init__(self,stores,box=None,bcR=None,poly=None):
+        """
+        Batch Constructor
+
+        Parameters
+        ----------
+        stores : LIST
+            M Particles stores with the same number of circles (copied).
+        box : ARRAY, optional
+            (bL, bR, bD, bU) walls [m], one row per replica or one for all.
+        bcR : DOUBLE or ARRAY, optional
+            Radius of bounding circle [m], per replica or one for all.
+        poly : Polygon, optional
+            Polygon walls of every replica. Give one of box, bcR and poly.
+
+        Returns
+        -------
+        None.
+
+        """
+        if sum(w is not None for w in (box, bcR, poly)) != 1:
+            raise ValueError('Give one of box, bcR or poly.')
+        N = len(stores[0])
+        if any(len(p) != N for p in stores):
+            raise ValueError('Replicas must have the same number of circles.')
+        self.M = M = len(stores)
+        self.N = N
+        self.pars = Particles.fromArrays(np.concatenate([p.r for p in stores]),
+                                         np.concatenate([p.v for p in stores]),
+                                         np.concatenate([p.radius for p in stores]),
+                                         np.concatenate([p.mass for p in stores]),
+                                         np.concatenate([p.tag for p in stores]))
+        self.rep = np.repeat(np.arange(M), N)         # Replica of every row
+        self.t = np.array([p.t for p in stores], dtype=float)   # seconds   Clocks
+        self.active = np.ones(M, dtype=bool)
+        self.impulses = np.zeros(M*N)             # kg m/s   Impulse on the walls per row so far
+        self.box = self.bcR = self.poly = None
+        if box is not None:
+            box = np.broadcast_to(np.asarray(box, dtype=float), (M,4))
+            self.box = np.repeat(box, N, axis=0).T.copy()   # bL, bR, bD, bU of every row
+            lo, hi = box[:,0], box[:,1]
+        elif bcR is not None:
+            hi = np.broadcast_to(np.asarray(bcR, dtype=float), (M,))
+            self.bcR = np.repeat(hi, N)
+            lo = -hi
+        else:
+            self.poly = poly
+            xMin, xMax = poly.bounds()[:2]
+            lo = np.full(M, xMin)
+            hi = np.full(M, xMax)
+        # Replica k is shifted by off[k] along x for the broad phase.
+        span = np.max(hi - lo) + 4.0*self.pars.radius.max()
+        self.off = span*np.arange(M) - lo
+
+    @property
+    def impulse(self):
+        """
+        Impulse on the walls of every replica so far [kg m/s].
+        """
+        return self.impulses.reshape(self.M, self.N).sum(axis=1)
+
+    @property
+    def r(self):
+        return self.pars.r.reshape(self.M, self.N, 2)
+    @property
+    def v(self):
+        return self.pars.v.reshape(self.M, self.N, 2)
+    @property
+    def radius(self):
+        return self.pars.radius.reshape(self.M, self.N)
+    @property
+    def mass(self):
+        return self.pars.mass.reshape(self.M, self.N)
+    @property
+    def tag(self):
+        return self.pars.tag.reshape(self.M, self.N)
+
+    def replica(self,k):
+        """
+        Particles store of replica k (views, no copies).
+        """
+        s = slice(k*self.N, (k + 1)*self.N)
+        p = self.pars
+        return Particles.fromArrays(p.r[s], p.v[s], p.radius[s], p.mass[s], p.tag[s], self.t[k])
+
+    def timeStep(self,fac=2.0,dtMax=np.inf):
+        """
+        Time step control per replica, see Particles.timeStep.
+
+        Returns
+        -------
+        ARRAY
+            Time-step of every replica [s].
+
+        """
+        v = self.pars.v
+        vH = np.hypot(v[:,0], v[:,1])
+        with np.errstate(divide='ignore'):
+            dt = np.where(vH != 0, self.pars.radius/(fac*vH), np.inf)
+        return np.minimum(dtMax, dt.reshape(self.M, self.N).min(axis=1))
+
+    def step(self,dt,collide=True):
+        """
+        Advance the active replicas: move, walls and collisions.
+
+        Parameters
+        ----------
+        dt : DOUBLE or ARRAY
+            Time-step [s], one for all or one per replica.
+        collide : BOOL, optional
+            Circles collide (hard circles). The default is True.
+
+        Returns
+        -------
+        I, J : INT ARRAYS
+            Rows of the colliding pairs in the order they were handled
+            (replica k of a row is row//N).
+
+        """
+        p = self.pars
+        dt = np.where(self.active, dt, 0.0)
+        dtP = dt[self.rep]
+        p.r += p.v*dtP[:,None]
+        self.t += dt
+        if self.box is not None:
+            boxBoundaries(p, *self.box, impulses=self.impulses)
+        elif self.bcR is not None:
+            circleBoundaries(p, self.bcR, dtP, impulses=self.impulses)
+        else:
+            self.poly.boundaries(p, self.impulses)
+        if not collide:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int)
+        rs = p.r.copy()
+        rs[:,0] += self.off[self.rep]
+        I, J = cellPairs(rs, p.radius)
+        keep = (self.rep[I] == self.rep[J]) & self.active[self.rep[I]]
+        return resolvePairs(p.r, p.v, p.radius, p.mass, I[keep], J[keep])
+
+    def kineticEnergy(self):
+        """
+        Kinetic energy of every replica.
+        """
+        v = self.pars.v
+        return 0.5*np.sum(self.mass*np.einsum('ij,ij->i', v, v).reshape(self.M, self.N), axis=1)
+# END: Batch
+### END: CLASSES
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Program: boundaries
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+from . import kernels
+
+
+### FUNCTIONS
+def _param(a):
+    """
+    Scalar (float) or per-row (float array) parameter for the kernels.
+    """
+    return np.asarray(a, dtype=float) if isinstance(a, np.ndarray) else float(a)
+
+def _rows(a,m):
+    """
+    Rows m (index or mask) of a per-row parameter (an array); a scalar
+    applies to every row.
+    """
+    return a[m] if isinstance(a, np.ndarray) else a
+
+def boxBoundaries(pars,bL,bR,bD,bU,dt=None,impulses=None):
+    """
+    Particle interaction with the walls of a box:
+
+    Step 1: Check for particles that have crossed the
+            boundaries.
+    Step 2: If particle is at or past boundary reflect
+            it.
+
+    Parameters
+    ----------
+    pars : Particles
+        Particle store.
+    bL, bR, bD, bU : DOUBLE or ARRAY
+        Left, right, bottom and top of the box [m], one for all circles or
+        one per circle (e.g. replicas in a batch.Batch).
+    dt : DOUBLE or ARRAY, optional
+        Time-step [s]. If given the reflected circle is advanced by the
+        part of the time-step left after the wall crossing (ghost_box
+        style). The default is None, i.e. the circle is placed on the wall.
+    impulses : ARRAY, optional
+        The impulse of every circle on the walls is added to it (one entry
+        per circle). The default is None.
+
+    Returns
+    -------
+    DOUBLE
+        Impulse on the walls [kg m/s], the normal momentum of the reflected
+        circles times two (see observables for the pressure).
+
+    """
+    if kernels.useJit:
+        return kernels.reflectBox(pars.r, pars.v, pars.radius, pars.mass, _param(bL),
+                                  _param(bR), _param(bD), _param(bU),
+                                  0.0 if dt is None else _param(dt), dt is not None,
+                                  impulses)
+    x = pars.r[:,0]
+    y = pars.r[:,1]
+    vx = pars.v[:,0]
+    vy = pars.v[:,1]
+    radius = pars.radius
+    # Y
+    lo = y < (bD + radius)
+    hi = ~lo & (y > (bU - radius))
+    impulse = _reflect(y, vy, radius, pars.mass, lo, hi, bD, bU, dt, impulses)
+    # X
+    lo = x < (bL + radius)
+    hi = ~lo & (x > (bR - radius))
+    return impulse + _reflect(x, vx, radius, pars.mass, lo, hi, bL, bR, dt, impulses)
+
+def _reflect(s,vs,radius,mass,lo,hi,wLo,wHi,dt,impulses):
+    """
+    Reflect one coordinate (in place) of the circles flagged by lo (crossed
+    the low walls wLo) and hi (crossed the high walls wHi); walls and
+    time-step are scalars or per row. Returns the impulse on the walls.
+    """
+    hit = lo | hi
+    impulse = 2.0*np.dot(mass[hit], np.abs(vs[hit]))
+    if impulses is not None:
+        impulses[hit] += 2.0*mass[hit]*np.abs(vs[hit])
+    wLo, wHi = _rows(wLo, lo), _rows(wHi, hi)
+    if dt is None:
+        s[lo] = wLo + radius[lo]
+        s[hi] = wHi - radius[hi]
+    else:
+        tLo = _rows(dt, lo) - np.abs((wLo - s[lo])/vs[lo])
+        tHi = _rows(dt, hi) - np.abs((wHi - s[hi])/vs[hi])
+        s[lo] = wLo + vs[lo]*tLo + radius[lo]
+        s[hi] = wHi + vs[hi]*tHi - radius[hi]
+    vs[lo] *= -1.0
+    vs[hi] *= -1.0
+    return impulse
+
+def circleBoundaries(pars,bcR,dt,impulses=None):
+    """
+    Particle interaction with a bounding circle centered on the origin.
+
+    Mid-point approximation to true circle crossing. This method could be
+    iterated to a given tolerance. The time-step control should work well
+    with this approximation. If larger time-steps are used a few iterations
+    may be needed.
+
+    Parameters
+    ----------
+    pars : Particles
+        Particle store.
+    bcR : DOUBLE or ARRAY
+        Radius of bounding circle [m], one for all circles or one per
+        circle.
+    dt : DOUBLE or ARRAY
+        Time-step [s] of the move that may have crossed the boundary.
+    impulses : ARRAY, optional
+        The impulse of every circle on the wall is added to it (one entry
+        per circle). The default is None.
+
+    Returns
+    -------
+    DOUBLE
+        Impulse on the wall [kg m/s].
+
+    """
+    if kernels.useJit:
+        return kernels.reflectCircle(pars.r, pars.v, pars.radius, pars.mass,
+                                     _param(bcR), _param(dt), impulses)
+    d = np.hypot(pars.r[:,0], pars.r[:,1])   # Distance of particle center from origin.
+    out = np.nonzero(d + pars.radius > bcR)[0]
+    if out.size == 0:
+        return 0.0
+    r  = pars.r[out]
+    v  = pars.v[out]
+    dt = np.reshape(_rows(dt, out), (-1, 1))
+    rm = r - v*dt/2.0                        # Mid-point
+    rmN = np.hypot(rm[:,0], rm[:,1])
+    ru = rm/rmN[:,None]                      # Unit vector
+    vc = np.einsum('ij,ij->i', v, ru)
+    pars.v[out] = v - 2.0*vc[:,None]*ru
+    pars.r[out] = (_rows(bcR, out) - pars.radius[out])[:,None]*ru
+    if impulses is not None:
+        impulses[out] += 2.0*pars.mass[out]*np.abs(vc)
+    return 2.0*np.dot(pars.mass[out], np.abs(vc))
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Program: checkpoint
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Checkpoint files: one NumPy .npz file holding the Particles store (r, v,
+radius, mass, tag, t), the time-step number, the states of the NumPy
+(legacy) and Python random number generators, and whatever else a
+simulation needs to resume (class variables such as dt, counters, event
+queues). Restoring a checkpoint and running on gives bit-identical results
+to the run that was never stopped.
+"""
+
+### IMPORTS
+import os
+import random
+import numpy as np
+
+
+### CLASSES
+class Checkpointer:
+    """
+    Checkpointer: Snapshot consumer writing a checkpoint every 'every'
+    time-steps.
+
+        * The file is replaced atomically, so a run killed while writing
+          keeps the previous checkpoint.
+        * before (e.g. TrajectoryWriter.sync) is called first, so that all
+          output up to the checkpoint is on disk.
+    """
+
+    def __init__(self,fileName,every,pars,state=None,before=None):
+        """
+        Checkpointer Constructor
+
+        Parameters
+        ----------
+        fileName : STRING
+            Checkpoint file (.npz).
+        every : INT
+            Time-steps between checkpoints.
+        pars : Particles
+            Particle store of the simulation.
+        state : FUNCTION, optional
+            Returns a dictionary of the rest of the simulation state. The
+            default is None.
+        before : FUNCTION, optional
+            Called before every checkpoint. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.fileName = fileName
+        self.every    = every
+        self.pars     = pars
+        self.state    = state
+        self.before   = before
+
+    def __call__(self,snap):
+        step = int(snap['step'])
+        if step == 0 or step % self.every:
+            return
+        if self.before is not None:
+            self.before()
+        save(self.fileName, self.pars, step, **(self.state() if self.state else {}))
+# END: Checkpointer
+### END: CLASSES
+
+
+### FUNCTIONS
+def save(fileName,pars,step=0,**extra):
+    """
+    Write a checkpoint.
+
+    Parameters
+    ----------
+    fileName : STRING
+        Checkpoint file (.npz).
+    pars : Particles
+        Particle store.
+    step : INT, optional
+        Time-step number. The default is 0.
+    **extra :
+        Further state (scalars or arrays).
+
+    Returns
+    -------
+    None.
+
+    """
+    npState = np.random.get_state()
+    pyState = random.getstate()
+    data = dict(r=pars.r, v=pars.v, radius=pars.radius, mass=pars.mass,
+                tag=pars.tag, t=pars.t, step=step,
+                npKeys=npState[1], npPos=npState[2],
+                npGauss=(npState[3], npState[4]),
+                pyState=np.array(pyState[1], dtype=np.uint64),
+                pyGauss=np.nan if pyState[2] is None else pyState[2])
+    for k, val in extra.items():
+        data['x_' + k] = val
+    tmp = fileName + '.tmp.npz'
+    np.savez(tmp, **data)
+    os.replace(tmp, fileName)
+
+def load(fileName,pars,rng=True):
+    """
+    Restore a checkpoint into an existing Particles store (in place, so
+    every reference to it stays valid).
+
+    Parameters
+    ----------
+    fileName : STRING
+        Checkpoint file (.npz).
+    pars : Particles
+        Particle store with the same number of particles.
+    rng : BOOL, optional
+        Restore the random number generators. The default is True.
+
+    Returns
+    -------
+    step : INT
+        Time-step number of the checkpoint.
+    extra : DICT
+        Further state (see save).
+
+    """
+    with np.load(fileName) as data:
+        if data['r'].shape != pars.r.shape:
+            raise ValueError('Checkpoint holds %i particles, simulation %i.'
+                             % (len(data['r']), len(pars)))
+        pars.r[:]      = data['r']
+        pars.v[:]      = data['v']
+        pars.radius[:] = data['radius']
+        pars.mass[:]   = data['mass']
+        pars.tag[:]    = data['tag']
+        pars.t         = float(data['t'])
+        if rng:
+            has, cached = data['npGauss']
+            np.random.set_state(('MT19937', data['npKeys'], int(data['npPos']),
+                                 int(has), float(cached)))
+            gauss = float(data['pyGauss'])
+            random.setstate((3, tuple(int(i) for i in data['pyState']),
+                             None if np.isnan(gauss) else gauss))
+        extra = {k[2:]: data[k] for k in data.files if k.startswith('x_')}
+        return int(data['step']), extra
+### END: FUNCTIONS
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Program: collisions
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+from . import kernels
+from .grid import cellPairs
+
+
+### FUNCTIONS
+def collision(pars,pairs=None,neighbors=None):
+    """
+    Step 1: Detect collisions
+        Candidate pairs come from the cell list broad phase (only circles
+        in the same or adjacent grid cells can touch). Every candidate pair
+        closer than the sum of their radii is colliding.
+    Step 2: Handle collisions
+        Game engine style: the overlap is removed by pushing both circles
+        apart along the line of centers, then the elastic (mass weighted)
+        impulse is applied. With equal masses this is the same response as
+        the original hard_box/hard_circle code. See resolvePairs.
+
+    Parameters
+    ----------
+    pars : Particles
+        Particle store.
+    pairs : TUPLE of INT ARRAYS, optional
+        Candidate pairs (I, J). The default is cellPairs of the current
+        positions. Pass grid.allPairs(len(pars)) for the all-pairs check.
+    neighbors : VerletList, optional
+        Take the candidate pairs from a Verlet list (see neighbors), which
+        is only rebuilt when the circles have moved far enough. The default
+        is None.
+
+    Returns
+    -------
+    I, J : INT ARRAYS
+        Indices of the colliding pairs in the order they were handled.
+
+    """
+    if pairs is None:
+        pairs = cellPairs(pars.r, pars.radius) if neighbors is None else neighbors(pars)
+    return resolvePairs(pars.r, pars.v, pars.radius, pars.mass, *pairs)
+
+def resolvePairs(r,v,radius,mass,I,J):
+    """
+    Batched narrow phase. Positions and velocities are updated in place.
+
+    Pairs are handled in rounds. In each round every overlapping pair that
+    is the first remaining pair (in I, J order) of both of its circles is
+    resolved at once with array operations; no circle appears twice in a
+    round. A pair sharing a circle with an earlier pair therefore sees the
+    earlier correction, and the result is equal to the sequential loop over
+    the initially overlapping pairs; it depends on nothing but the pair
+    order. Pairs pushed into contact by a correction during the step are
+    left for the next step.
+
+    Parameters
+    ----------
+    r, v : ARRAYS
+        Positions [m] and velocities [m/s], one row per circle.
+    radius, mass : ARRAYS
+        Circle radii [m] and masses.
+    I, J : INT ARRAYS
+        Candidate pairs.
+
+    Returns
+    -------
+    I, J : INT ARRAYS
+        Indices of the colliding pairs in the order they were handled.
+
+    """
+    I = np.asarray(I, dtype=np.int64)
+    J = np.asarray(J, dtype=np.int64)
+    if kernels.useJit:
+        hit = kernels.collidePairs(r, v, radius, mass, I, J)
+        return I[hit], J[hit]
+    d = radius[I] + radius[J]
+    rij = r[I] - r[J]
+    hit = np.einsum('ij,ij->i', rij, rij) <= d*d
+    I = I0 = I[hit]
+    J = J0 = J[hit]
+    k = np.arange(I.size)                    # Position in handling order.
+    first = np.empty(radius.size, dtype=int)
+    done = []
+    while I.size:
+        # First remaining pair of every circle.
+        u, idx = np.unique(np.column_stack((I, J)).ravel(), return_index=True)
+        first[u] = idx//2
+        pos = np.arange(I.size)
+        sel = (first[I] == pos) & (first[J] == pos)
+        i = I[sel]
+        j = J[sel]
+        d   = radius[i] + radius[j]
+        rij = r[i] - r[j]
+        rijN = np.hypot(rij[:,0], rij[:,1])
+        hit = rijN <= d
+        # COLLISION! Case #1 (rijN < d): Penetration
+        #            Case #2 (rijN == d): Perfect, VERY rare ...
+        i = i[hit]
+        j = j[hit]
+        d = d[hit]
+        rijN = rijN[hit]
+        rijU = rij[hit]/rijN[:,None]                          # Unit Vectors
+        dr = ((d - rijN)/2.0)[:,None]*rijU
+        r[i] += dr
+        r[j] -= dr
+        mi = mass[i][:,None]
+        mj = mass[j][:,None]
+        vij = v[i] - v[j]
+        dv = 2.0*np.einsum('ij,ij->i', vij, rijU)[:,None]*rijU/(mi + mj)
+        v[i] -= mj*dv
+        v[j] += mi*dv
+        done.append(k[sel][hit])
+        I = I[~sel]
+        J = J[~sel]
+        k = k[~sel]
+    if not done:
+        return I, J
+    done = np.sort(np.concatenate(done))
+    return I0[done], J0[done]
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Program: contacts
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Contact log of an infection run: who infected whom, when and where. One
+row per transmission (optionally per contact, i.e. every colliding pair),
+stored column by column in the trajectory format (see trajectory; every
+row is a frame of scalars, so TrajectoryReader reads it):
+
+    log/
+        meta.json
+        src.bin     (rows,) int32    infecting circle (-1: initially infected)
+        dst.bin     (rows,) int32    infected circle (other circle of a contact)
+        t.bin       (rows,) float64  time [s]
+        x.bin       (rows,) float64  contact point (midpoint of the centers) [m]
+        y.bin       (rows,) float64
+        kind.bin    (rows,) int8     TRANSMISSION or CONTACT
+
+infectionTree and generationTimes answer the usual questions from it.
+"""
+
+### IMPORTS
+import os
+import json
+import numpy as np
+from .trajectory import TrajectoryReader, clear, truncate
+
+
+### SETTINGS
+CONTACT      = 0                     # kind of a contact without transmission
+TRANSMISSION = 1                     # kind of a transmission (or initial infection)
+FIELDS = (('src', np.int32), ('dst', np.int32), ('t', np.float64),
+          ('x', np.float64), ('y', np.float64), ('kind', np.int8))
+
+
+### CLASSES
+class ContactLog:
+    """
+    ContactLog: Append-Only Transmission (and Contact) Log
+
+        * The rows of a step are copied into column buffers with array
+          operations and written one chunk at a time (also by sync, e.g. at
+          a checkpoint), so logging costs little per step.
+        * A new log replaces one already in the directory and starts with
+          one row per initially infected circle (src = -1); with
+          append=True (a restarted run) the log is continued.
+        * Attach it to an Infection or Epidemic interaction (log attribute,
+          see scenario.Hard.record).
+    """
+
+    def __init__(self,path,pars=None,seeds=(),contacts=False,chunk=4096,append=False):
+        """
+        Contact Log Constructor
+
+        Parameters
+        ----------
+        path : STRING
+            Log directory (created if needed).
+        pars : Particles, optional
+            Particle store, for the rows of the seeds. The default is None.
+        seeds : INT ARRAY, optional
+            Initially infected circles, logged at the current time unless
+            the log is continued. The default is ().
+        contacts : BOOL, optional
+            Log every colliding pair, not only transmissions. The default
+            is False.
+        chunk : INT, optional
+            Rows per write. The default is 4096.
+        append : BOOL, optional
+            Continue the log in path (a restarted run). The default is
+            False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path     = path
+        self.contacts = contacts
+        self.chunk    = chunk
+        self.bufs     = {k: np.empty(chunk, dtype=d) for k, d in FIELDS}
+        self.fill     = 0
+        self.rows     = 0                # Rows on disk
+        os.makedirs(path, exist_ok=True)
+        meta = os.path.join(path, 'meta.json')
+        if append and os.path.exists(meta):
+            with open(meta) as f:
+                self.rows = json.load(f)['frames']
+        else:
+            clear(path)
+            self.__meta()
+            seeds = np.asarray(seeds, dtype=int)
+            if len(seeds):
+                self.append(np.full(len(seeds), -1), seeds, pars.t,
+                            pars.r[seeds], TRANSMISSION)
+
+    def __call__(self,pars,I,J,src,dst):
+        """
+        Log the transmissions src -> dst of a step (and the colliding pairs
+        I, J if contacts are logged).
+        """
+        if len(dst):
+            r = pars.r
+            self.append(src, dst, pars.t, 0.5*(r[src] + r[dst]), TRANSMISSION)
+        if self.contacts and len(I):
+            r = pars.r
+            self.append(I, J, pars.t, 0.5*(r[I] + r[J]), CONTACT)
+
+    def append(self,src,dst,t,xy,kind):
+        """
+        Append rows (arrays of equal length; t and kind may be scalars).
+        """
+        n = len(dst)
+        if self.fill + n > self.chunk:   # Rare: split over chunks.
+            m = self.chunk - self.fill
+            t = np.broadcast_to(t, (n,))
+            self.append(src[:m], dst[:m], t[:m], xy[:m], kind)
+            self.append(src[m:], dst[m:], t[m:], xy[m:], kind)
+            return
+        b, i, j = self.bufs, self.fill, self.fill + n
+        b['src'][i:j]  = src
+        b['dst'][i:j]  = dst
+        b['t'][i:j]    = t
+        b['x'][i:j]    = xy[:,0]
+        b['y'][i:j]    = xy[:,1]
+        b['kind'][i:j] = kind
+        self.fill = j
+        if self.fill == self.chunk:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered rows to the column files, right after the rows
+        recorded in meta.json (bytes a stopped run wrote beyond them are
+        overwritten and cut off, see trajectory.TrajectoryWriter).
+        """
+        if self.fill == 0:
+            return
+        for k, a in self.bufs.items():
+            name = os.path.join(self.path, k + '.bin')
+            with open(name, 'r+b' if os.path.exists(name) else 'wb') as f:
+                f.seek(self.rows*a.itemsize)
+                f.write(a[:self.fill].tobytes())
+                f.truncate()
+        self.rows += self.fill
+        self.fill = 0
+        self.__meta()
+
+    def sync(self):
+        """
+        Write every row logged so far.
+        """
+        self.flush()
+
+    def close(self):
+        self.flush()
+
+    def truncate(self,t):
+        """
+        Drop the rows after time t (e.g. logged after the checkpoint a run
+        is restarted from).
+        """
+        self.flush()
+        times = np.array(TrajectoryReader(self.path)['t'])
+        self.rows = int(np.searchsorted(times, t, side='right'))
+        truncate(self.path, self.rows)     # Also cuts off an interrupted write.
+
+    def __meta(self):
+        info = dict(frames=self.rows,
+                    fields={k: (np.dtype(d).str, []) for k, d in FIELDS},
+                    static=[], info=dict(contacts=self.contacts))
+        tmp = os.path.join(self.path, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(info, f)
+        os.replace(tmp, os.path.join(self.path, 'meta.json'))
+# END: ContactLog
+### END: CLASSES
+
+
+### FUNCTIONS
+def load(path):
+    """
+    Columns of a contact log as arrays.
+
+    Returns
+    -------
+    DICT
+        src, dst, t, x, y, kind (see the module docstring).
+
+    """
+    log = TrajectoryReader(path)
+    return {k: np.array(log[k]) for k, d in FIELDS}
+
+def infectionTree(log,n=None):
+    """
+    Who infected whom: the transmissions as a forest rooted at the
+    initially infected circles.
+
+    Parameters
+    ----------
+    log : DICT or STRING
+        Contact log columns (see load) or directory.
+    n : INT, optional
+        Number of circles. The default is the largest id logged plus one.
+
+    Returns
+    -------
+    DICT
+        Per circle: parent (infecting circle; -1 for initially infected and
+        never infected circles), t (time infected [s], NaN if never),
+        generation (0 for initially infected, -1 if never) and children
+        (number of circles it infected).
+
+    """
+    if isinstance(log, str):
+        log = load(log)
+    tx = log['kind'] == TRANSMISSION
+    src, dst, t = log['src'][tx], log['dst'][tx], log['t'][tx]
+    if n is None:
+        n = int(max(dst.max(initial=-1), src.max(initial=-1))) + 1
+    parent = np.full(n, -1)
+    time = np.full(n, np.nan)
+    parent[dst] = src
+    time[dst] = t
+    children = np.bincount(src[src >= 0], minlength=n)
+    # Generations in time order: a source is infected before it infects.
+    generation = np.full(n, -1)
+    order = np.argsort(t, kind='stable')
+    s, d = src[order], dst[order]
+    seeds = s < 0
+    generation[d[seeds]] = 0
+    s, d = s[~seeds], d[~seeds]
+    # Levels of the forest: every pass settles the next generation.
+    while len(d):
+        ready = generation[s] >= 0
+        if not ready.any():
+            break
+        generation[d[ready]] = generation[s[ready]] + 1
+        s, d = s[~ready], d[~ready]
+    return dict(parent=parent, t=time, generation=generation, children=children)
+
+def generationTimes(log,bins=None):
+    """
+    Generation times: time from the infection of a circle to each
+    infection it causes.
+
+    Parameters
+    ----------
+    log : DICT or STRING
+        Contact log columns (see load) or directory.
+    bins : INT or ARRAY, optional
+        Histogram bins (see numpy.histogram). The default is None.
+
+    Returns
+    -------
+    ARRAY
+        One generation time per transmission [s] (without bins), or the
+        histogram counts and bin edges (with bins).
+
+    """
+    if isinstance(log, str):
+        log = load(log)
+    tree = infectionTree(log)
+    tx = (log['kind'] == TRANSMISSION) & (log['src'] >= 0)
+    dt = log['t'][tx] - tree['t'][log['src'][tx]]
+    if bins is None:
+        return dt
+    return np.histogram(dt, bins)
+### END: FUNCTIONS
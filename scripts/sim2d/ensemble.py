@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Program: ensemble
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Many independent replicas of a scenario, each with its own seed, run
+headless on a pool of worker processes. Every replica is reduced to summary
+time series (time, kinetic energy and the scenario counts, e.g. humans and
+zombies) which are streamed to disk as replicas finish, and the mean,
+standard deviation and quantiles over the replicas are kept up to date.
+
+A scenario is a module level function make(seed) returning (step, pars,
+extra) as used by runner.snapshots. The runner seeds the NumPy (legacy) and
+Python random number generators with seed before calling it.
+"""
+
+### IMPORTS
+import os
+import io
+import json
+import random
+import warnings
+import contextlib
+import multiprocessing as mp
+import numpy as np
+from .runner import snapshots
+
+
+### CLASSES
+class Ensemble:
+    """
+    Ensemble: Summary time series of many replicas.
+
+        * One (replicas, frames) array per summary key, filled row by row
+          as replicas finish. With a directory the arrays are memory-mapped
+          <key>.npy files, next to done.npy (finished replicas) and
+          meta.json, so partial results can be read while a run goes on.
+        * Mean and standard deviation are updated with every replica
+          (Welford); quantiles are taken over the finished rows. NaN
+          entries (times a replica did not reach, see _sample) are left
+          out of the statistics of their frame.
+    """
+
+    def __init__(self,out,seeds,frames,meta=None):
+        """
+        Ensemble Constructor
+
+        Parameters
+        ----------
+        out : STRING
+            Results directory, or None to keep the arrays in memory.
+        seeds : ARRAY
+            Seed of every replica.
+        frames : INT
+            Length of the summary time series.
+        meta : DICT, optional
+            Further run settings for meta.json. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.out    = out
+        self.seeds  = np.asarray(seeds)
+        self.frames = frames
+        self.series = {}
+        self.mean   = {}
+        self.m2     = {}
+        self.count  = {}                 # Replicas with a value, per frame
+        self.n      = 0
+        self.done   = self.__array('done', bool, (self.seeds.size,), False)
+        if out is not None:
+            m = dict(meta or {}, seeds=self.seeds.tolist(), frames=frames)
+            with open(os.path.join(out, 'meta.json'), 'w') as f:
+                json.dump(m, f, indent=1)
+
+    def __array(self,key,dtype,shape,fill):
+        if self.out is None:
+            return np.full(shape, fill, dtype=dtype)
+        os.makedirs(self.out, exist_ok=True)
+        a = np.lib.format.open_memmap(os.path.join(self.out, key + '.npy'),
+                                      mode='w+', dtype=dtype, shape=shape)
+        a[:] = fill
+        return a
+
+    def add(self,k,summary):
+        """
+        Store the summary time series (dictionary of arrays) of replica k.
+        """
+        self.n += 1
+        for key, s in summary.items():
+            if key not in self.series:
+                self.series[key] = self.__array(key, float, (self.seeds.size, self.frames), np.nan)
+                self.mean[key] = np.zeros(self.frames)
+                self.m2[key] = np.zeros(self.frames)
+                self.count[key] = np.zeros(self.frames, dtype=int)
+            self.series[key][k] = s
+            ok = ~np.isnan(s)
+            self.count[key] += ok
+            d = np.where(ok, s - self.mean[key], 0.0)
+            self.mean[key] += d/np.maximum(self.count[key], 1)
+            self.m2[key] += np.where(ok, d*(s - self.mean[key]), 0.0)
+        self.done[k] = True
+        if self.out is not None:
+            for a in self.series.values():
+                a.flush()
+            self.done.flush()
+
+    def stats(self,q=(0.05,0.5,0.95)):
+        """
+        Statistics over the finished replicas.
+
+        Parameters
+        ----------
+        q : TUPLE, optional
+            Quantiles. The default is (0.05, 0.5, 0.95).
+
+        Returns
+        -------
+        DICT
+            For every key a dictionary of mean, std (per frame), q (one
+            row per quantile) and n (replicas with a value per frame; mean
+            and quantiles are NaN where there is none).
+
+        """
+        res = {}
+        for key, a in self.series.items():
+            n = self.count[key]
+            std = np.where(n > 0, np.sqrt(self.m2[key]/np.maximum(n - 1, 1)), np.nan)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)   # All-NaN frames
+                qs = np.nanquantile(a[self.done], q, axis=0)
+            res[key] = dict(mean=np.where(n > 0, self.mean[key], np.nan), std=std,
+                            q=qs, n=n.copy())
+        return res
+
+    def save(self,q=(0.05,0.5,0.95)):
+        """
+        Write the statistics (see stats) to stats.npz in the results
+        directory: <key>_mean, <key>_std, <key>_q and q.
+        """
+        data = dict(q=np.asarray(q))
+        for key, s in self.stats(q).items():
+            for name, a in s.items():
+                data[key + '_' + name] = a
+        np.savez(os.path.join(self.out, 'stats.npz'), **data)
+# END: Ensemble
+### END: CLASSES
+
+
+### FUNCTIONS
+def summarize(snap,pars):
+    """
+    Default replica summary of a snapshot: time, kinetic energy and every
+    scalar scenario entry (e.g. humans/zombies counts).
+    """
+    s = dict(t=snap['t'], ke=0.5*np.dot(pars.mass, np.einsum('ij,ij->i', pars.v, pars.v)))
+    for key, val in snap.items():
+        if key not in ('step', 't', 'r', 'v', 'tag') and np.ndim(val) == 0:
+            s[key] = val
+    return s
+
+# Settings of the replicas run by a worker process (see _init).
+_job = {}
+
+def _init(job):
+    _job.clear()
+    _job.update(job)
+
+def _replica(task):
+    """
+    Run one replica: task is (replica number, seed). Returns the number and
+    the summary time series.
+    """
+    k, seed = task
+    random.seed(int(seed))
+    np.random.seed(int(seed))
+    with contextlib.redirect_stdout(io.StringIO()):     # Scenario set-up chatter
+        step, pars, extra = _job['make'](int(seed))
+    times, summary = _job['times'], _job['summary']
+    rows = []
+    for snap in snapshots(step, pars, _job['nSteps'], _job['stride'], copy=False, extra=extra):
+        rows.append(summary(snap, pars))
+        if times is not None and snap['t'] >= times[-1]:
+            break
+    series = {key: np.array([row[key] for row in rows], dtype=float) for key in rows[0]}
+    return k, _sample(series, times)
+
+def _sample(series,times):
+    """
+    Summary time series at the given times: value of the last snapshot at or
+    before each time (counts stay integers). Times before the first or after
+    the last snapshot (a replica that ended early) are NaN. No times:
+    unchanged.
+    """
+    if times is None:
+        return series
+    t, times = series['t'], np.asarray(times)
+    idx = np.searchsorted(t, times, side='right') - 1
+    inside = (idx >= 0) & (times <= t[-1])
+    idx = np.maximum(idx, 0)
+    return {key: np.where(inside, s[idx], np.nan) for key, s in series.items()}
+
+def runEnsemble(make,seeds,nSteps,stride=1,out=None,workers=None,times=None,
+                summary=summarize,q=(0.05,0.5,0.95),progress=None):
+    """
+    Run seeded replicas of a scenario on a process pool.
+
+    Every worker process imports the scenario once and then runs replica
+    after replica, so only seeds and summaries travel between processes.
+
+    Parameters
+    ----------
+    make : FUNCTION
+        Module level make(seed) returning (step, pars, extra), see the
+        module docstring.
+    seeds : ARRAY
+        Seed of every replica.
+    nSteps : INT
+        Time-steps per replica (the most, with times).
+    stride : INT, optional
+        Time-steps per snapshot. The default is 1.
+    out : STRING, optional
+        Results directory (see Ensemble). The default is None (memory).
+    workers : INT, optional
+        Worker processes. The default is None (one per core); 1 runs in
+        this process.
+    times : ARRAY, optional
+        Common times to sample the summaries at (replicas with adaptive
+        time-steps reach a given step at different times). A replica stops
+        once it passes times[-1]. The default is None: one frame per
+        snapshot.
+    summary : FUNCTION, optional
+        summary(snap, pars) returning a dictionary of scalars. The default
+        is summarize.
+    q : TUPLE, optional
+        Quantiles saved with the results. The default is (0.05, 0.5, 0.95).
+    progress : FUNCTION, optional
+        Called as progress(k, done) after each replica. The default is
+        None.
+
+    Returns
+    -------
+    Ensemble
+
+    """
+    seeds = np.asarray(seeds)
+    frames = nSteps//stride + 1 if times is None else len(times)
+    job = dict(make=make, nSteps=nSteps, stride=stride, summary=summary,
+               times=None if times is None else np.asarray(times, dtype=float))
+    ens = Ensemble(out, seeds, frames,
+                   meta=dict(nSteps=nSteps, stride=stride,
+                             times=None if times is None else job['times'].tolist()))
+    tasks = list(enumerate(seeds))
+    workers = os.cpu_count() if workers is None else workers
+    if workers == 1:
+        _init(job)
+        results = map(_replica, tasks)
+        pool = None
+    else:
+        pool = mp.get_context().Pool(min(workers, len(tasks)), initializer=_init, initargs=(job,))
+        results = pool.imap_unordered(_replica, tasks)
+    try:
+        for k, series in results:
+            ens.add(k, series)
+            if progress is not None:
+                progress(k, ens.n)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if out is not None:
+        ens.save(q)
+    return ens
+
+def runBatch(make,batch,seeds,nSteps,stride=1,out=None,times=None,
+             q=(0.05,0.5,0.95),progress=None):
+    """
+    Run seeded replicas of a scenario together in this process as one
+    Batch (see batch.Batch): for many small systems one vectorized step of
+    all replicas costs little more than a step of one. Results are the same
+    as runEnsemble's with the default summary.
+
+    Parameters
+    ----------
+    make : FUNCTION
+        make(seed), see runEnsemble; only its particle store (the initial
+        state) is used.
+    batch : FUNCTION
+        batch(stores) returning (step, b, extra): a function advancing all
+        replicas one time-step, the Batch and a function returning a
+        dictionary of per-replica arrays (e.g. humans/zombies counts) or
+        None.
+    seeds, nSteps, stride, out, times, q, progress :
+        See runEnsemble.
+
+    Returns
+    -------
+    Ensemble
+
+    """
+    seeds = np.asarray(seeds)
+    frames = nSteps//stride + 1 if times is None else len(times)
+    ens = Ensemble(out, seeds, frames,
+                   meta=dict(nSteps=nSteps, stride=stride, batch=True,
+                             times=None if times is None else np.asarray(times).tolist()))
+    stores = []
+    for seed in seeds:
+        random.seed(int(seed))
+        np.random.seed(int(seed))
+        with contextlib.redirect_stdout(io.StringIO()):
+            stores.append(make(int(seed))[1])
+    step, b, extra = batch(stores)
+    rows = []
+    for i in np.arange(nSteps + 1):
+        if i > 0:
+            if not b.active.any():
+                break
+            step()
+        if i % stride == 0:
+            row = dict(t=b.t.copy(), ke=b.kineticEnergy())
+            row.update(extra() if extra else {})
+            rows.append(row)
+            if times is not None:
+                b.active &= b.t < times[-1]          # Replica done (see _replica).
+    series = {key: np.array([row[key] for row in rows], dtype=float) for key in rows[0]}
+    for k in np.arange(b.M):
+        ens.add(k, _sample({key: s[:,k] for key, s in series.items()}, times))
+        if progress is not None:
+            progress(k, ens.n)
+    if out is not None:
+        ens.save(q)
+    return ens
+
+def load(out):
+    """
+    Read a results directory (see Ensemble).
+
+    Returns
+    -------
+    DICT
+        meta (settings), done (finished replicas), stats (see Ensemble.save)
+        and one memory-mapped (replicas, frames) array per summary key.
+
+    """
+    with open(os.path.join(out, 'meta.json')) as f:
+        res = dict(meta=json.load(f))
+    for name in sorted(os.listdir(out)):
+        if name.endswith('.npy'):
+            res[name[:-4]] = np.load(os.path.join(out, name), mmap_mode='r')
+    if os.path.exists(os.path.join(out, 'stats.npz')):
+        with np.load(os.path.join(out, 'stats.npz')) as data:
+            res['stats'] = dict(data)
+    return res
+### END: FUNCTIONS
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Program: events
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import heapq
+import numpy as np
+
+
+### CLASSES
+class EventDriven:
+    """
+    EventDriven: Event-Driven Hard Disk Engine
+
+        * Exact time of impact dynamics: circles fly freely between events
+          and every pair or wall collision happens at the instant of
+          contact. No overlaps, no penetration correction and no time-step
+          control.
+        * Each circle keeps only its next predicted event in a priority
+          queue. An event is stale (lazy invalidation) if one of its circles
+          has collided since the prediction. A stale event whose own circle
+          is unchanged triggers a new prediction for that circle.
+        * Bounded by a box (bL, bR, bD, bU) or a circle of radius bcR
+          centered on the origin. Masses come from the Particles store.
+        * Predictions test one circle against all others with array
+          operations, i.e. O(N) per event.
+    """
+    # Class Variables
+    WALLX  = -1              # Event partner of a left/right wall hit.
+    WALLY  = -2              # Event partner of a bottom/top wall hit.
+    WALLC  = -3              # Event partner of a bounding circle hit.
+
+    def __init__(self,pars,box=None,bcR=None):
+        """
+        Event-Driven Engine Constructor
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store. Circles must not overlap.
+        box : TUPLE, optional
+            (bL, bR, bD, bU) walls of the box [m].
+        bcR : DOUBLE, optional
+            Radius of bounding circle [m]. Give either box or bcR.
+
+        Returns
+        -------
+        None.
+
+        """
+        if (box is None) == (bcR is None):
+            raise ValueError('Give either box or bcR.')
+        self.pars  = pars
+        self.box   = box
+        self.bcR   = bcR
+        self.t     = pars.t                  # seconds   Time of the particle store
+        self.count = np.zeros(len(pars), dtype=np.int64)   # Events per circle
+        self.nPair = 0                       # #         Pair collisions so far
+        self.nWall = 0                       # #         Wall collisions so far
+        self.queue = []
+        self.seq   = 0                       # Tie breaker for equal event times
+        for i in np.arange(len(pars)):
+            self.__predict(i)
+
+    def step(self,dt):
+        """
+        Advance the simulation by dt [s].
+        """
+        self.advance(self.t + dt)
+
+    def advance(self,tEnd):
+        """
+        Process every event up to tEnd [s] and drift to tEnd.
+        """
+        count = self.count
+        while self.queue and self.queue[0][0] <= tEnd:
+            tE, _, i, j, cI, cJ = heapq.heappop(self.queue)
+            if cI != count[i]:
+                continue                     # Stale: circle i has a newer event.
+            self.__drift(tE)
+            if j >= 0 and cJ != count[j]:
+                self.__predict(i)            # Stale: partner changed.
+                continue
+            if j >= 0:
+                self.__collide(i, j)
+                count[j] += 1
+                self.__predict(j)
+                self.nPair += 1
+            else:
+                self.__wall(i, j)
+                self.nWall += 1
+            count[i] += 1
+            self.__predict(i)
+        self.__drift(tEnd)
+
+    def state(self):
+        """
+        Engine state for a checkpoint (see checkpoint.save): event counts,
+        collision counters and the event queue in heap order.
+        """
+        q = self.queue
+        return dict(edCount=self.count, edPair=self.nPair, edWall=self.nWall,
+                    edSeq=self.seq, edT=self.t,
+                    edQT=np.array([e[0] for e in q], dtype=float),
+                    edQ=np.array([e[1:] for e in q], dtype=np.int64).reshape(-1,5))
+
+    def restore(self,state):
+        """
+        Resume from a checkpoint (see state). The particle store must be
+        restored first.
+        """
+        self.count[:] = state['edCount']
+        self.nPair = int(state['edPair'])
+        self.nWall = int(state['edWall'])
+        self.seq   = int(state['edSeq'])
+        self.t     = float(state['edT'])
+        self.queue = [(tE,) + tuple(int(i) for i in e)
+                      for tE, e in zip(state['edQT'].tolist(), state['edQ'])]
+
+    def __drift(self,t):
+        self.pars.r += self.pars.v*(t - self.t)
+        self.pars.t = self.t = t
+
+    def __collide(self,i,j):
+        pars = self.pars
+        rij = pars.r[i] - pars.r[j]
+        rijU = rij/np.linalg.norm(rij)       # Unit Vector
+        mi = pars.mass[i]
+        mj = pars.mass[j]
+        vij = pars.v[i] - pars.v[j]
+        dv = 2.0*np.dot(vij,rijU)*rijU/(mi + mj)
+        pars.v[i] -= mj*dv
+        pars.v[j] += mi*dv
+
+    def __wall(self,i,wall):
+        v = self.pars.v
+        if wall == EventDriven.WALLX:
+            v[i,0] *= -1.0
+        elif wall == EventDriven.WALLY:
+            v[i,1] *= -1.0
+        else:
+            ru = self.pars.r[i]/np.linalg.norm(self.pars.r[i])
+            v[i] -= 2.0*np.dot(v[i],ru)*ru
+
+    def __wallTime(self,i):
+        """
+        Time until circle i hits the boundary and the wall it hits.
+        """
+        r = self.pars.r[i]
+        v = self.pars.v[i]
+        R = self.pars.radius[i]
+        if self.box is not None:
+            bL, bR, bD, bU = self.box
+            tW = np.inf
+            wall = EventDriven.WALLX
+            for k, lo, hi, w in ((0, bL, bR, EventDriven.WALLX),
+                                 (1, bD, bU, EventDriven.WALLY)):
+                if v[k] > 0:
+                    tk = (hi - R - r[k])/v[k]
+                elif v[k] < 0:
+                    tk = (lo + R - r[k])/v[k]
+                else:
+                    continue
+                if tk < tW:
+                    tW = tk
+                    wall = w
+            return tW, wall
+        a = np.dot(v,v)
+        if a == 0:
+            return np.inf, EventDriven.WALLC
+        b = np.dot(r,v)
+        c = np.dot(r,r) - (self.bcR - R)**2
+        return (-b + np.sqrt(max(b*b - a*c, 0.0)))/a, EventDriven.WALLC
+
+    def __predict(self,i):
+        """
+        Push the next event of circle i.
+        """
+        pars = self.pars
+        tE, j = self.__wallTime(i)
+        dr = pars.r[i] - pars.r
+        dv = pars.v[i] - pars.v
+        b = np.einsum('ij,ij->i', dr, dv)
+        b[i] = 0.0
+        dvv = np.einsum('ij,ij->i', dv, dv)
+        sig = pars.radius[i] + pars.radius
+        disc = b*b - dvv*(np.einsum('ij,ij->i', dr, dr) - sig*sig)
+        ok = np.nonzero((b < 0) & (disc >= 0))[0]
+        if ok.size:
+            tP = -(b[ok] + np.sqrt(disc[ok]))/dvv[ok]
+            k = np.argmin(tP)
+            if tP[k] < tE:
+                tE = tP[k]
+                j = ok[k]
+        if tE == np.inf:
+            return
+        cJ = self.count[j] if j >= 0 else 0
+        self.seq += 1
+        heapq.heappush(self.queue, (self.t + max(tE, 0.0), self.seq, i, j,
+                                    self.count[i], cJ))
+# END: EventDriven
+### END: CLASSES
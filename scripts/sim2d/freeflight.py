@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Program: freeflight
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+
+
+### CLASSES
+class FreeFlight:
+    """
+    FreeFlight: Closed-Form Motion of Ghosts (no interactions, no forces)
+
+        * Every circle flies straight and reflects specularly off the walls,
+          so its position at any time follows directly from the state at a
+          reference time, in O(N) and without stepping through the history.
+        * Box: the walls are unfolded. Along each axis a circle moves freely
+          on a line and its position is folded back into the box (period
+          twice the free length).
+        * Bounding circle: after the first wall hit every chord has the same
+          length and turns the hit point by the same central angle, so the
+          state after n chords is the first chord turned by n times that
+          angle.
+        * Sampling is exact (no time-step error) at any time, e.g. t = 10**6
+          s, so frames can be sparse.
+    """
+
+    def __init__(self,pars,box=None,bcR=None):
+        """
+        Free Flight Constructor
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store; its current state is the reference state.
+        box : TUPLE, optional
+            (bL, bR, bD, bU) walls [m].
+        bcR : DOUBLE, optional
+            Radius of bounding circle centered on the origin [m]. Give box
+            or bcR.
+
+        Returns
+        -------
+        None.
+
+        """
+        if (box is None) == (bcR is None):
+            raise ValueError('Give box or bcR.')
+        self.pars = pars
+        self.box  = None if box is None else tuple(float(b) for b in box)
+        self.bcR  = bcR
+        self.anchor()
+
+    def anchor(self):
+        """
+        Take the current state of the particle store as the reference state.
+        """
+        self.r0 = self.pars.r.copy()
+        self.v0 = self.pars.v.copy()
+        self.t0 = self.pars.t
+        if self.bcR is not None:
+            self.__chords()
+
+    def __chords(self):
+        # First wall hit, velocity after it, chord duration and turn angle.
+        R  = self.bcR - self.pars.radius
+        p, v = self.r0, self.v0
+        pv = np.einsum('ij,ij->i', p, v)
+        vv = np.einsum('ij,ij->i', v, v)
+        pp = np.einsum('ij,ij->i', p, p)
+        cross = p[:,0]*v[:,1] - p[:,1]*v[:,0]     # Angular momentum per mass
+        moving = vv > 0
+        vv1 = np.where(moving, vv, 1.0)
+        disc = np.maximum(pv*pv - vv*(pp - R*R), 0.0)
+        self.tHit = np.where(moving, (np.sqrt(disc) - pv)/vv1, np.inf)
+        q = p + v*np.where(moving, self.tHit, 0.0)[:,None]
+        n = q/R[:,None]
+        self.q1 = q                                # First hit point
+        self.v1 = v - 2.0*np.einsum('ij,ij->i', v, n)[:,None]*n
+        b = np.minimum(np.abs(cross)/np.sqrt(vv1), R)   # Distance of the chords from the origin
+        self.tau = np.where(moving, 2.0*np.sqrt(R*R - b*b)/np.sqrt(vv1), np.inf)
+        self.theta = np.where(cross < 0, -2.0, 2.0)*np.arccos(b/R)
+
+    def at(self,t):
+        """
+        Positions and velocities at time t.
+
+        Parameters
+        ----------
+        t : DOUBLE
+            Time [s] (not before the reference time).
+
+        Returns
+        -------
+        r, v : ARRAYS
+            Circle centers [m] and velocities [m/s], one row per circle.
+
+        """
+        dt = t - self.t0
+        if self.box is not None:
+            return self.__box(dt)
+        return self.__circle(dt)
+
+    def __box(self,dt):
+        bL, bR, bD, bU = self.box
+        radius = self.pars.radius
+        r = np.empty_like(self.r0)
+        v = np.empty_like(self.v0)
+        for c, lo, hi in ((0, bL, bR), (1, bD, bU)):
+            lo = lo + radius
+            L = (hi - radius) - lo
+            u = np.mod(self.r0[:,c] - lo + self.v0[:,c]*dt, 2.0*L)   # Unfolded
+            back = u > L
+            r[:,c] = lo + np.where(back, 2.0*L - u, u)
+            v[:,c] = np.where(back, -self.v0[:,c], self.v0[:,c])
+        return r, v
+
+    def __circle(self,dt):
+        before = dt < self.tHit
+        s = np.where(before, 0.0, dt - self.tHit)
+        with np.errstate(invalid='ignore'):
+            n = np.where(before, 0.0, np.floor(s/self.tau))   # Chords completed
+        s = s - n*np.where(before, 0.0, self.tau)
+        a = np.fmod(n*self.theta, 2.0*np.pi)
+        c, sn = np.cos(a), np.sin(a)
+        rc = self.q1 + self.v1*s[:,None]
+        r = np.stack((c*rc[:,0] - sn*rc[:,1], sn*rc[:,0] + c*rc[:,1]), axis=1)
+        v = np.stack((c*self.v1[:,0] - sn*self.v1[:,1], sn*self.v1[:,0] + c*self.v1[:,1]), axis=1)
+        r[before] = self.r0[before] + self.v0[before]*dt
+        v[before] = self.v0[before]
+        return r, v
+
+    def seek(self,t):
+        """
+        Set the particle store to its state at time t.
+        """
+        r, v = self.at(t)
+        self.pars.r[:] = r
+        self.pars.v[:] = v
+        self.pars.t = t
+
+    def step(self,dt):
+        """
+        Advance the particle store by dt (any size).
+        """
+        self.seek(self.pars.t + dt)
+
+    def state(self):
+        """
+        Reference state for a checkpoint (see checkpoint.save).
+        """
+        return dict(ffR0=self.r0, ffV0=self.v0, ffT0=self.t0)
+
+    def restore(self,state):
+        """
+        Resume from a checkpoint (see state).
+        """
+        self.r0 = np.array(state['ffR0'], dtype=float)
+        self.v0 = np.array(state['ffV0'], dtype=float)
+        self.t0 = float(state['ffT0'])
+        if self.bcR is not None:
+            self.__chords()
+# END: FreeFlight
+### END: CLASSES
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Program: grid
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+
+
+### FUNCTIONS
+def cellPairs(r,radius,cellSize=None):
+    """
+    Broad phase: uniform grid (cell list).
+
+    Step 1: Bin the circle centers into square cells no smaller than the
+            largest circle diameter, so two circles can only touch if
+            their cells are the same or adjacent.
+    Step 2: Pair every circle with the circles of its own cell and of four
+            of its eight neighbor cells (a half stencil, so every pair of
+            cells is visited once).
+
+    Parameters
+    ----------
+    r : ARRAY
+        Circle centers [m], one row per circle.
+    radius : ARRAY
+        Circle radii [m].
+    cellSize : DOUBLE, optional
+        Cell side [m]. The default is the largest circle diameter.
+
+    Returns
+    -------
+    I, J : INT ARRAYS
+        Candidate pairs with I < J, sorted by I then J (the same order as
+        the all-pairs double loop).
+
+    """
+    n = radius.size
+    if n < 2:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    if cellSize is None:
+        cellSize = 2.0*radius.max()
+    c = np.floor((r - r.min(axis=0))/cellSize).astype(np.int64)
+    nx = c[:,0].max() + 3                    # Empty padding column on both sides.
+    key = (c[:,1] + 1)*nx + (c[:,0] + 1)
+    order = np.argsort(key, kind='stable')
+    sKey = key[order]
+    iList = []
+    jList = []
+    for dx, dy in ((0,0), (1,0), (-1,1), (0,1), (1,1)):
+        nKey = key + dy*nx + dx
+        start = np.searchsorted(sKey, nKey, side='left')
+        cnt = np.searchsorted(sKey, nKey, side='right') - start
+        total = cnt.sum()
+        if total == 0:
+            continue
+        i = np.repeat(np.arange(n), cnt)
+        # Position of each pair inside its neighbor cell.
+        first = np.cumsum(cnt) - cnt
+        k = np.arange(total) - np.repeat(first, cnt) + np.repeat(start, cnt)
+        j = order[k]
+        if dx == 0 and dy == 0:
+            keep = i < j
+            i = i[keep]
+            j = j[keep]
+        iList.append(i)
+        jList.append(j)
+    if not iList:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    i = np.concatenate(iList)
+    j = np.concatenate(jList)
+    I = np.minimum(i, j)
+    J = np.maximum(i, j)
+    srt = np.lexsort((J, I))
+    return I[srt], J[srt]
+
+def allPairs(n):
+    """
+    Every pair i < j of n circles (no broad phase), in double loop order.
+
+    Parameters
+    ----------
+    n : INT
+        Number of circles.
+
+    Returns
+    -------
+    I, J : INT ARRAYS
+        All pairs with I < J.
+
+    """
+    return np.triu_indices(n, 1)
+### END: FUNCTIONS
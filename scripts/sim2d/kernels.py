@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Program: kernels
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Compiled versions of the step kernels (integrate, wall reflection, pair
+collisions and infection spread) working on the flat Particles arrays. They are compiled with
+numba when it is installed; otherwise the NumPy code in particles,
+boundaries and collisions is used. Both paths give the same results.
+
+Importing numba and loading the cached kernels takes most of a second, a
+visible share of a short run: SIM2D_NUMBA=0 in the environment skips numba
+altogether (the NumPy code is used).
+"""
+
+### IMPORTS
+import os
+import math
+import numpy as np
+if os.environ.get('SIM2D_NUMBA', '1') == '0':
+    numba = None
+else:
+    try:
+        import numba
+    except ImportError:
+        numba = None
+
+
+### SETTINGS
+available = numba is not None   # numba is installed (and not switched off).
+useJit    = available           # Use the compiled kernels (set False for NumPy).
+
+def _jit(f):
+    if numba is None:
+        return f
+    return numba.njit(cache=True)(f)
+
+def _at(a,k):
+    """
+    Row k of a per-row parameter (an array); a scalar applies to every row.
+    Compiled separately for scalars and arrays, so scalar walls cost
+    nothing extra.
+    """
+    return a[k] if isinstance(a, np.ndarray) else a
+
+if numba is not None:
+    @numba.extending.overload(_at)
+    def _atCompiled(a,k):
+        if isinstance(a, numba.types.Array):
+            return lambda a, k: a[k]
+        return lambda a, k: a
+
+
+### FUNCTIONS
+@_jit
+def integrate(r,v,ax,ay,dt):
+    """
+    Move every circle one time-step with constant acceleration (ax, ay).
+    """
+    for k in range(r.shape[0]):
+        r[k,0] += v[k,0]*dt + ax*(dt*dt)/2.0
+        r[k,1] += v[k,1]*dt + ay*(dt*dt)/2.0
+        v[k,0] += ax*dt
+        v[k,1] += ay*dt
+
+@_jit
+def reflectBox(r,v,radius,mass,bL,bR,bD,bU,dt,advance,impulses):
+    """
+    Box walls, see boundaries.boxBoundaries (advance: ghost_box style);
+    walls and time-step are scalars or given per row. Returns the impulse
+    on the walls and adds that of every circle to impulses (unless None).
+    """
+    impulse = 0.0
+    for k in range(r.shape[0]):
+        rad = radius[k]
+        for c in (1, 0):                     # Y then X
+            if c == 1:
+                wLo = _at(bD, k)
+                wHi = _at(bU, k)
+            else:
+                wLo = _at(bL, k)
+                wHi = _at(bR, k)
+            s = r[k,c]
+            vs = v[k,c]
+            if s < wLo + rad:
+                if advance:
+                    r[k,c] = wLo + vs*(_at(dt, k) - abs((wLo - s)/vs)) + rad
+                else:
+                    r[k,c] = wLo + rad
+            elif s > wHi - rad:
+                if advance:
+                    r[k,c] = wHi + vs*(_at(dt, k) - abs((wHi - s)/vs)) - rad
+                else:
+                    r[k,c] = wHi - rad
+            else:
+                continue
+            v[k,c] = -vs
+            impulse += 2.0*mass[k]*abs(vs)
+            if impulses is not None:
+                impulses[k] += 2.0*mass[k]*abs(vs)
+    return impulse
+
+@_jit
+def reflectCircle(r,v,radius,mass,bcR,dt,impulses):
+    """
+    Bounding circle, see boundaries.circleBoundaries; radius and time-step
+    are scalars or given per row. Returns the impulse on the wall and adds
+    that of every circle to impulses (unless None).
+    """
+    impulse = 0.0
+    for k in range(r.shape[0]):
+        R = _at(bcR, k)
+        if math.hypot(r[k,0], r[k,1]) + radius[k] > R:
+            h = _at(dt, k)/2.0
+            xm = r[k,0] - v[k,0]*h
+            ym = r[k,1] - v[k,1]*h
+            rm = math.hypot(xm, ym)
+            rux = xm/rm
+            ruy = ym/rm
+            vc = v[k,0]*rux + v[k,1]*ruy
+            v[k,0] = v[k,0] - 2.0*vc*rux
+            v[k,1] = v[k,1] - 2.0*vc*ruy
+            r[k,0] = (R - radius[k])*rux
+            r[k,1] = (R - radius[k])*ruy
+            impulse += 2.0*mass[k]*abs(vc)
+            if impulses is not None:
+                impulses[k] += 2.0*mass[k]*abs(vc)
+    return impulse
+
+@_jit
+def collidePairs(r,v,radius,mass,I,J):
+    """
+    Narrow phase, see collisions.resolvePairs: pairs overlapping at the
+    start of the step are handled one after the other in I, J order.
+
+    Returns
+    -------
+    BOOL ARRAY
+        True for every candidate pair that collided.
+    """
+    n = I.size
+    hit = np.zeros(n, dtype=np.bool_)
+    for k in range(n):
+        i = I[k]
+        j = J[k]
+        d = radius[i] + radius[j]
+        rx = r[i,0] - r[j,0]
+        ry = r[i,1] - r[j,1]
+        hit[k] = rx*rx + ry*ry <= d*d
+    for k in range(n):
+        if not hit[k]:
+            continue
+        i = I[k]
+        j = J[k]
+        d = radius[i] + radius[j]
+        rx = r[i,0] - r[j,0]
+        ry = r[i,1] - r[j,1]
+        rijN = math.hypot(rx, ry)
+        if rijN > d:
+            hit[k] = False
+            continue
+        # COLLISION! Case #1 (rijN < d): Penetration
+        #            Case #2 (rijN == d): Perfect, VERY rare ...
+        ux = rx/rijN                                      # Unit Vector
+        uy = ry/rijN
+        offset = (d - rijN)/2.0
+        r[i,0] += offset*ux
+        r[i,1] += offset*uy
+        r[j,0] -= offset*ux
+        r[j,1] -= offset*uy
+        mi = mass[i]
+        mj = mass[j]
+        vDu = (v[i,0] - v[j,0])*ux + (v[i,1] - v[j,1])*uy
+        dvx = 2.0*vDu*ux/(mi + mj)
+        dvy = 2.0*vDu*uy/(mi + mj)
+        v[i,0] -= mj*dvx
+        v[i,1] -= mj*dvy
+        v[j,0] += mi*dvx
+        v[j,1] += mi*dvy
+    return hit
+
+@_jit
+def spreadPairs(I,J,source,target,chain,keep):
+    """
+    Transmissions, see scenario.spread: pairs handled one after the other
+    in I, J order (keep: pairs that may transmit).
+
+    Returns
+    -------
+    src, dst : INT ARRAYS
+        Infecting and infected circle of every transmission.
+    """
+    isSource = source.copy()
+    isTarget = target.copy()
+    src = np.empty(I.size, dtype=np.int64)
+    dst = np.empty(I.size, dtype=np.int64)
+    m = 0
+    for k in range(I.size):
+        if not keep[k]:
+            continue
+        i = I[k]
+        j = J[k]
+        if isSource[i] and isTarget[j]:
+            s, d = i, j
+        elif isSource[j] and isTarget[i]:
+            s, d = j, i
+        else:
+            continue
+        isTarget[d] = False
+        if chain:
+            isSource[d] = True
+        src[m] = s
+        dst[m] = d
+        m += 1
+    return src[:m], dst[:m]
+### END: FUNCTIONS
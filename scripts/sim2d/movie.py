@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Program: movie
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Offline movies from saved trajectories (see trajectory). Frames are drawn
+off-screen (Agg) by a pool of worker processes, each holding its own
+figure and memory-mapped reader, and handed back in frame order to the
+encoder: Pillow frame by frame for .gif, an ffmpeg pipe for .mp4. The
+figures do not go through pyplot, so importing this module or drawing in
+the calling process leaves its matplotlib backend alone.
+
+Scene description (the trajectory info, see runner.runHeadless):
+    title      STRING     Axes title.
+    box        LIST       [bL, bR, bD, bU] walls [m]; also the default limits.
+    bcR        DOUBLE     Bounding circle radius [m].
+    polygon    LIST       [numVerts, rO, rI] regular polygon hallway [m].
+    xlim/ylim  LIST       Axes limits [m].
+    cmap       STRING     Colormap applied to the static 'color' values.
+    tagColors  LIST       One color per tag (colors follow the tags).
+    fill       BOOL       Filled circles.
+    linewidth  DOUBLE     Circle outline width.
+"""
+
+### IMPORTS
+import os
+import shutil
+import subprocess
+import multiprocessing as mp
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Circle
+from matplotlib.colors import to_rgba_array
+from matplotlib.ticker import AutoMinorLocator
+from .trajectory import TrajectoryReader
+from .render import ParticleRenderer
+
+
+### CLASSES
+class FrameDrawer:
+    """
+    FrameDrawer: One off-screen figure of a trajectory scene; draws any
+    frame of the trajectory to an RGBA array.
+    """
+
+    def __init__(self,path,size=(8,8),dpi=100):
+        """
+        Frame Drawer Constructor
+
+        Parameters
+        ----------
+        path : STRING
+            Trajectory directory.
+        size : TUPLE, optional
+            Figure size [in]. The default is (8,8).
+        dpi : INT, optional
+            Figure resolution. The default is 100.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.traj = TrajectoryReader(path)
+        scene = self.traj.info
+        self.fig = Figure(figsize=size, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.ax = ax = self.fig.subplots()
+        ax.grid(True, which='major', color='lightgrey')
+        ax.xaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.yaxis.set_minor_locator(AutoMinorLocator(10))
+        ax.set_title(scene.get('title', os.path.basename(os.path.normpath(path))))
+        ax.axis('scaled')
+        self.__boundary(scene)
+        r0 = self.traj['r'][0] if len(self.traj) else np.zeros((0,2))
+        radius = self.traj.static.get('radius', 0.1)
+        self.tagColors = None
+        if 'tagColors' in scene:
+            self.tagColors = to_rgba_array(scene['tagColors'])
+            colors = self.tagColors[self.traj['tag'][0]]
+        elif 'color' in self.traj.static:
+            colors = matplotlib.colormaps[scene.get('cmap', 'gist_rainbow')](self.traj.static['color'])
+        else:
+            colors = 'black'
+        self.renderer = ParticleRenderer(ax, r0, radius, colors,
+                                         fill=scene.get('fill', False),
+                                         linewidth=scene.get('linewidth', 1))
+        self.tText = ax.text(0.02, 0.97, '', transform=ax.transAxes, va='top')
+        self.counts = [k for k in ('humans', 'zombies') if k in self.traj.fields]
+        self.cText = ax.text(0.98, 0.97, '', transform=ax.transAxes, va='top', ha='right')
+
+    def __boundary(self,scene):
+        ax = self.ax
+        if 'box' in scene:
+            bL, bR, bD, bU = scene['box']
+            ax.plot([bL, bR, bR, bL, bL], [bD, bD, bU, bU, bD], c='black')
+            ax.set_xlim([bL, bR])
+            ax.set_ylim([bD, bU])
+        if 'bcR' in scene:
+            bcR = scene['bcR']
+            ax.add_patch(Circle((0,0), radius=bcR, color='black',
+                                fill=False, linewidth=1))
+            ax.set_xlim([-1.1*bcR, 1.1*bcR])
+            ax.set_ylim([-1.1*bcR, 1.1*bcR])
+        if 'polygon' in scene:
+            n, rO, rI = scene['polygon']
+            a = 2.0*np.pi*np.arange(n+1)/n + np.pi/2.0
+            for rP in (rO, rI):
+                ax.plot(rP*np.cos(a), rP*np.sin(a), c='black')
+            ax.set_xlim([-1.2*rO, 1.2*rO])
+            ax.set_ylim([-1.2*rO, 1.2*rO])
+        if 'xlim' in scene:
+            ax.set_xlim(scene['xlim'])
+        if 'ylim' in scene:
+            ax.set_ylim(scene['ylim'])
+
+    def draw(self,k):
+        """
+        Draw frame k.
+
+        Returns
+        -------
+        ARRAY
+            (height, width, 4) uint8 RGBA image.
+
+        """
+        traj = self.traj
+        colors = None
+        if self.tagColors is not None:
+            colors = self.tagColors[traj['tag'][k]]
+        self.renderer.update(traj['r'][k], colors)
+        self.tText.set_text('Time = %.4f s' % traj['t'][k])
+        if self.counts:
+            self.cText.set_text('\n'.join('%s = %i' % (c.capitalize(), traj[c][k])
+                                          for c in self.counts))
+        self.fig.canvas.draw()
+        return np.asarray(self.fig.canvas.buffer_rgba()).copy()
+# END: FrameDrawer
+### END: CLASSES
+
+
+### FUNCTIONS
+_drawer = None       # FrameDrawer of a worker process
+
+def _initWorker(path,size,dpi):
+    global _drawer
+    matplotlib.use('Agg')            # Workers never show a window.
+    _drawer = FrameDrawer(path, size, dpi)
+
+def _drawFrame(k):
+    return _drawer.draw(k)
+
+def renderFrames(path,frames,workers=None,size=(8,8),dpi=100,chunk=4):
+    """
+    Generator: draw trajectory frames in worker processes.
+
+    Parameters
+    ----------
+    path : STRING
+        Trajectory directory.
+    frames : SEQUENCE of INT
+        Frame numbers to draw.
+    workers : INT, optional
+        Worker processes (1: draw in this process). The default is None,
+        i.e. one per CPU.
+    size : TUPLE, optional
+        Figure size [in]. The default is (8,8).
+    dpi : INT, optional
+        Figure resolution. The default is 100.
+    chunk : INT, optional
+        Frames handed to a worker at a time. The default is 4.
+
+    Yields
+    ------
+    ARRAY
+        RGBA image of each frame, in the order of frames.
+
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        drawer = FrameDrawer(path, size, dpi)
+        for k in frames:
+            yield drawer.draw(k)
+        return
+    with mp.get_context('spawn').Pool(workers, _initWorker, (path, size, dpi)) as pool:
+        for img in pool.imap(_drawFrame, frames, chunksize=chunk):
+            yield img
+
+def encodeGif(images,fileName,fps):
+    """
+    Stream RGBA images to an animated GIF: every frame is quantized
+    (adaptive palette, Pillow) and written as soon as it arrives, so only
+    one frame is in memory.
+    """
+    from PIL import Image, GifImagePlugin
+    duration = int(round(1000.0/fps))
+    f = None
+    try:
+        for img in images:
+            im = Image.fromarray(img).convert('RGB').convert('P', palette=Image.Palette.ADAPTIVE)
+            if f is None:
+                f = open(fileName, 'wb')
+                header, _ = GifImagePlugin.getheader(im, info=dict(loop=0))
+                f.write(b''.join(header))
+            for data in GifImagePlugin.getdata(im, duration=duration,
+                                               include_color_table=True):
+                f.write(data)
+            f.flush()
+        if f is not None:
+            f.write(b';')                    # GIF trailer
+    finally:
+        if f is not None:
+            f.close()
+
+def encodeMp4(images,fileName,fps):
+    """
+    Stream RGBA images to ffmpeg (H.264 MP4).
+    """
+    ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+    if ffmpeg is None:
+        raise RuntimeError('ffmpeg is needed for .mp4 movies (or write a .gif).')
+    proc = None
+    for img in images:
+        if proc is None:
+            h, w = img.shape[:2]
+            cmd = [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo',
+                   '-pix_fmt', 'rgba', '-s', '%ix%i' % (w, h), '-r', str(fps),
+                   '-i', '-', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                   '-pix_fmt', 'yuv420p', '-vcodec', 'libx264', fileName]
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        proc.stdin.write(img.tobytes())
+    if proc is not None:
+        proc.stdin.close()
+        if proc.wait():
+            raise RuntimeError('ffmpeg failed writing %s' % fileName)
+
+def renderMovie(path,fileName,fps=10,every=1,start=0,stop=None,workers=None,
+                size=(8,8),dpi=100):
+    """
+    Render a saved trajectory to a movie.
+
+    Parameters
+    ----------
+    path : STRING
+        Trajectory directory (see trajectory.TrajectoryWriter).
+    fileName : STRING
+        Movie file (.gif or .mp4).
+    fps : INT, optional
+        Frames per second. The default is 10.
+    every : INT, optional
+        Use every every-th trajectory frame. The default is 1.
+    start, stop : INT, optional
+        Trajectory frame range. The default is all frames.
+    workers : INT, optional
+        Worker processes (see renderFrames). The default is None.
+    size : TUPLE, optional
+        Figure size [in]. The default is (8,8).
+    dpi : INT, optional
+        Figure resolution. The default is 100.
+
+    Returns
+    -------
+    INT
+        Number of movie frames.
+
+    """
+    n = len(TrajectoryReader(path))
+    frames = range(start, n if stop is None else min(stop, n), every)
+    if len(frames) == 0:
+        raise ValueError('No frames to render in %s.' % path)
+    images = renderFrames(path, frames, workers, size, dpi)
+    ext = os.path.splitext(fileName)[1].lower()
+    if ext == '.gif':
+        encodeGif(images, fileName, fps)
+    elif ext == '.mp4':
+        encodeMp4(images, fileName, fps)
+    else:
+        raise ValueError('Movie file must be .gif or .mp4: %s' % fileName)
+    return len(frames)
+### END: FUNCTIONS
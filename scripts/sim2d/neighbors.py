@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Program: neighbors
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+from .grid import cellPairs
+
+
+### CLASSES
+class VerletList:
+    """
+    VerletList: Candidate Pairs Kept over Many Time-Steps
+
+        * The list holds every pair closer than the sum of the radii plus
+          a skin when it is built (cell list broad phase).
+        * As long as no circle has moved more than half the skin since,
+          every pair that touches now is still in the list, so the list is
+          only rebuilt when the displacements get that large (see
+          __call__). The check costs one pass over the positions; with the
+          time-step control (a circle moves at most a fraction of its
+          radius per step) a skin of a diameter or two lasts several
+          steps.
+        * Pairs come in the same order as cellPairs (I < J, sorted by I
+          then J), so collisions are resolved exactly as with a fresh cell
+          list.
+    """
+
+    def __init__(self,skin):
+        """
+        Verlet List Constructor
+
+        Parameters
+        ----------
+        skin : DOUBLE
+            Extra distance [m] beyond touching for a pair to be listed.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.skin   = skin
+        self.r0     = None       # Positions at the last build
+        self.I      = None
+        self.J      = None
+        self.builds = 0          # Number of builds so far
+        self.calls  = 0          # Number of calls so far
+
+    def __call__(self,pars):
+        """
+        Candidate pairs of the current positions (see collisions.collision).
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store.
+
+        Returns
+        -------
+        I, J : INT ARRAYS
+            Candidate pairs with I < J, sorted by I then J.
+
+        """
+        self.calls += 1
+        if self.r0 is None or self.r0.shape != pars.r.shape:
+            self.build(pars)
+        elif len(pars) > 1:
+            # A pair comes closer by at most the sum of the displacements
+            # of its circles, so the list holds while the two largest
+            # displacements stay below the skin (each below skin/2 is the
+            # usual, stricter rule).
+            d = pars.r - self.r0
+            d2 = np.partition(np.einsum('ij,ij->i', d, d), len(pars) - 2)[-2:]
+            if np.sum(np.sqrt(d2)) >= self.skin:
+                self.build(pars)
+        return self.I, self.J
+
+    def build(self,pars):
+        """
+        Rebuild the list from the current positions.
+        """
+        r, radius = pars.r, pars.radius
+        I, J = cellPairs(r, radius + 0.5*self.skin)
+        cut = radius[I] + radius[J] + self.skin
+        rij = r[I] - r[J]
+        near = np.einsum('ij,ij->i', rij, rij) < cut*cut
+        self.I = I[near]
+        self.J = J[near]
+        self.r0 = r.copy()
+        self.builds += 1
+# END: VerletList
+### END: CLASSES
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Program: observables
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Physical quantities computed while a simulation runs, every few time-steps,
+and streamed to a time-series file (a trajectory directory, see
+trajectory.TrajectoryWriter, read back with TrajectoryReader):
+
+    t, step      time [s] and time-step number
+    ke           kinetic energy [J]
+    p            total momentum (px, py) [kg m/s]
+    pressure     wall pressure [N/m]: impulse on the walls since the last
+                 sample per wall length and time (2D), from the impulses
+                 the boundary routines add up
+    vHist        histogram of the velocity components (vx and vy pooled)
+    speedHist    histogram of the speeds
+    rdf          radial distribution function g(r)
+
+Bin edges are kept with the series (static vEdges, speedEdges, rEdges).
+"""
+
+### IMPORTS
+import numpy as np
+from .grid import cellPairs
+from .trajectory import TrajectoryWriter
+
+
+### CLASSES
+class Observables:
+    """
+    Observables: Time Series of Physical Quantities
+
+        * sample() computes every quantity from the particle store at once
+          (vectorized, O(N) plus the pairs within rMax for g(r)).
+        * wrap(step) returns a time-step function that samples every
+          `every` steps, so the cadence does not depend on the snapshot
+          stride.
+        * Wall pressure needs the accumulated wall impulse of the engine
+          (see scenario.Engine.impulse); it is NaN at the first sample and
+          for engines that do not report impulses.
+    """
+
+    def __init__(self,pars,path=None,every=1,area=None,perimeter=None,impulse=None,
+                 vMax=None,rMax=None,bins=50,append=False):
+        """
+        Observables Constructor
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store.
+        path : STRING, optional
+            Time-series directory (replaced if it holds one). The default
+            is None, i.e. samples are only returned.
+        every : INT, optional
+            Time-steps per sample (see wrap). The default is 1.
+        area : DOUBLE, optional
+            Area inside the walls [m**2], for g(r). The default is None (no
+            g(r)).
+        perimeter : DOUBLE, optional
+            Length of the walls [m], for the pressure. The default is None.
+        impulse : FUNCTION, optional
+            Returns the impulse on the walls accumulated so far [kg m/s].
+            The default is None (no pressure).
+        vMax : DOUBLE, optional
+            Velocity histogram range [m/s]: components in [-vMax, vMax],
+            speeds in [0, vMax]. The default is three times the initial
+            root-mean-square speed.
+        rMax : DOUBLE, optional
+            g(r) range [m]. The default is five mean diameters.
+        bins : INT, optional
+            Number of bins of the histograms and g(r). The default is 50.
+        append : BOOL, optional
+            Append to the time series in path (a restarted run). The
+            default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.pars      = pars
+        self.every     = every
+        self.area      = area
+        self.perimeter = perimeter
+        self.impulse   = impulse
+        if vMax is None:
+            vMax = 3.0*np.sqrt(np.mean(np.einsum('ij,ij->i', pars.v, pars.v)))
+            vMax = vMax if vMax > 0 else 1.0
+        if rMax is None:
+            rMax = 10.0*np.mean(pars.radius)
+        self.vEdges     = np.linspace(-vMax, vMax, bins + 1)
+        self.speedEdges = np.linspace(0.0, vMax, bins + 1)
+        self.rEdges     = np.linspace(0.0, rMax, bins + 1)
+        self.count = 0                   # Time-step number (see wrap)
+        self.last  = None                # (t, impulse) at the last sample
+        self.path  = path
+        self.append = append
+        self.writer = None               # Opened at the first sample (after a restart
+                                         # has truncated the file, see runner.runHeadless).
+
+    def sample(self,step=None):
+        """
+        Compute every quantity now (and write it if there is a file).
+
+        Returns
+        -------
+        DICT
+            One sample (see the module docstring).
+
+        """
+        p = self.pars
+        v2 = np.einsum('ij,ij->i', p.v, p.v)
+        s = dict(step=self.count if step is None else step, t=p.t,
+                 ke=0.5*np.dot(p.mass, v2), p=momentum(p),
+                 pressure=np.nan,
+                 vHist=np.histogram(p.v, self.vEdges)[0],
+                 speedHist=np.histogram(np.sqrt(v2), self.speedEdges)[0])
+        if self.impulse is not None:
+            J = self.impulse()
+            if self.last is not None and self.perimeter and p.t > self.last[0]:
+                s['pressure'] = (J - self.last[1])/(self.perimeter*(p.t - self.last[0]))
+            self.last = (p.t, J)
+        if self.area:
+            s['rdf'] = rdf(p.r, self.rEdges, self.area)
+        if self.path is not None:
+            if self.writer is None:
+                self.writer = TrajectoryWriter(self.path,
+                                               static=dict(vEdges=self.vEdges,
+                                                           speedEdges=self.speedEdges,
+                                                           rEdges=self.rEdges),
+                                               info=dict(every=self.every),
+                                               append=self.append)
+            self.writer(s)
+        return s
+
+    def wrap(self,step,start=0):
+        """
+        Time-step function that also samples every `every` steps.
+
+        Parameters
+        ----------
+        step : FUNCTION
+            Advances the simulation one time-step.
+        start : INT, optional
+            Time-step number of the current state; 0 also samples it.
+            The default is 0.
+
+        Returns
+        -------
+        FUNCTION
+
+        """
+        self.count = start
+        if start == 0:
+            self.sample()
+        def observed():
+            step()
+            self.count += 1
+            if self.count % self.every == 0:
+                self.sample()
+        return observed
+
+    def state(self):
+        """
+        Checkpoint data: the bin edges and the last sample the pressure is
+        measured from.
+        """
+        t, J = (np.nan, np.nan) if self.last is None else self.last
+        return dict(obsT=t, obsImpulse=J, obsVEdges=self.vEdges,
+                    obsSpeedEdges=self.speedEdges, obsREdges=self.rEdges)
+
+    def restore(self,s):
+        """
+        Resume from checkpoint data (see state).
+        """
+        self.last = None
+        if 'obsT' not in s:
+            return
+        if not np.isnan(s['obsT']):
+            self.last = (float(s['obsT']), float(s['obsImpulse']))
+        self.vEdges     = np.array(s['obsVEdges'], dtype=float)
+        self.speedEdges = np.array(s['obsSpeedEdges'], dtype=float)
+        self.rEdges     = np.array(s['obsREdges'], dtype=float)
+
+    def sync(self):
+        """
+        Wait until every sample so far is on disk.
+        """
+        if self.writer is not None:
+            self.writer.sync()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+# END: Observables
+### END: CLASSES
+
+
+### FUNCTIONS
+def kineticEnergy(pars):
+    """
+    Total kinetic energy [J].
+    """
+    return 0.5*np.dot(pars.mass, np.einsum('ij,ij->i', pars.v, pars.v))
+
+def momentum(pars):
+    """
+    Total momentum (px, py) [kg m/s].
+    """
+    return pars.mass @ pars.v
+
+def rdf(r,edges,area):
+    """
+    Radial distribution function g(r) of the circle centers.
+
+    Pairs closer than edges[-1] come from the cell list; the counts are
+    divided by those of an ideal gas with the same density. Walls are not
+    corrected for, so g(r) drops below one at distances comparable to the
+    size of the container.
+
+    Parameters
+    ----------
+    r : ARRAY
+        Circle centers [m], one row per circle.
+    edges : ARRAY
+        Bin edges [m].
+    area : DOUBLE
+        Area the circles live in [m**2].
+
+    Returns
+    -------
+    ARRAY
+        g(r) per bin.
+
+    """
+    n = len(r)
+    rMax = edges[-1]
+    if n < 2:
+        return np.zeros(len(edges) - 1)
+    I, J = cellPairs(r, np.full(n, 0.5*rMax))
+    d = r[I] - r[J]
+    d = np.sqrt(np.einsum('ij,ij->i', d, d))
+    counts = np.histogram(d[d < rMax], edges)[0]
+    shell = np.pi*(edges[1:]**2 - edges[:-1]**2)
+    return 2.0*area*counts/(n*(n - 1)*shell)
+### END: FUNCTIONS
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Program: parallel
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import atexit
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from .particles import Particles
+from .boundaries import boxBoundaries, circleBoundaries
+from .collisions import resolvePairs
+from .grid import cellPairs
+
+
+### CLASSES
+class Decomposed:
+    """
+    Decomposed: Hard Disk Engine Split over Worker Processes
+
+        * The particle arrays of the Particles store are moved into shared
+          memory; every worker process maps the same arrays, so there is
+          nothing to send between processes but short commands.
+        * Moves and walls: each worker handles a fixed block of particles.
+        * Collisions: the domain is cut into 2*numProcs vertical strips and
+          worker w owns strips 2w and 2w+1. A pair belongs to the strip
+          holding its midpoint. Each worker reads the particles of its
+          strip plus a halo of half the largest diameter on both sides
+          (the centers of touching circles are at most one diameter apart,
+          so the partner of a pair is at most that far from the midpoint;
+          the halo exchange is a read of the shared arrays), so pairs
+          across strip borders are found. Even strips are resolved first, then
+          odd strips: strips handled at the same time are at least one
+          strip apart, so no particle is changed by two workers at once.
+        * Strips must be at least two largest diameters wide; fewer
+          workers are used if the domain is too narrow.
+        * The result depends on the number of workers (the order pairs
+          are resolved in) but not on timing.
+        * close (or a with block) stops the workers and frees the shared
+          memory; it is also called at exit for a store never closed.
+    """
+
+    def __init__(self,pars,numProcs,box=None,bcR=None):
+        """
+        Domain Decomposition Constructor
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store. Its arrays are replaced by shared memory views
+            (same values) until close.
+        numProcs : INT
+            Number of worker processes.
+        box : TUPLE, optional
+            (bL, bR, bD, bU) walls of the box [m].
+        bcR : DOUBLE, optional
+            Radius of bounding circle [m]. Give either box or bcR.
+
+        Returns
+        -------
+        None.
+
+        """
+        if (box is None) == (bcR is None):
+            raise ValueError('Give either box or bcR.')
+        self.pars = pars
+        lo, hi = (box[0], box[1]) if box is not None else (-bcR, bcR)
+        dMax = 2.0*pars.radius.max()
+        numProcs = max(1, min(numProcs, int((hi - lo)/(4.0*dMax))))
+        self.numProcs = numProcs
+        edges = np.linspace(lo, hi, 2*numProcs + 1)
+        edges[0], edges[-1] = -np.inf, np.inf
+        self.nPair = 0                       # #         Pair collisions so far
+        # Shared memory
+        n = len(pars)
+        self.blocks = []
+        arrays = []
+        for name in ('r', 'v', 'radius', 'mass', 'tag'):
+            a = getattr(pars, name)
+            shm = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+            s = np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)
+            s[:] = a
+            setattr(pars, name, s)
+            self.blocks.append(shm)
+            arrays.append((shm.name, a.shape, a.dtype.str))
+        # Workers
+        ctx = mp.get_context()
+        chunks = np.linspace(0, n, numProcs + 1).astype(int)
+        self.conns = []
+        self.procs = []
+        for w in np.arange(numProcs):
+            conn, child = ctx.Pipe()
+            p = ctx.Process(target=_worker, daemon=True,
+                            args=(child, arrays, chunks[w], chunks[w+1],
+                                  edges[2*w:2*w+3], 0.5*dMax, box, bcR))
+            p.start()
+            self.conns.append(conn)
+            self.procs.append(p)
+        atexit.register(self.close)
+
+    def step(self,dt):
+        """
+        Advance the simulation by dt [s]: move, walls and collisions.
+        """
+        self.__all('move', dt)
+        self.nPair += sum(self.__all('collide', 0))      # Even strips
+        self.nPair += sum(self.__all('collide', 1))      # Odd strips
+        self.pars.t += dt
+
+    def close(self):
+        """
+        Stop the workers and give the Particles store private arrays again.
+        """
+        if not self.procs:
+            return
+        atexit.unregister(self.close)
+        for conn in self.conns:
+            conn.send(('stop', None))
+        for p in self.procs:
+            p.join()
+        self.procs = []
+        for name in ('r', 'v', 'radius', 'mass', 'tag'):
+            setattr(self.pars, name, np.array(getattr(self.pars, name)))
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def __all(self,cmd,arg):
+        # Send a command to every worker and wait for all of them.
+        for conn in self.conns:
+            conn.send((cmd, arg))
+        return [conn.recv() for conn in self.conns]
+# END: Decomposed
+### END: CLASSES
+
+
+### FUNCTIONS
+def _worker(conn,arrays,a,b,edges,halo,box,bcR):
+    """
+    Worker process of Decomposed: particles a:b for moves and walls, strips
+    [edges[0], edges[1]) and [edges[1], edges[2]) for collisions.
+    """
+    blocks = []
+    views = []
+    for name, shape, dtype in arrays:
+        shm = shared_memory.SharedMemory(name=name)   # Unlinked by Decomposed.close
+        blocks.append(shm)
+        views.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    r, v, radius, mass, tag = views
+    own = Particles.fromArrays(r[a:b], v[a:b], radius[a:b], mass[a:b], tag[a:b])
+    while True:
+        cmd, arg = conn.recv()
+        if cmd == 'stop':
+            break
+        if cmd == 'move':
+            own.move(arg)
+            if box is not None:
+                boxBoundaries(own, *box)
+            else:
+                circleBoundaries(own, bcR, arg)
+            conn.send(None)
+        elif cmd == 'collide':
+            lo, hi = edges[arg], edges[arg+1]
+            x = r[:,0]
+            idx = np.nonzero((x >= lo - halo) & (x < hi + halo))[0]
+            I, J = cellPairs(r[idx], radius[idx])
+            I, J = idx[I], idx[J]
+            mid = 0.5*(x[I] + x[J])
+            keep = (mid >= lo) & (mid < hi)
+            hitI, _ = resolvePairs(r, v, radius, mass, I[keep], J[keep])
+            conn.send(hitI.size)
+    del r, v, radius, mass, tag, own, views
+    for shm in blocks:
+        shm.close()
+### END: FUNCTIONS
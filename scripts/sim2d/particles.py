@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Program: particles
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+from . import kernels
+
+
+### CLASSES
+class Particles:
+    """
+    Particles: Structure-of-Arrays Particle Store
+
+        * Every particle property lives in one contiguous NumPy array
+          (one row per particle) so that moves, boundaries and collisions
+          work on all particles at once.
+        * Tags are small integers a scenario may use to label particles,
+          e.g. human/zombie in the pentagon simulation.
+        * Mass defaults to radius**2 (constant density, density = 1/Pi).
+    """
+
+    def __init__(self,x,y,vx=0.0,vy=0.0,radius=0.1,mass=None,tag=0):
+        """
+        Particles Constructor
+
+        Parameters
+        ----------
+        x : DOUBLE or ARRAY
+            X-coordinates of circle centers [m].
+        y : DOUBLE or ARRAY
+            Y-coordinates of circle centers [m].
+        vx : DOUBLE or ARRAY, optional
+            X-components of circle velocities [m/s]. The default is 0.
+        vy : DOUBLE or ARRAY, optional
+            Y-components of circle velocities [m/s]. The default is 0.
+        radius : DOUBLE or ARRAY, optional
+            Radii of circles [m]. The default is 0.1.
+        mass : DOUBLE or ARRAY, optional
+            Masses of circles. The default is radius**2.
+        tag : INT or ARRAY, optional
+            Scenario specific label of each circle. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        n = x.size
+        self.r      = np.empty((n,2))                    # Position Vectors
+        self.v      = np.empty((n,2))                    # Velocity Vectors
+        self.r[:,0] = x
+        self.r[:,1] = y
+        self.v[:,0] = vx
+        self.v[:,1] = vy
+        self.radius = np.empty(n)
+        self.radius[:] = radius
+        self.mass   = np.empty(n)
+        if mass is None:
+            self.mass[:] = self.radius**2
+        else:
+            self.mass[:] = mass
+        self.tag    = np.empty(n, dtype=np.int8)
+        self.tag[:] = tag
+        self.t      = 0.0                                # seconds   Time
+
+    @classmethod
+    def fromArrays(cls,r,v,radius,mass,tag,t=0.0):
+        """
+        Particle store built on existing arrays (no copies), e.g. views of
+        shared memory or a slice of another store.
+        """
+        pars = cls.__new__(cls)
+        pars.r      = r
+        pars.v      = v
+        pars.radius = radius
+        pars.mass   = mass
+        pars.tag    = tag
+        pars.t      = t
+        return pars
+
+    def __len__(self):
+        return self.radius.size
+
+    @property
+    def x(self):
+        return self.r[:,0]
+    @x.setter
+    def x(self, value):
+        self.r[:,0] = value
+    @property
+    def y(self):
+        return self.r[:,1]
+    @y.setter
+    def y(self, value):
+        self.r[:,1] = value
+    @property
+    def vx(self):
+        return self.v[:,0]
+    @vx.setter
+    def vx(self, value):
+        self.v[:,0] = value
+    @property
+    def vy(self):
+        return self.v[:,1]
+    @vy.setter
+    def vy(self, value):
+        self.v[:,1] = value
+
+    def move(self,dt,a=None):
+        """
+        Move all circles one time-step.
+
+        Parameters
+        ----------
+        dt : DOUBLE
+            Time-step [s].
+        a : ARRAY, optional
+            Acceleration [m/s**2], either one 2-vector for every particle or
+            one row per particle. The default is None (free flight).
+
+        Returns
+        -------
+        None.
+
+        """
+        if kernels.useJit and np.ndim(a) < 2:
+            ax, ay = (0.0, 0.0) if a is None else a
+            kernels.integrate(self.r, self.v, float(ax), float(ay), float(dt))
+        elif a is None:
+            self.r += self.v*dt
+        else:
+            # Leapfrog (2nd Order) for constant acceleration.
+            self.r += self.v*dt + a*(dt*dt)/2.0
+            self.v += a*dt
+        self.t += dt
+
+    def timeStep(self,fac=2.0,dtMax=np.inf,a=None):
+        """
+        Time step control. Prevent circle centers from crossing in a single
+        time-step: dt = radius/(fac*v) for the fastest circle. Called every
+        time-step it follows the current velocities (CFL-style), e.g. after
+        collisions have sped circles up or slowed them down.
+
+        Parameters
+        ----------
+        fac : DOUBLE, optional
+            Fraction of the radius a circle may move per step is 1/fac.
+            The default is 2.
+        dtMax : DOUBLE, optional
+            Upper limit on the returned time-step [s]. The default is inf.
+        a : ARRAY, optional
+            Constant acceleration [m/s**2] (see move). The distance moved,
+            v*dt + |a|*dt**2/2, is then kept below radius/fac. The default
+            is None.
+
+        Returns
+        -------
+        DOUBLE
+            Time-step [s].
+
+        """
+        vH = np.hypot(self.v[:,0], self.v[:,1])
+        if a is not None:
+            aH = np.hypot(*np.reshape(a, (-1,2)).T)
+            s = self.radius/fac
+            with np.errstate(divide='ignore'):
+                dtC = 2.0*s/(vH + np.sqrt(vH*vH + 2.0*aH*s))   # Root of v*dt + aH*dt**2/2 = s
+            return min(dtMax, np.min(dtC))
+        moving = vH != 0
+        if not moving.any():
+            return dtMax
+        return min(dtMax, np.min(self.radius[moving]/(fac*vH[moving])))
+# END: Particles
+### END: CLASSES
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Program: placement
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Non-overlapping initial positions of n circles of one radius in a box, a
+bounding circle or a Polygon: square grid, hexagonal lattice or random
+Poisson-disk sampling (Bridson). Every function returns an (n, 2) array of
+circle centers and raises ValueError if n circles do not fit.
+"""
+
+### IMPORTS
+import numpy as np
+from .grid import cellPairs
+
+
+### FUNCTIONS
+def domain(box=None,bcR=None,poly=None):
+    """
+    Bounds, area and inside test of a domain.
+
+    Parameters
+    ----------
+    box : TUPLE, optional
+        (bL, bR, bD, bU) walls of the box [m].
+    bcR : DOUBLE, optional
+        Radius of bounding circle centered on the origin [m].
+    poly : Polygon, optional
+        Polygon walls. Give exactly one of box, bcR and poly.
+
+    Returns
+    -------
+    bounds : TUPLE
+        (xMin, xMax, yMin, yMax) [m].
+    area : DOUBLE
+        Area [m**2].
+    inside : FUNCTION
+        inside(r, radius): True for every circle entirely in the domain.
+
+    """
+    if sum(d is not None for d in (box, bcR, poly)) != 1:
+        raise ValueError('Give one of box, bcR or poly.')
+    if box is not None:
+        bL, bR, bD, bU = box
+        def inside(r,radius):
+            return ((r[:,0] >= bL + radius) & (r[:,0] <= bR - radius) &
+                    (r[:,1] >= bD + radius) & (r[:,1] <= bU - radius))
+        return (bL, bR, bD, bU), (bR - bL)*(bU - bD), inside
+    if bcR is not None:
+        def inside(r,radius):
+            return np.hypot(r[:,0], r[:,1]) <= bcR - radius
+        return (-bcR, bcR, -bcR, bcR), np.pi*bcR**2, inside
+    return poly.bounds(), poly.area, poly.inside
+
+def _pick(pts,n,rng):
+    """
+    n of the points: at random with rng, else evenly spread over the list.
+    """
+    if len(pts) < n:
+        raise ValueError('Only %i of %i circles fit.' % (len(pts), n))
+    if rng is not None:
+        idx = np.sort(rng.choice(len(pts), n, replace=False))
+    else:
+        idx = np.round(np.linspace(0, len(pts)-1, n)).astype(int)
+    return pts[idx]
+
+def _lattice(n,radius,dom,rng,cells):
+    """
+    Largest lattice spacing (bisection) holding at least n circles.
+    cells(s, bounds) returns the lattice points of spacing s.
+    """
+    bounds, area, inside = dom
+    def points(s):
+        p = cells(s, bounds)
+        return p[inside(p, radius)]
+    lo = 2.0*radius                          # Touching circles
+    best = points(lo)
+    if len(best) < n:
+        raise ValueError('Only %i of %i circles fit.' % (len(best), n))
+    hi = max(lo, 2.0*np.sqrt(area/n))
+    if len(points(hi)) >= n:
+        return _pick(points(hi), n, rng)
+    for _ in np.arange(40):
+        mid = 0.5*(lo + hi)
+        p = points(mid)
+        if len(p) >= n:
+            lo, best = mid, p
+        else:
+            hi = mid
+    return _pick(best, n, rng)
+
+def _square(s,bounds):
+    xMin, xMax, yMin, yMax = bounds
+    nx = int((xMax - xMin)/s) + 1
+    ny = int((yMax - yMin)/s) + 1
+    x = xMin + 0.5*(xMax - xMin - (nx - 1)*s) + s*np.arange(nx)   # Centered
+    y = yMin + 0.5*(yMax - yMin - (ny - 1)*s) + s*np.arange(ny)
+    X, Y = np.meshgrid(x, y)
+    return np.column_stack((X.ravel(), Y.ravel()))
+
+def _hex(s,bounds):
+    xMin, xMax, yMin, yMax = bounds
+    h = s*np.sqrt(3.0)/2.0                   # Row spacing
+    nx = int((xMax - xMin)/s) + 1
+    ny = int((yMax - yMin)/h) + 1
+    x = xMin + 0.5*(xMax - xMin - (nx - 1)*s) + s*np.arange(nx)
+    y = yMin + 0.5*(yMax - yMin - (ny - 1)*h) + h*np.arange(ny)
+    X, Y = np.meshgrid(x, y)
+    X[1::2] += 0.5*s                         # Shift every other row.
+    return np.column_stack((X.ravel(), Y.ravel()))
+
+def grid(n,radius,box=None,bcR=None,poly=None,rng=None):
+    """
+    n circles on a square grid, as widely spaced as the domain allows.
+
+    Parameters
+    ----------
+    n : INT
+        Number of circles.
+    radius : DOUBLE
+        Radius of circles [m].
+    box, bcR, poly :
+        Domain, see domain.
+    rng : numpy Generator, optional
+        Pick the n grid points at random. The default is None, i.e. evenly
+        spread over the grid points that fit.
+
+    Returns
+    -------
+    ARRAY
+        Circle centers [m], one row per circle.
+
+    """
+    return _lattice(n, radius, domain(box, bcR, poly), rng, _square)
+
+def hexLattice(n,radius,box=None,bcR=None,poly=None,rng=None):
+    """
+    n circles on a hexagonal lattice (densest packing, up to 91% of the
+    area), as widely spaced as the domain allows. See grid.
+    """
+    return _lattice(n, radius, domain(box, bcR, poly), rng, _hex)
+
+def poissonDisk(n,radius,box=None,bcR=None,poly=None,rng=None,k=12):
+    """
+    n random circles, no two closer than a minimum distance (Bridson's
+    Poisson-disk sampling, all active points at once).
+
+    Step 1: The minimum distance d is the spacing n circles would have if
+            spread evenly (but at least the circle diameter).
+    Step 2: Fill the domain: every active point throws k candidates into
+            the ring d..2d around itself. A candidate is accepted if it is
+            in the domain and no accepted point lies within d; the check
+            uses a background grid of cell side d/sqrt(2) holding at most
+            one point per cell. Candidates of the same round that are too
+            close to each other keep the first one. Points whose k
+            candidates all fail become inactive.
+    Step 3: Pick n of the points at random. If fewer fit, shrink d
+            (never below the diameter) and fill again.
+
+    Parameters
+    ----------
+    n : INT
+        Number of circles.
+    radius : DOUBLE
+        Radius of circles [m].
+    box, bcR, poly :
+        Domain, see domain.
+    rng : numpy Generator, optional
+        Random numbers. The default is None, i.e. a generator seeded from
+        the global np.random state (so np.random.seed repeats a run).
+    k : INT, optional
+        Candidates per active point and round. The default is 12 (fewer
+        than Bridson's 30 as points stay active for the next round as long
+        as one of their candidates is accepted).
+
+    Returns
+    -------
+    ARRAY
+        Circle centers [m], one row per circle.
+
+    """
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(2**31))
+    dom = domain(box, bcR, poly)
+    dMin = 2.0*radius
+    d = max(dMin, 0.7*np.sqrt(dom[1]/n))     # A filled domain holds about 0.6/d**2 per m**2.
+    while True:
+        pts = _bridson(d, radius, dom, rng, k)
+        if len(pts) >= n or d == dMin:
+            return _pick(pts, n, rng)
+        d = max(dMin, 0.9*d)
+
+def _bridson(d,radius,dom,rng,k):
+    (xMin, xMax, yMin, yMax), area, inside = dom
+    cs = d/np.sqrt(2.0)
+    nx = int((xMax - xMin)/cs) + 1
+    ny = int((yMax - yMin)/cs) + 1
+    cells = -np.ones((nx + 4, ny + 4), dtype=np.int64)   # Two empty cells of padding
+    pts = np.empty((max(16, int(2.0*area/d**2)), 2))
+    count = 0
+    near = sorted([(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3)
+                   if abs(dx) + abs(dy) < 4],            # 5x5 without corners
+                  key=lambda o: abs(o[0]) + abs(o[1]))
+
+    def accept(cand):
+        # Add the acceptable candidates; returns their point and candidate numbers.
+        nonlocal pts, count
+        src = np.nonzero(inside(cand, radius))[0]
+        cand = cand[src]
+        c = np.floor((cand - (xMin, yMin))/cs).astype(np.int64) + 2
+        for dx, dy in near:                              # Own cell first: cheapest rejection.
+            j = cells[c[:,0] + dx, c[:,1] + dy]
+            ok = j < 0
+            dr = cand[~ok] - pts[j[~ok]]
+            ok[~ok] = np.hypot(dr[:,0], dr[:,1]) >= d
+            cand, c, src = cand[ok], c[ok], src[ok]
+        I, J = cellPairs(cand, np.full(len(cand), 0.5*d))
+        dr = cand[I] - cand[J]
+        close = np.hypot(dr[:,0], dr[:,1]) < d
+        ok = np.ones(len(cand), dtype=bool)
+        ok[J[close]] = False                             # Keep the first of a close pair.
+        cand, c, src = cand[ok], c[ok], src[ok]
+        if count + len(cand) > len(pts):
+            pts = np.concatenate((pts, np.empty((max(len(pts), len(cand)), 2))))
+        new = np.arange(count, count + len(cand))
+        pts[new] = cand
+        cells[c[:,0], c[:,1]] = new
+        count += len(cand)
+        return new, src
+
+    # Seeds: uniform darts (several, so separated regions are reached).
+    seeds = rng.uniform((xMin, yMin), (xMax, yMax), (64, 2))
+    active = accept(seeds)[0]
+    while active.size:
+        m = active.size
+        parent = np.repeat(active, k)
+        a = rng.uniform(0.0, 2.0*np.pi, m*k)
+        rho = d*rng.uniform(1.0, 2.0, m*k)
+        cand = pts[parent] + rho[:,None]*np.column_stack((np.cos(a), np.sin(a)))
+        new, src = accept(cand)
+        # Points stay active while they still get candidates accepted.
+        active = np.concatenate((np.unique(parent[src]), new))
+    return pts[:count]
+### END: FUNCTIONS
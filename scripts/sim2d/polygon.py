@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Program: polygon
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import numpy as np
+
+
+### CLASSES
+class Polygon:
+    """
+    Polygon: Convex Polygon Walls
+
+        * Circles live inside a convex outer polygon and, optionally,
+          outside a convex inner polygon (an annular hallway like the
+          pentagon of the zombie script).
+        * Every face is stored as a unit normal n (pointing out of the
+          polygon) and an offset c, so the signed distance of a point r to
+          the face is c - n.r (outer, positive inside) or n.r - c (inner,
+          positive outside). All particles and faces are handled with a
+          few array operations.
+    """
+    # Class Variables
+    cornerTol = 1.0e-13      # meters    Faces closer than this tie (corner hit).
+
+    def __init__(self,outer,inner=None):
+        """
+        Polygon Constructor
+
+        Parameters
+        ----------
+        outer : ARRAY
+            Vertices of the outer polygon [m], one row per vertex, in order
+            around the polygon.
+        inner : ARRAY, optional
+            Vertices of the inner polygon [m]. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.outer = self.__ccw(outer)
+        self.nO, self.cO = self.__faces(self.outer)
+        self.inner = None
+        self.nI = self.cI = None
+        if inner is not None:
+            self.inner = self.__ccw(inner)
+            self.nI, self.cI = self.__faces(self.inner)
+
+    @classmethod
+    def regular(cls,numVerts,rO,rI=None,angle=np.pi/2.0):
+        """
+        Regular polygon(s) centered on the origin.
+
+        Parameters
+        ----------
+        numVerts : INT
+            Number of vertices.
+        rO : DOUBLE
+            Circumradius of the outer polygon [m].
+        rI : DOUBLE, optional
+            Circumradius of the inner polygon [m]. The default is None.
+        angle : DOUBLE, optional
+            Angle of the first vertex [rad]. The default is Pi/2 (pointing
+            up).
+
+        Returns
+        -------
+        Polygon
+
+        """
+        a = 2.0*np.pi*np.arange(numVerts)/numVerts + angle
+        u = np.column_stack((np.cos(a), np.sin(a)))
+        return cls(rO*u, None if rI is None else rI*u)
+
+    @staticmethod
+    def __ccw(verts):
+        verts = np.array(verts, dtype=float)
+        x, y = verts[:,0], verts[:,1]
+        if np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y) < 0:
+            verts = verts[::-1].copy()       # Clockwise: reverse.
+        return verts
+
+    @staticmethod
+    def __faces(verts):
+        e = np.roll(verts, -1, axis=0) - verts            # Face k: vertex k -> k+1
+        n = np.column_stack((e[:,1], -e[:,0]))
+        n /= np.hypot(n[:,0], n[:,1])[:,None]              # Outward unit normals
+        c = np.einsum('ij,ij->i', n, verts)
+        return n, c
+
+    @staticmethod
+    def __area(verts):
+        x, y = verts[:,0], verts[:,1]
+        return 0.5*(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+    @staticmethod
+    def __length(verts):
+        e = np.roll(verts, -1, axis=0) - verts
+        return np.sum(np.hypot(e[:,0], e[:,1]))
+
+    @property
+    def area(self):
+        """
+        Area between the walls [m**2].
+        """
+        a = self.__area(self.outer)
+        if self.inner is not None:
+            a -= self.__area(self.inner)
+        return a
+
+    @property
+    def perimeter(self):
+        """
+        Length of the walls [m].
+        """
+        p = self.__length(self.outer)
+        if self.inner is not None:
+            p += self.__length(self.inner)
+        return p
+
+    def bounds(self):
+        """
+        Bounding box of the outer polygon (xMin, xMax, yMin, yMax) [m].
+        """
+        lo = self.outer.min(axis=0)
+        hi = self.outer.max(axis=0)
+        return lo[0], hi[0], lo[1], hi[1]
+
+    def distances(self,r):
+        """
+        Signed distances of points to the walls.
+
+        Parameters
+        ----------
+        r : ARRAY
+            Points [m], one row per point.
+
+        Returns
+        -------
+        dO : ARRAY
+            Distance to the nearest outer face (positive inside).
+        dI : ARRAY
+            Distance to the nearest inner face (positive outside the inner
+            polygon; inf without inner polygon).
+
+        """
+        dO = np.min(self.cO - self.__project(r, self.nO), axis=1)
+        if self.inner is None:
+            return dO, np.full(dO.shape, np.inf)
+        dI = np.max(self.__project(r, self.nI) - self.cI, axis=1)
+        return dO, dI
+
+    def inside(self,r,radius=0.0):
+        """
+        True for every circle lying entirely between the walls.
+        """
+        dO, dI = self.distances(np.atleast_2d(r))
+        return (dO >= radius) & (dI >= radius)
+
+    def boundaries(self,pars,impulses=None):
+        """
+        Particle interaction with the polygon walls:
+
+        Step 1: Signed distance of every circle to every face. The nearest
+                outer face (and, for a hallway, the farthest inner face,
+                i.e. the one whose side the circle is on) is the face the
+                circle may have crossed.
+        Step 2: Circles touching or past a wall are moved back along their
+                velocity to the wall and reflected off the face. A circle
+                exactly at a corner (two faces tie) bounces straight back.
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store.
+        impulses : ARRAY, optional
+            The impulse of every circle on the walls is added to it (one
+            entry per circle). The default is None.
+
+        Returns
+        -------
+        DOUBLE
+            Impulse on the walls [kg m/s].
+
+        """
+        r, v, radius, mass = pars.r, pars.v, pars.radius, pars.mass
+        hitI = np.zeros(len(pars), dtype=bool)
+        impulse = 0.0
+        if self.inner is not None:
+            dist = self.__project(r, self.nI) - self.cI            # (N, faces)
+            hitI, impulse = self.__reflect(r, v, radius, mass, dist, dist, self.nI, ~hitI,
+                                           impulses)
+        dist = self.cO - self.__project(r, self.nO)
+        return impulse + self.__reflect(r, v, radius, mass, dist, -dist, -self.nO, ~hitI,
+                                        impulses)[1]
+
+    @staticmethod
+    def __project(r,n):
+        # n.r for every point (rows) and face (columns).
+        return r[:,0,None]*n[:,0] + r[:,1,None]*n[:,1]
+
+    @staticmethod
+    def __reflect(r,v,radius,mass,dist,side,m,cand,impulses):
+        """
+        Reflect circles off the faces with normals m (pointing into the
+        region the circles live in). dist[i,k] is the signed distance of
+        circle i to face k (positive in the region); the circle is on the
+        side of the face with the largest side[i,k] value. The impulse of
+        every circle is added to impulses unless it is None.
+
+        Returns
+        -------
+        BOOL ARRAY
+            Circles that were reflected.
+        DOUBLE
+            Impulse on the faces.
+
+        """
+        k = np.argmax(side, axis=1)
+        d = dist[np.arange(dist.shape[0]), k] - radius
+        hit = cand & (d <= 0)
+        if not hit.any():
+            return hit, 0.0
+        idx = np.nonzero(hit)[0]
+        k, d = k[idx], d[idx]
+        side = side[idx]
+        side[np.arange(idx.size), k] = -np.inf
+        k2 = np.argmax(side, axis=1)                        # Runner-up face
+        corner = np.abs(dist[idx, k] - dist[idx, k2]) < Polygon.cornerTol
+        # Face hit: back to the wall along the velocity, then reflect.
+        f = idx[~corner]
+        mf = m[k[~corner]]
+        vm = np.einsum('ij,ij->i', v[f], mf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delt = np.where(vm != 0, d[~corner]/vm, 0.0)
+        r[f] -= delt[:,None]*v[f]
+        v[f] -= 2.0*vm[:,None]*mf
+        impulse = 2.0*np.dot(mass[f], np.abs(vm))
+        if impulses is not None:
+            impulses[f] += 2.0*mass[f]*np.abs(vm)
+        # Corner hit: push off the corner and bounce straight back.
+        c = idx[corner]
+        if c.size:
+            u = m[k[corner]] + m[k2[corner]]
+            u /= np.hypot(u[:,0], u[:,1])[:,None]
+            r[c] += radius[c,None]*u
+            impulse += 2.0*np.dot(mass[c], np.hypot(v[c,0], v[c,1]))
+            if impulses is not None:
+                impulses[c] += 2.0*mass[c]*np.hypot(v[c,0], v[c,1])
+            v[c] *= -1.0
+        return hit, impulse
+# END: Polygon
+### END: CLASSES
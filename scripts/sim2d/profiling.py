@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Program: profiling
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Per-phase timers and per-step counts of a run (see scenario.Engine.profile
+and the --profile/--trace options of runner.runArgs):
+
+    integrate      time-step control and move
+    boundary       wall reflections
+    broad phase    collision candidates (Verlet or cell list)
+    narrow phase   colliding pairs resolved
+    infection      tag changes of the colliding pairs
+    render         graphics update (animate callback; drawing the figure
+                   is matplotlib's and counted as other)
+    io             trajectory and checkpoint writing
+    observables    observable samples
+
+Counts: collisions, wall hits, infections and neighbor list builds per
+step. The engine times its phases in the one step it always takes (see
+phase); without a profiler the blocks do nothing.
+"""
+
+### IMPORTS
+import json
+import time
+
+
+### CLASSES
+class Profiler:
+    """
+    Profiler: Accumulated Phase Times and Step Counts
+
+        * with profiler.phase(name): times a block; wrap(name, fn) times
+          every call of a function.
+        * count(name, n) adds to a per-step count; tick() ends a step.
+        * table() is the summary, saveTrace(fileName) writes a Chrome
+          trace (chrome://tracing or https://ui.perfetto.dev) when the
+          events were kept (trace=True).
+    """
+
+    def __init__(self,trace=False,maxEvents=1000000):
+        """
+        Profiler Constructor
+
+        Parameters
+        ----------
+        trace : BOOL, optional
+            Keep every timed block as a trace event. The default is False.
+        maxEvents : INT, optional
+            Trace events kept at most (the first ones). The default is
+            1000000.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.trace     = trace
+        self.maxEvents = maxEvents
+        self.events    = []
+        self.times     = {}              # name -> [calls, total ns, longest ns]
+        self.counts    = {}              # name -> [total, largest per step]
+        self.current   = {}              # Counts of the step in progress
+        self.steps     = 0
+        self.t0        = time.perf_counter_ns()
+        self.__phases  = {}
+
+    def phase(self,name):
+        """
+        Context manager timing a block as phase name.
+        """
+        p = self.__phases.get(name)
+        if p is None:
+            p = self.__phases[name] = _Phase(self, name)
+        return p
+
+    def add(self,name,start,stop):
+        """
+        Add a timed block [start, stop] (perf_counter_ns) to phase name.
+        """
+        entry = self.times.get(name)
+        if entry is None:
+            entry = self.times[name] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += stop - start
+        entry[2] = max(entry[2], stop - start)
+        if self.trace and len(self.events) < self.maxEvents:
+            self.events.append(dict(name=name, ph='X', pid=1, tid=1,
+                                    ts=(start - self.t0)/1000.0,
+                                    dur=(stop - start)/1000.0))
+
+    def wrap(self,name,fn):
+        """
+        Function calling fn, timed as phase name.
+        """
+        p = self.phase(name)
+        def timed(*args, **kwargs):
+            with p:
+                return fn(*args, **kwargs)
+        return timed
+
+    def count(self,name,n=1):
+        """
+        Add n to count name of the current step.
+        """
+        self.current[name] = self.current.get(name, 0) + n
+
+    def tick(self):
+        """
+        End of a time-step: fold the step counts into the totals.
+        """
+        self.steps += 1
+        now = None
+        for name, n in self.current.items():
+            entry = self.counts.get(name)
+            if entry is None:
+                entry = self.counts[name] = [0, 0]
+            entry[0] += n
+            entry[1] = max(entry[1], n)
+            if self.trace and len(self.events) < self.maxEvents:
+                if now is None:
+                    now = (time.perf_counter_ns() - self.t0)/1000.0
+                self.events.append(dict(name=name, ph='C', pid=1, ts=now,
+                                        args={name: n}))
+        self.current.clear()
+
+    def table(self):
+        """
+        Summary: time per phase (calls, total, mean, longest, share of the
+        wall time since the profiler was made) and counts per step. The
+        longest call shows one-off costs, e.g. the compilation of the
+        kernels in the first step.
+
+        Returns
+        -------
+        STRING
+
+        """
+        wall = max(time.perf_counter_ns() - self.t0, 1)
+        lines = ['%-14s %10s %12s %12s %12s %7s' % ('phase', 'calls', 'total [s]',
+                                                    'mean [us]', 'max [us]', '%')]
+        timed = 0
+        for name, (calls, ns, most) in sorted(self.times.items(), key=lambda kv: -kv[1][1]):
+            timed += ns
+            lines.append('%-14s %10i %12.4f %12.2f %12.2f %7.1f' %
+                         (name, calls, ns*1e-9, ns/calls*1e-3, most*1e-3, 100.0*ns/wall))
+        lines.append('%-14s %10s %12.4f %12s %12s %7.1f' %
+                     ('other', '', (wall - timed)*1e-9, '', '', 100.0*(wall - timed)/wall))
+        lines.append('%-14s %10s %12.4f' % ('wall', '', wall*1e-9))
+        if self.counts:
+            lines.append('')
+            lines.append('%-14s %10s %12s %12s' % ('count', 'total', 'per step', 'max'))
+            for name, (total, most) in self.counts.items():
+                lines.append('%-14s %10i %12.3f %12i' %
+                             (name, total, total/max(self.steps, 1), most))
+        lines.append('%i time-steps' % self.steps)
+        return '\n'.join(lines)
+
+    def saveTrace(self,fileName):
+        """
+        Write the trace events as Chrome trace JSON.
+        """
+        with open(fileName, 'w') as f:
+            json.dump(dict(traceEvents=self.events, displayTimeUnit='ms'), f)
+# END: Profiler
+
+class _Phase:
+    """
+    Timer of one phase (see Profiler.phase); not reentrant.
+    """
+
+    def __init__(self,prof,name):
+        self.prof  = prof
+        self.name  = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self,*exc):
+        self.prof.add(self.name, self.start, time.perf_counter_ns())
+        return False
+# END: _Phase
+
+class _NoPhase:
+    """
+    Block timing nothing (see phase).
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        return False
+# END: _NoPhase
+### END: CLASSES
+
+
+### FUNCTIONS
+_noPhase = _NoPhase()
+
+def phase(prof,name):
+    """
+    prof.phase(name), or a block that does nothing if prof is None.
+    """
+    return _noPhase if prof is None else prof.phase(name)
+### END: FUNCTIONS
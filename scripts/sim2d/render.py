@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Program: render
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import os
+import sys
+import numpy as np
+from matplotlib.collections import EllipseCollection
+from matplotlib.colors import to_rgba_array
+
+
+### CLASSES
+class ParticleRenderer:
+    """
+    ParticleRenderer: All circles of a simulation as one matplotlib
+    EllipseCollection.
+
+        * The collection is created once. A frame only updates the circle
+          centers (and colors if they change), i.e. no patch is created or
+          removed and the axes are never cleared, so blitting works.
+    """
+
+    def __init__(self,ax,r,radius,colors,fill=False,linewidth=1):
+        """
+        Particle Renderer Constructor
+
+        Parameters
+        ----------
+        ax : matplotlib Axes
+            Axes to draw on.
+        r : ARRAY
+            Circle centers [m], one row per circle.
+        radius : DOUBLE or ARRAY
+            Circle radii [m].
+        colors : COLOR or ARRAY of COLORS
+            One color or one color per circle.
+        fill : BOOL, optional
+            Filled circles. The default is False.
+        linewidth : DOUBLE, optional
+            Width of circle outline. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        d = 2.0*np.broadcast_to(radius, (len(r),))
+        self.fill = fill
+        kw = dict(widths=d, heights=d, angles=0.0, units='xy', offsets=r,
+                  linewidths=linewidth)
+        try:
+            self.artist = EllipseCollection(offset_transform=ax.transData, **kw)
+        except TypeError:
+            # matplotlib < 3.6
+            self.artist = EllipseCollection(transOffset=ax.transData, **kw)
+        self.setColors(colors)
+        ax.add_collection(self.artist)
+
+    def setColors(self,colors):
+        """
+        Set one color or one color per circle.
+        """
+        rgba = to_rgba_array(colors)
+        self.artist.set_edgecolor(rgba)
+        self.artist.set_facecolor(rgba if self.fill else 'none')
+
+    def update(self,r,colors=None):
+        """
+        Move the circles to r (and recolor them if colors is given).
+
+        Returns
+        -------
+        LIST
+            Artists to redraw (for blitting).
+
+        """
+        self.artist.set_offsets(r)
+        if colors is not None:
+            self.setColors(colors)
+        return [self.artist]
+# END: ParticleRenderer
+### END: CLASSES
+
+
+### FUNCTIONS
+def pyplot():
+    """
+    matplotlib.pyplot, imported when a script starts animating (headless
+    runs import only NumPy). Without a display, e.g. on a cluster node, the
+    non-interactive Agg backend is used instead of failing on the configured
+    GUI backend (nothing is shown then; movies can still be saved).
+
+    Returns
+    -------
+    MODULE
+        matplotlib.pyplot
+
+    """
+    import matplotlib
+    display = (sys.platform in ('win32', 'darwin') or 'DISPLAY' in os.environ or
+               'WAYLAND_DISPLAY' in os.environ)
+    if not display and 'MPLBACKEND' not in os.environ:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+### END: FUNCTIONS
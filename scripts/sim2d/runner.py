@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Program: runner
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+"""
+
+### IMPORTS
+import os
+import time
+import argparse
+import numpy as np
+from . import checkpoint
+from .trajectory import TrajectoryWriter, TrajectoryReader, truncate
+from .observables import Observables
+from .contacts import ContactLog
+
+
+### CLASSES
+class Recorder:
+    """
+    Recorder: Snapshot consumer keeping every snapshot in memory.
+    """
+
+    def __init__(self):
+        self.snaps = []
+
+    def __call__(self,snap):
+        self.snaps.append(snap)
+
+    def save(self,fileName):
+        """
+        Write the recorded snapshots to a NumPy .npz file (one stacked
+        array per snapshot key).
+        """
+        keys = self.snaps[0].keys()
+        np.savez(fileName, **{k: np.array([s[k] for s in self.snaps]) for k in keys})
+# END: Recorder
+
+class Progress:
+    """
+    Progress: Snapshot consumer printing the step and time, at most once
+    every interval seconds of wall-clock time (and at the last step).
+    """
+
+    def __init__(self,nSteps=None,interval=1.0):
+        """
+        Progress Constructor
+
+        Parameters
+        ----------
+        nSteps : INT, optional
+            Last time-step (always printed). The default is None.
+        interval : DOUBLE, optional
+            Wall-clock time between lines [s]; 0 prints every snapshot.
+            The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.nSteps   = nSteps
+        self.interval = interval
+        self.last     = -np.inf          # Wall-clock time of the last line
+
+    def __call__(self,snap):
+        now = time.perf_counter()
+        if now - self.last < self.interval and snap['step'] != self.nSteps:
+            return
+        self.last = now
+        print('Step = %i  Time = %.4f s' % (snap['step'], snap['t']))
+# END: Progress
+### END: CLASSES
+
+
+### FUNCTIONS
+def snapshot(pars,step,copy=True,**extra):
+    """
+    State of a Particles store as a dictionary.
+
+    Parameters
+    ----------
+    pars : Particles
+        Particle store.
+    step : INT
+        Time-step number.
+    copy : BOOL, optional
+        Copy the arrays. Use False only if the snapshot is consumed before
+        the next step. The default is True.
+    **extra :
+        Scenario specific entries (e.g. humans/zombies counts).
+
+    Returns
+    -------
+    DICT
+        step, t, r, v, tag (+ extra).
+
+    """
+    f = np.copy if copy else (lambda a: a)
+    snap = dict(step=step, t=pars.t, r=f(pars.r), v=f(pars.v), tag=f(pars.tag))
+    snap.update(extra)
+    return snap
+
+def snapshots(step,pars,nSteps,stride=1,copy=True,extra=None,start=0):
+    """
+    Generator: advance the simulation without any graphics and yield a
+    snapshot of the initial state and of every stride-th step.
+
+    Parameters
+    ----------
+    step : FUNCTION
+        Advances the simulation one time-step.
+    pars : Particles
+        Particle store advanced by step.
+    nSteps : INT
+        Number of time-steps.
+    stride : INT, optional
+        Time-steps per snapshot. The default is 1.
+    copy : BOOL, optional
+        See snapshot. The default is True.
+    extra : FUNCTION, optional
+        Returns a dictionary of extra snapshot entries. The default is None.
+    start : INT, optional
+        Time-step number of the current state. A restarted run (start > 0)
+        does not yield the state it starts from again. The default is 0.
+
+    Yields
+    ------
+    DICT
+        Snapshot (see snapshot).
+
+    """
+    def snap(i):
+        return snapshot(pars, i, copy, **(extra() if extra else {}))
+    if start == 0:
+        yield snap(0)
+    for i in np.arange(start+1, nSteps+1):
+        step()
+        if i % stride == 0:
+            yield snap(i)
+
+def run(step,pars,nSteps,stride=1,consumers=(),extra=None,start=0):
+    """
+    Headless run: feed every snapshot (see snapshots) to each consumer.
+
+    Returns
+    -------
+    DICT
+        Last snapshot.
+
+    """
+    snap = None
+    for snap in snapshots(step, pars, nSteps, stride, extra=extra, start=start):
+        for consume in consumers:
+            consume(snap)
+    return snap
+
+def runArgs(program,steps,stride,procs=False,analytic=False,contacts=False):
+    """
+    Command line options shared by the scripts.
+
+    Parameters
+    ----------
+    program : STRING
+        Script name.
+    steps : INT
+        Default number of time-steps.
+    stride : INT
+        Default time-steps per snapshot (graphics update).
+    procs : BOOL, optional
+        Offer --procs (worker processes, see parallel.Decomposed). The
+        default is False.
+    analytic : BOOL, optional
+        Offer --analytic (closed-form free flight of ghosts, see
+        freeflight.FreeFlight). The default is False.
+    contacts : BOOL, optional
+        Offer --contacts and --all-contacts (transmission log, see
+        contacts.ContactLog). The default is False.
+
+    Returns
+    -------
+    argparse.Namespace
+        headless, steps, stride, out (trajectory directory, see
+        trajectory.TrajectoryWriter, or .npz file, see Recorder),
+        checkpoint, every, restart (see runHeadless), obs, obsEvery (see
+        observables.Observables), profile, trace (see profiler), quiet,
+        procs, analytic, contacts, allContacts.
+
+    """
+    parser = argparse.ArgumentParser(prog=program)
+    parser.add_argument('--headless', action='store_true',
+                        help='advance the simulation without graphics')
+    parser.add_argument('--steps', type=int, default=steps,
+                        help='number of time-steps (default %(default)s)')
+    parser.add_argument('--stride', type=int, default=stride,
+                        help='time-steps per snapshot (default %(default)s)')
+    parser.add_argument('--out', default=None,
+                        help='headless: save snapshots to this trajectory '
+                             'directory (or .npz file)')
+    parser.add_argument('--checkpoint', default=None,
+                        help='headless: write the full state to this .npz file')
+    parser.add_argument('--every', type=int, default=1000,
+                        help='time-steps between checkpoints, a multiple of '
+                             '--stride (default %(default)s)')
+    parser.add_argument('--restart', action='store_true',
+                        help='resume from --checkpoint if it exists')
+    parser.add_argument('--obs', default=None, metavar='DIR',
+                        help='headless: save observables (energy, momentum, pressure, '
+                             'velocity histograms, g(r)) to this directory')
+    parser.add_argument('--obs-every', dest='obsEvery', type=int, default=None, metavar='N',
+                        help='time-steps between observable samples (default --stride)')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the phases of every step and print a summary')
+    parser.add_argument('--trace', default=None, metavar='FILE',
+                        help='--profile and save a Chrome trace (JSON) to this file')
+    parser.add_argument('--quiet', action='store_true',
+                        help='headless: do not print the progress (once a second otherwise)')
+    if procs:
+        parser.add_argument('--procs', type=int, default=1,
+                            help='worker processes for moves and collisions '
+                                 '(default %(default)s)')
+    if analytic:
+        parser.add_argument('--analytic', type=float, default=None, metavar='DT',
+                            help='closed-form free flight with DT seconds per time-step '
+                                 '(any size, e.g. 1e4)')
+    if contacts:
+        parser.add_argument('--contacts', default=None, metavar='DIR',
+                            help='headless: log who infected whom, when and where '
+                                 'to this directory')
+        parser.add_argument('--all-contacts', dest='allContacts', action='store_true',
+                            help='also log every collision (with --contacts)')
+    args = parser.parse_args()
+    if procs and args.procs < 1:
+        parser.error('--procs must be at least 1')
+    if analytic and args.analytic is not None and args.analytic <= 0:
+        parser.error('--analytic must be positive')
+    if args.obsEvery is not None and args.obsEvery < 1:
+        parser.error('--obs-every must be at least 1')
+    if args.every % args.stride:
+        parser.error('--every must be a multiple of --stride')
+    if args.restart and not args.checkpoint:
+        parser.error('--restart needs --checkpoint')
+    if args.restart and args.out and args.out.endswith('.npz'):
+        parser.error('--restart needs a trajectory directory for --out')
+    return args
+
+def resuming(args):
+    """
+    The run resumes from a checkpoint (--restart and the checkpoint exists):
+    its output files are continued, otherwise they are started afresh.
+    """
+    return bool(args.restart and os.path.exists(args.checkpoint))
+
+def profiler(args):
+    """
+    Profiler requested on the command line (--profile or --trace, see
+    profiling.Profiler), else None.
+    """
+    if not (args.profile or args.trace):
+        return None
+    from .profiling import Profiler
+    return Profiler(trace=bool(args.trace))
+
+def report(prof,args):
+    """
+    Print the summary of a profiler (see profiler) and save its trace.
+    """
+    if prof is None:
+        return
+    print(prof.table())
+    if args.trace:
+        prof.saveTrace(args.trace)
+        print('Trace: %s' % args.trace)
+
+def runHeadless(args,step,pars,extra=None,info=None,static=None,state=None,
+                restore=None,observe=None,profile=None,contacts=None):
+    """
+    Headless run as requested on the command line (see runArgs). info (the
+    scene: title, limits, boundary, colors, see movie.renderMovie) and
+    static (per-circle data besides the radii) are kept with a trajectory.
+
+    With --checkpoint the full state is saved every --every time-steps:
+    the particle store, random number generators and state() (class
+    variables, counters, ...). With --restart a run resumes from the
+    checkpoint (restore(saved) puts back the state() part) and frames the
+    trajectory got after the checkpoint are dropped, so the trajectory and
+    final state are the same as for a run that was never stopped. Without
+    a restart --out starts a new trajectory (replacing one in the
+    directory).
+
+    observe (an observables.Observables writing to --obs, made with
+    append=resuming(args)) samples every few time-steps; its samples after
+    the checkpoint are dropped as well.
+    profile (a profiling.Profiler, see profiler) also times the writing
+    and is reported at the end. contacts (a contacts.ContactLog) is
+    written at every checkpoint and cut back to it on restart.
+    """
+    start = 0
+    if resuming(args):
+        start, saved = checkpoint.load(args.checkpoint, pars)
+        if restore is not None:
+            restore(saved)
+        if args.out and os.path.exists(os.path.join(args.out, 'meta.json')):
+            steps = np.array(TrajectoryReader(args.out)['step'])
+            truncate(args.out, int(np.searchsorted(steps, start, side='right')))
+        if observe is not None and observe.path \
+           and os.path.exists(os.path.join(observe.path, 'meta.json')):
+            steps = np.array(TrajectoryReader(observe.path)['step'])
+            truncate(observe.path, int(np.searchsorted(steps, start, side='right')))
+        if contacts is not None:
+            contacts.truncate(pars.t)
+        print('Restart from step %i (t = %.4f s)' % (start, pars.t))
+    consumers = []
+    rec = None
+    if args.out and args.out.endswith('.npz'):
+        rec = Recorder()
+    elif args.out:
+        rec = TrajectoryWriter(args.out, info=info,
+                               static=dict(static or {}, radius=pars.radius),
+                               append=resuming(args))
+    if rec is not None:
+        consumers.append(rec)
+    if args.checkpoint:
+        syncs = [w.sync for w in (rec, observe, contacts)
+                 if isinstance(w, (TrajectoryWriter, Observables, ContactLog))]
+        sync = (lambda: [f() for f in syncs]) if syncs else None
+        consumers.append(checkpoint.Checkpointer(args.checkpoint, args.every,
+                                                 pars, state, sync))
+    if profile is not None:
+        consumers = [profile.wrap('io', c) for c in consumers]
+        if observe is not None:
+            observe.sample = profile.wrap('observables', observe.sample)
+    if not args.quiet:
+        consumers.insert(0, Progress(args.steps))
+    if observe is not None:
+        step = observe.wrap(step, start)
+    run(step, pars, args.steps, args.stride, consumers, extra, start)
+    if isinstance(rec, Recorder):
+        rec.save(args.out)
+    elif rec is not None:
+        rec.close()
+    if observe is not None:
+        observe.close()
+    if contacts is not None:
+        contacts.close()
+    report(profile, args)
+### END: FUNCTIONS
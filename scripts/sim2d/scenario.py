@@ -0,0 +1,762 @@
+# -*- coding: utf-8 -*-
+"""
+Program: scenario
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Simulation engine built from pluggable components, so that a script only
+configures a scenario:
+
+    walls        BoxWalls, CircleWalls, PolygonWalls
+    interaction  Ghost (none), Hard (elastic, mass weighted), Infection
+                 (hard circles that pass on a tag), Epidemic (hard
+                 circles with susceptible, exposed, infected and
+                 recovered states)
+    force        None (free flight), Gravity
+
+e.g. hard_gravity_box is
+
+    Engine(pars, BoxWalls(0, 10, 0, 10), Hard(), Gravity(0.0, -9.81), fac=4.0)
+
+Different masses need no extra component: collisions are always mass
+weighted and the masses live in the Particles store.
+"""
+
+### IMPORTS
+import numpy as np
+from .boundaries import boxBoundaries, circleBoundaries
+from .polygon import Polygon
+from .collisions import collision
+from .grid import cellPairs
+from . import kernels
+from .neighbors import VerletList
+from .events import EventDriven
+from .freeflight import FreeFlight
+from .observables import Observables
+from .contacts import ContactLog
+from .parallel import Decomposed
+from .batch import Batch
+from .profiling import phase
+from . import runner
+
+
+### CLASSES
+## Walls
+class BoxWalls:
+    """
+    BoxWalls: Walls of a box (see boundaries.boxBoundaries).
+    """
+
+    def __init__(self,bL,bR,bD,bU,advance=False):
+        """
+        Box Walls Constructor
+
+        Parameters
+        ----------
+        bL, bR, bD, bU : DOUBLE
+            Left, right, bottom and top of the box [m].
+        advance : BOOL, optional
+            A reflected circle is moved on by the rest of the time-step
+            (ghost_box style) instead of being placed on the wall. The
+            default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.box = (bL, bR, bD, bU)
+        self.advance = advance
+
+    def __call__(self,pars,dt):
+        """
+        Reflect the circles off the walls; returns the impulse on them.
+        """
+        return boxBoundaries(pars, *self.box, dt if self.advance else None)
+
+    def area(self):
+        bL, bR, bD, bU = self.box
+        return (bR - bL)*(bU - bD)
+
+    def perimeter(self):
+        bL, bR, bD, bU = self.box
+        return 2.0*((bR - bL) + (bU - bD))
+
+    def keywords(self):
+        """
+        The walls as keyword arguments of EventDriven, Decomposed, Batch and
+        the placement functions.
+        """
+        return dict(box=self.box)
+
+    def info(self):
+        """
+        The walls as scene entries (see movie).
+        """
+        return dict(box=list(self.box))
+# END: BoxWalls
+
+class CircleWalls:
+    """
+    CircleWalls: Bounding circle centered on the origin (see
+    boundaries.circleBoundaries).
+    """
+
+    def __init__(self,bcR):
+        self.bcR = bcR
+
+    def __call__(self,pars,dt):
+        return circleBoundaries(pars, self.bcR, dt)
+
+    def area(self):
+        return np.pi*self.bcR**2
+
+    def perimeter(self):
+        return 2.0*np.pi*self.bcR
+
+    def keywords(self):
+        return dict(bcR=self.bcR)
+
+    def info(self):
+        return dict(bcR=self.bcR)
+# END: CircleWalls
+
+class PolygonWalls:
+    """
+    PolygonWalls: Convex polygon walls, optionally with an inner polygon
+    (see polygon.Polygon).
+    """
+
+    def __init__(self,poly,scene=None):
+        """
+        Polygon Walls Constructor
+
+        Parameters
+        ----------
+        poly : Polygon
+            Walls.
+        scene : DICT, optional
+            Scene entries of the walls (see movie). The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.poly = poly
+        self.scene = {} if scene is None else scene
+
+    @classmethod
+    def regular(cls,numVerts,rO,rI=None):
+        """
+        Regular polygon hallway, see Polygon.regular.
+        """
+        return cls(Polygon.regular(numVerts, rO, rI), dict(polygon=[numVerts, rO, rI]))
+
+    def __call__(self,pars,dt):
+        return self.poly.boundaries(pars)
+
+    def area(self):
+        return self.poly.area
+
+    def perimeter(self):
+        return self.poly.perimeter
+
+    def keywords(self):
+        return dict(poly=self.poly)
+
+    def info(self):
+        return dict(self.scene)
+# END: PolygonWalls
+
+## Interactions
+class Ghost:
+    """
+    Ghost: Circles pass through each other.
+    """
+    collide = False
+
+    def attach(self,pars):
+        """
+        Prepare for a particle store (called by Engine).
+        """
+        pass
+
+    def __call__(self,pars,prof=None):
+        """
+        Interact after a move. Returns the colliding pairs (I, J). prof
+        (a profiling.Profiler) times the phases and counts the events.
+        """
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    def react(self,tag,I,J,t=0.0):
+        """
+        Scenario rule applied to the colliding pairs (tags change in place);
+        t is the time, or one per circle for batched replicas.
+        """
+        pass
+
+    def state(self):
+        """
+        Checkpoint data of the interaction (see Engine.state).
+        """
+        return {}
+
+    def restore(self,s):
+        """
+        Resume from checkpoint data (see state).
+        """
+        pass
+
+    def counts(self,tag):
+        """
+        Snapshot entries computed from the tags (a scalar per entry, or one
+        per replica for (replicas, circles) tags); None if there are none.
+        """
+        return None
+# END: Ghost
+
+class Hard(Ghost):
+    """
+    Hard: Elastic, mass weighted collisions (see collisions.collision) with
+    candidate pairs from a Verlet list (see neighbors.VerletList).
+    """
+    collide = True
+    log = None                           # contacts.ContactLog (see record)
+    transmissions = (np.empty(0, dtype=int), np.empty(0, dtype=int))   # (src, dst) of the last step
+
+    def __init__(self,skin=2.0):
+        """
+        Hard Interaction Constructor
+
+        Parameters
+        ----------
+        skin : DOUBLE, optional
+            Verlet list skin in largest diameters; 0 builds a fresh cell
+            list every step. The default is 2.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.skin = skin
+        self.neighbors = None
+
+    def attach(self,pars):
+        self.neighbors = None
+        if self.skin > 0:
+            self.neighbors = VerletList(self.skin*2.0*pars.radius.max())
+
+    def candidates(self,pars):
+        """
+        Broad phase: candidate pairs (see collisions.collision).
+        """
+        if self.neighbors is None:
+            return cellPairs(pars.r, pars.radius)
+        return self.neighbors(pars)
+
+    def record(self,pars,I,J):
+        """
+        Log the transmissions (and contacts) of the step, if there is a
+        contact log.
+        """
+        if self.log is not None:
+            self.log(pars, I, J, *self.transmissions)
+
+    def __call__(self,pars,prof=None):
+        nl = self.neighbors
+        builds = 0 if nl is None else nl.builds
+        with phase(prof, 'broad phase'):
+            pairs = self.candidates(pars)
+        with phase(prof, 'narrow phase'):
+            I, J = collision(pars, pairs)
+        n = None
+        if type(self).react is not Ghost.react:
+            with phase(prof, 'infection'):
+                n = self.react(pars.tag, I, J, pars.t)
+        if self.log is not None:
+            with phase(prof, 'contacts'):
+                self.record(pars, I, J)
+        if prof is not None:
+            prof.count('collisions', len(I))
+            if nl is not None:
+                prof.count('neighbor builds', nl.builds - builds)
+            if n is not None:
+                prof.count('infections', n)
+        return I, J
+# END: Hard
+
+class Infection(Hard):
+    """
+    Infection: Hard circles; an infected circle colliding with a healthy
+    one infects it (pentagon zombie apocalypse). The tag holds the state.
+    """
+
+    def __init__(self,skin=2.0,infected=1,names=('healthy','infected')):
+        """
+        Infection Interaction Constructor
+
+        Parameters
+        ----------
+        skin : DOUBLE, optional
+            See Hard. The default is 2.
+        infected : INT, optional
+            Tag of infected circles; any other tag is healthy. The default
+            is 1.
+        names : TUPLE, optional
+            Snapshot entries counting healthy and infected circles. The
+            default is ('healthy', 'infected').
+
+        Returns
+        -------
+        None.
+
+        """
+        Hard.__init__(self, skin)
+        self.infected = infected
+        self.names    = names
+
+    def react(self,tag,I,J,t=0.0):
+        """
+        Infect (pairs in the order they collided, see spread).
+
+        Returns
+        -------
+        INT
+            Number of circles infected.
+
+        """
+        infected = tag == self.infected
+        src, dst = self.transmissions = spread(I, J, infected, ~infected)
+        tag[dst] = self.infected
+        return len(dst)
+
+    def counts(self,tag):
+        n = np.count_nonzero(tag == self.infected, axis=-1)
+        return {self.names[0]: tag.shape[-1] - n, self.names[1]: n}
+# END: Infection
+
+class Epidemic(Hard):
+    """
+    Epidemic: Hard circles with SIR-style states in the tag.
+
+        * SUSCEPTIBLE (0) circles are infected by colliding with an
+          INFECTED (1) circle, with probability pInfect per collision.
+        * With an incubation time they are EXPOSED (2) first and only
+          become infectious once it has passed.
+        * With a finite infectious time INFECTED circles are RECOVERED (3)
+          (immune) after it.
+        * States change in bulk from the colliding pairs (see spread); the
+          end of every stage is kept per circle as a time.
+    """
+    SUSCEPTIBLE = 0
+    INFECTED    = 1
+    EXPOSED     = 2
+    RECOVERED   = 3
+    infected    = INFECTED               # Tag of infectious circles (as for Infection)
+
+    def __init__(self,skin=2.0,pInfect=1.0,incubation=0.0,infectious=np.inf,
+                 names=('susceptible','infected','exposed','recovered')):
+        """
+        Epidemic Interaction Constructor
+
+        Parameters
+        ----------
+        skin : DOUBLE, optional
+            See Hard. The default is 2.
+        pInfect : DOUBLE, optional
+            Probability that a collision with an infected circle infects.
+            The default is 1.
+        incubation : DOUBLE, optional
+            Time exposed before being infectious [s]; 0 makes infected
+            circles infectious at once. The default is 0.
+        infectious : DOUBLE, optional
+            Time infectious before recovering [s]. The default is inf
+            (never).
+        names : TUPLE, optional
+            Snapshot entries counting the circles of each state; exposed and
+            recovered are only counted when the model has them. The
+            default is ('susceptible', 'infected', 'exposed', 'recovered').
+
+        Returns
+        -------
+        None.
+
+        """
+        Hard.__init__(self, skin)
+        self.pInfect    = pInfect
+        self.incubation = incubation
+        self.infectious = infectious
+        self.names      = names
+        self.until      = None           # s   End of the current stage of every circle
+
+    def attach(self,pars):
+        Hard.attach(self, pars)
+        self.until = None
+
+    def react(self,tag,I,J,t=0.0):
+        """
+        Advance the stages to time t, then infect along the colliding pairs.
+
+        Returns
+        -------
+        INT
+            Number of circles infected.
+
+        """
+        t = np.broadcast_to(t, tag.shape)
+        if self.until is None or self.until.shape != tag.shape:
+            self.until = np.where(tag == Epidemic.INFECTED, t + self.infectious, np.inf)
+        until = self.until
+        if self.incubation > 0:
+            due = (tag == Epidemic.EXPOSED) & (t >= until)
+            tag[due] = Epidemic.INFECTED
+            until[due] += self.infectious
+        if self.infectious < np.inf:
+            due = (tag == Epidemic.INFECTED) & (t >= until)
+            tag[due] = Epidemic.RECOVERED
+            until[due] = np.inf
+        src, dst = self.transmissions = spread(I, J, tag == Epidemic.INFECTED,
+                                               tag == Epidemic.SUSCEPTIBLE,
+                                               chain=self.incubation <= 0, p=self.pInfect)
+        if self.incubation > 0:
+            tag[dst] = Epidemic.EXPOSED
+            until[dst] = t[dst] + self.incubation
+        else:
+            tag[dst] = Epidemic.INFECTED
+            until[dst] = t[dst] + self.infectious
+        return len(dst)
+
+    def counts(self,tag):
+        c = {}
+        for state, name in enumerate(self.names):
+            if (state == Epidemic.EXPOSED and self.incubation <= 0 or
+                state == Epidemic.RECOVERED and self.infectious == np.inf):
+                continue
+            c[name] = np.count_nonzero(tag == state, axis=-1)
+        return c
+
+    def state(self):
+        return {} if self.until is None else dict(epiUntil=self.until)
+
+    def restore(self,s):
+        if 'epiUntil' in s:
+            self.until = np.array(s['epiUntil'], dtype=float)
+# END: Epidemic
+
+## Forces
+class Gravity:
+    """
+    Gravity: Constant acceleration (leapfrog, see Particles.move).
+    """
+
+    def __init__(self,ax=0.0,ay=-9.81):
+        self.a = np.array([ax, ay])        # m/s**2
+# END: Gravity
+
+## Engine
+class Engine:
+    """
+    Engine: One Simulation of Walls, Interaction and Force
+
+        * A time-step: time-step control, move (with the force), walls,
+          interaction.
+        * Hard circles in a box or circle without forces can also run
+          event-driven (exact, see events.EventDriven) or split over
+          worker processes (see parallel.Decomposed).
+        * Ghosts in a box or circle without forces can also be sampled
+          from their closed-form motion (exact at any time-step, see
+          freeflight.FreeFlight).
+        * close (or a with block) stops the worker processes of a split
+          run; runHeadless closes the engine when it is done.
+    """
+
+    def __init__(self,pars,walls,interaction=None,force=None,fac=2.0,dtMax=np.inf,
+                 adaptive=True,eventDriven=False,numProcs=1,analytic=False):
+        """
+        Engine Constructor
+
+        Parameters
+        ----------
+        pars : Particles
+            Particle store.
+        walls : BoxWalls, CircleWalls or PolygonWalls
+            Walls.
+        interaction : Ghost, Hard or Infection, optional
+            Interaction of the circles. The default is None (Ghost).
+        force : Gravity, optional
+            Force. The default is None (free flight).
+        fac : DOUBLE, optional
+            Time-step control: circles move at most radius/fac per step
+            (see Particles.timeStep). The default is 2.
+        dtMax : DOUBLE, optional
+            Largest time-step [s]. The default is inf.
+        adaptive : BOOL, optional
+            Recompute the time-step every step from the current velocities.
+            The default is True.
+        eventDriven : BOOL, optional
+            Exact event-driven collisions (no overlaps); dtMax is then the
+            time per step. The default is False.
+        numProcs : INT, optional
+            Worker processes (domain decomposition). The default is 1.
+        analytic : BOOL, optional
+            Closed-form free flight of ghosts; dtMax is then the time per
+            step and may be as large as wanted. The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.pars        = pars
+        self.walls       = walls
+        self.interaction = Ghost() if interaction is None else interaction
+        self.force       = force
+        self.a           = None if force is None else force.a
+        self.fac         = fac
+        self.dtMax       = dtMax
+        self.adaptive    = adaptive
+        self.interaction.attach(pars)
+        self.impulse = 0.0                   # kg m/s   Impulse on the walls so far
+        self.extra = None                    # Snapshot entries (see runner.snapshots)
+        if self.interaction.counts(pars.tag) is not None:
+            self.extra = lambda: self.interaction.counts(self.pars.tag)
+        plain = (type(self.interaction) is Hard and force is None and
+                 isinstance(walls, (BoxWalls, CircleWalls)) and
+                 not getattr(walls, 'advance', False))
+        if (eventDriven or numProcs > 1) and not plain:
+            raise ValueError('Event-driven and multiprocess runs need hard circles '
+                             'in a box or circle without forces.')
+        ghosts = (type(self.interaction) is Ghost and force is None and
+                  isinstance(walls, (BoxWalls, CircleWalls)))
+        if analytic and not ghosts:
+            raise ValueError('Analytic free flight needs ghosts in a box or circle '
+                             'without forces.')
+        self.edmd = None
+        self.dd = None
+        self.flight = None
+        if eventDriven:
+            self.dt = dtMax
+            self.edmd = EventDriven(pars, **walls.keywords())
+        elif analytic:
+            self.dt = dtMax
+            self.flight = FreeFlight(pars, **walls.keywords())
+        else:
+            self.dt = pars.timeStep(fac, dtMax, self.a)   # Time step control. Prevent circle centers
+                                                          # from crossing in a single time-step.
+            if numProcs > 1:
+                self.dd = Decomposed(pars, numProcs, **walls.keywords())
+        if self.edmd or self.dd or self.flight:
+            self.impulse = np.nan            # Not reported by these engines.
+        self.prof = None                     # Profiler (see profile)
+
+    @property
+    def t(self):
+        return self.pars.t
+
+    def step(self):
+        """
+        Advance one time-step: move, walls and interaction; each phase is
+        timed if there is a profiler (see profile).
+        """
+        prof = self.prof
+        if self.edmd is not None:
+            with phase(prof, 'event driven'):
+                self.edmd.step(self.dt)   # Walls and collisions are events.
+        elif self.flight is not None:
+            with phase(prof, 'free flight'):
+                self.flight.step(self.dt) # Positions at the new time.
+        elif self.dd is not None:
+            with phase(prof, 'integrate'):
+                if self.adaptive:
+                    self.dt = self.pars.timeStep(self.fac, self.dtMax, self.a)
+            with phase(prof, 'workers'):
+                self.dd.step(self.dt)     # Moves, walls and collisions in the workers.
+        else:
+            with phase(prof, 'integrate'):
+                if self.adaptive:
+                    self.dt = self.pars.timeStep(self.fac, self.dtMax, self.a)   # Collisions change the velocities.
+                self.pars.move(self.dt, self.a)
+            v = None if prof is None else self.pars.v.copy()
+            with phase(prof, 'boundary'):
+                self.impulse += self.walls(self.pars, self.dt)
+            if prof is not None:
+                prof.count('wall hits', int(np.count_nonzero((self.pars.v != v).any(axis=1))))
+            self.interaction(self.pars, prof)
+        if prof is not None:
+            prof.tick()
+
+    def close(self):
+        """
+        Stop the worker processes and free their shared memory (see
+        parallel.Decomposed.close); the engine then steps in this process.
+        """
+        if self.dd is not None:
+            self.dd.close()
+            self.dd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def profile(self,prof):
+        """
+        Time the phases of every step and count collisions, wall hits,
+        infections and neighbor list builds (see profiling.Profiler; None
+        switches it off).
+        """
+        self.prof = prof
+
+    def state(self):
+        """
+        Checkpoint data besides the particle store (see sim2d.checkpoint).
+        """
+        s = dict(dt=self.dt, impulse=self.impulse)
+        if self.edmd is not None:
+            s.update(self.edmd.state())
+        if self.flight is not None:
+            s.update(self.flight.state())
+        s.update(self.interaction.state())
+        return s
+
+    def restore(self,s):
+        """
+        Resume from checkpoint data (see state).
+        """
+        self.dt = float(s['dt'])
+        self.impulse = float(s.get('impulse', self.impulse))
+        if self.edmd is not None:
+            self.edmd.restore(s)
+        if self.flight is not None:
+            self.flight.restore(s)
+        self.interaction.restore(s)
+
+    def runHeadless(self,args,info=None,static=None):
+        """
+        Headless run as requested on the command line (see
+        runner.runHeadless); the walls are added to the scene info. With
+        --obs the observables are sampled as well (see
+        observables.Observables), the pressure from the wall impulse; with
+        --contacts the transmissions are logged (see contacts.ContactLog).
+        """
+        state, restore, obs, log = self.state, self.restore, None, None
+        append = runner.resuming(args)
+        if getattr(args, 'contacts', None):
+            inter = self.interaction
+            seeds = np.flatnonzero(self.pars.tag == inter.infected)
+            log = inter.log = ContactLog(args.contacts, self.pars, seeds, args.allContacts,
+                                         append=append)
+        if args.obs:
+            obs = Observables(self.pars, args.obs, args.obsEvery or args.stride,
+                              self.walls.area(), self.walls.perimeter(),
+                              lambda: self.impulse, append=append)
+            state   = lambda: dict(self.state(), **obs.state())
+            restore = lambda s: (self.restore(s), obs.restore(s))
+        prof = runner.profiler(args)
+        self.profile(prof)
+        with self:
+            runner.runHeadless(args, self.step, self.pars, self.extra,
+                               dict(self.walls.info(), **(info or {})), static,
+                               state=state, restore=restore, observe=obs, profile=prof,
+                               contacts=log)
+# END: Engine
+### END: CLASSES
+
+
+### FUNCTIONS
+def batched(stores,walls,interaction=None,fac=2.0,dtMax=np.inf):
+    """
+    Replicas of an Engine scenario (without force) stepped together, see
+    batch.Batch and ensemble.runBatch.
+
+    Parameters
+    ----------
+    stores : LIST
+        Initial Particles stores of the replicas.
+    walls, interaction, fac, dtMax :
+        See Engine (box walls place reflected circles on the wall).
+
+    Returns
+    -------
+    step : FUNCTION
+        Advances all replicas one time-step.
+    b : Batch
+        The replicas.
+    extra : FUNCTION
+        Per-replica snapshot entries (see Ghost.counts), or None.
+
+    """
+    if getattr(walls, 'advance', False):
+        raise ValueError('Batch box walls place reflected circles on the wall.')
+    interaction = Ghost() if interaction is None else interaction
+    b = Batch(stores, **walls.keywords())
+    def step():
+        I, J = b.step(b.timeStep(fac, dtMax), collide=interaction.collide)
+        interaction.react(b.pars.tag, I, J, b.t[b.rep])
+    extra = None
+    if interaction.counts(b.tag) is not None:
+        extra = lambda: interaction.counts(b.tag)
+    return step, b, extra
+
+def spread(I,J,source,target,chain=True,p=1.0):
+    """
+    Transmissions along colliding pairs, all at once.
+
+    The result is that of handling the pairs one after the other: pair k
+    infects its target circle if the other circle was a source before
+    pair k. With chain a newly infected circle is a source for the later
+    pairs (found by relaxing the earliest infecting pair of every circle,
+    a few array passes, or the compiled loop, see kernels.spreadPairs);
+    otherwise only the initial sources infect.
+
+    Parameters
+    ----------
+    I, J : INT ARRAYS
+        Colliding pairs in the order they collided.
+    source, target : BOOL ARRAYS
+        Circles that infect and circles that can be infected.
+    chain : BOOL, optional
+        Newly infected circles infect. The default is True.
+    p : DOUBLE, optional
+        Probability that a pair transmits (one draw of np.random per pair
+        when below 1). The default is 1.
+
+    Returns
+    -------
+    src, dst : INT ARRAYS
+        Infecting and infected circle of every transmission, in pair order.
+
+    """
+    I = np.asarray(I, dtype=np.int64)
+    J = np.asarray(J, dtype=np.int64)
+    K = len(I)
+    if K == 0:
+        return I, J
+    draw = np.random.random_sample(K) < p if p < 1.0 else np.ones(K, dtype=bool)
+    if kernels.useJit:
+        return kernels.spreadPairs(I, J, source, target, chain, draw)
+    a = np.concatenate((I, J))               # Both directions of every pair
+    b = np.concatenate((J, I))
+    k = np.concatenate((np.arange(K), np.arange(K)))
+    keep = target[b] & (source[a] | (chain & target[a])) & draw[k]
+    a, b, k = a[keep], b[keep], k[keep]
+    first = np.where(source, -1, K)          # Earliest pair infecting each circle
+    while True:
+        ok = first[a] < k
+        new = np.full(len(first), K)
+        np.minimum.at(new, b[ok], k[ok])
+        new = np.minimum(first, new)
+        if not chain or np.array_equal(new, first):
+            first = new
+            break
+        first = new
+    dst = np.flatnonzero(target & (first < K))
+    dst = dst[np.argsort(first[dst], kind='stable')]
+    kd = first[dst]
+    src = np.where(I[kd] == dst, J[kd], I[kd])
+    return src, dst
+### END: FUNCTIONS
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Program: trajectory
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Trajectory files: a directory holding one raw binary file per snapshot
+field (frames appended one after the other) and a small JSON header
+(meta.json) with the dtype and per-frame shape of every field and the
+number of frames written so far.
+
+    traj/
+        meta.json
+        t.bin       (frames,)
+        r.bin       (frames, N, 2)
+        v.bin       (frames, N, 2)
+        tag.bin     (frames, N)
+        ...
+        radius.npy  (N,)    static: written once, not per frame
+"""
+
+### IMPORTS
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+### CLASSES
+class TrajectoryWriter:
+    """
+    TrajectoryWriter: Streaming snapshot consumer.
+
+        * Frames are copied into a preallocated chunk buffer and appended
+          to the field files one chunk at a time, so memory use is bounded
+          by the chunk size.
+        * With threaded=True a full chunk is written by a background thread
+          while the simulation fills the other of two buffers.
+        * A new writer replaces a trajectory already in the directory;
+          with append=True (a restarted run) it appends to it.
+    """
+
+    def __init__(self,path,stride=1,chunk=256,threaded=True,static=None,info=None,
+                 append=False):
+        """
+        Trajectory Writer Constructor
+
+        Parameters
+        ----------
+        path : STRING
+            Trajectory directory (created if needed).
+        stride : INT, optional
+            Write every stride-th snapshot received. The default is 1.
+        chunk : INT, optional
+            Frames per write. The default is 256.
+        threaded : BOOL, optional
+            Write chunks in a background thread. The default is True.
+        static : DICT of ARRAYS, optional
+            Data that does not change between frames (e.g. radius), saved
+            once as .npy files. The default is None.
+        info : DICT, optional
+            JSON-serializable scenario description (e.g. boundary) kept in
+            meta.json. The default is None.
+        append : BOOL, optional
+            Append to the trajectory in path instead of replacing it. The
+            default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path   = path
+        self.stride = stride
+        self.chunk  = chunk
+        self.seen   = 0                      # Snapshots received
+        self.fields = None                   # name -> (dtype, frame shape)
+        self.frames = 0                      # Frames on disk (or being written)
+        self.bufs   = None                   # Two chunk buffers
+        self.fill   = 0                      # Frames in the current buffer
+        self.pool   = ThreadPoolExecutor(max_workers=1) if threaded else None
+        self.pending = None
+        self.static = sorted(static) if static else []
+        self.info   = info or {}
+        os.makedirs(path, exist_ok=True)
+        meta = os.path.join(path, 'meta.json')
+        if not append:
+            clear(path)
+        elif os.path.exists(meta):
+            with open(meta) as f:
+                old = json.load(f)
+            self.fields = {k: (np.dtype(d), tuple(s)) for k, (d, s) in old['fields'].items()}
+            self.frames = old['frames']
+            self.static = sorted(set(self.static) | set(old.get('static', [])))
+            self.info   = dict(old.get('info', {}), **self.info)
+            self.__allocate()
+        for k, a in (static or {}).items():
+            np.save(os.path.join(path, k + '.npy'), np.asarray(a))
+
+    def __call__(self,snap):
+        """
+        Consume one snapshot (see runner.snapshot).
+        """
+        self.seen += 1
+        if (self.seen - 1) % self.stride:
+            return
+        if self.fields is None:
+            self.fields = {}
+            for k, val in snap.items():
+                a = np.asarray(val)
+                self.fields[k] = (a.dtype, a.shape)
+            self.__allocate()
+        elif set(snap) != set(self.fields):
+            raise ValueError('Snapshot fields do not match the trajectory.')
+        buf = self.bufs[0]
+        for k, a in buf.items():
+            a[self.fill] = snap[k]
+        self.fill += 1
+        if self.fill == self.chunk:
+            self.flush()
+
+    def flush(self):
+        """
+        Append the buffered frames to the field files.
+        """
+        if self.fill == 0:
+            return
+        self.__wait()
+        buf, n = self.bufs[0], self.fill
+        self.frames += n
+        if self.pool is None:
+            self.__write(buf, n, self.frames)
+        else:
+            self.pending = self.pool.submit(self.__write, buf, n, self.frames)
+            self.bufs.reverse()              # Fill the other buffer meanwhile.
+        self.fill = 0
+
+    def sync(self):
+        """
+        Flush and wait until every frame received is on disk.
+        """
+        self.flush()
+        self.__wait()
+
+    def close(self):
+        """
+        Flush and wait for all writes.
+        """
+        self.sync()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+    def __allocate(self):
+        self.bufs = [{k: np.empty((self.chunk,) + s, dtype=d)
+                      for k, (d, s) in self.fields.items()} for _ in range(2)]
+
+    def __wait(self):
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def __write(self,buf,n,frames):
+        # Frames go right after the frames recorded in meta.json: bytes a
+        # stopped run wrote beyond them are overwritten and cut off.
+        for k, a in buf.items():
+            name = os.path.join(self.path, k + '.bin')
+            with open(name, 'r+b' if os.path.exists(name) else 'wb') as f:
+                f.seek((frames - n)*a[0].nbytes)
+                f.write(a[:n].tobytes())
+                f.truncate()
+        info = dict(frames=frames,
+                    fields={k: (d.str, s) for k, (d, s) in self.fields.items()},
+                    static=self.static, info=self.info)
+        tmp = os.path.join(self.path, 'meta.json.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(info, f)
+        os.replace(tmp, os.path.join(self.path, 'meta.json'))
+# END: TrajectoryWriter
+
+class TrajectoryReader:
+    """
+    TrajectoryReader: Memory-mapped access to a trajectory directory.
+
+        * reader['r'] is a read-only (frames, N, 2) memmap, reader['t'] a
+          (frames,) memmap, etc. Nothing is read until it is indexed.
+        * reader.static['radius'] etc. hold the static data and reader.info
+          the scenario description.
+    """
+
+    def __init__(self,path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            info = json.load(f)
+        self.frames = info['frames']
+        self.fields = {k: (np.dtype(d), tuple(s)) for k, (d, s) in info['fields'].items()}
+        self.static = {k: np.load(os.path.join(path, k + '.npy'))
+                       for k in info.get('static', [])}
+        self.info   = info.get('info', {})
+        self.__maps = {}
+
+    def __len__(self):
+        return self.frames
+
+    def __getitem__(self,name):
+        if name not in self.__maps:
+            d, s = self.fields[name]
+            if self.frames == 0:
+                return np.empty((0,) + s, dtype=d)
+            self.__maps[name] = np.memmap(os.path.join(self.path, name + '.bin'),
+                                          dtype=d, mode='r',
+                                          shape=(self.frames,) + s)
+        return self.__maps[name]
+
+    def frame(self,k):
+        """
+        Snapshot dictionary of frame k.
+        """
+        return {name: self[name][k] for name in self.fields}
+# END: TrajectoryReader
+### END: CLASSES
+
+
+### FUNCTIONS
+def clear(path):
+    """
+    Delete the trajectory in a directory (meta.json, field and static
+    files); other files are left alone.
+    """
+    meta = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta):
+        return
+    with open(meta) as f:
+        info = json.load(f)
+    names = ([k + '.bin' for k in info['fields']] +
+             [k + '.npy' for k in info.get('static', [])])
+    for name in names + ['meta.json']:
+        name = os.path.join(path, name)
+        if os.path.exists(name):
+            os.remove(name)
+
+def truncate(path,frames):
+    """
+    Drop every frame after the first frames of a trajectory (e.g. frames
+    written after the checkpoint a run is restarted from). The field files
+    are cut to exactly that many frames, which also removes the bytes of
+    a write that was interrupted before meta.json was updated.
+    """
+    meta = os.path.join(path, 'meta.json')
+    with open(meta) as f:
+        info = json.load(f)
+    frames = min(frames, info['frames'])
+    for k, (d, s) in info['fields'].items():
+        size = frames*np.dtype(d).itemsize*int(np.prod(s))
+        with open(os.path.join(path, k + '.bin'), 'ab') as f:
+            f.truncate(size)
+    info['frames'] = frames
+    tmp = meta + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(info, f)
+    os.replace(tmp, meta)
+### END: FUNCTIONS
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Program: conftest
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Run the tests from the scripts directory: python -m pytest -q
+"""
+
+### IMPORTS
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim2d import Particles
+
+
+### FIXTURES
+@pytest.fixture
+def gas():
+    """
+    Particles store maker: n circles of mixed sizes and masses in the box
+    (0, 10, 0, 10), overlapping at the given packing (area fraction), with
+    seeded random positions and velocities.
+    """
+    def make(n=400,packing=0.3,seed=1):
+        rng = np.random.default_rng(seed)
+        radius = np.sqrt(packing*100.0/(np.pi*n))*rng.uniform(0.7, 1.3, n)
+        x = rng.uniform(radius, 10.0 - radius)
+        y = rng.uniform(radius, 10.0 - radius)
+        v = rng.normal(0.0, 1.0, (n, 2))
+        return Particles(x, y, v[:,0], v[:,1], radius, mass=radius**2)
+    return make
+### END: FIXTURES
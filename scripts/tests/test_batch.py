@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_batch
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Replicas stepped together (see sim2d.batch.Batch) against the same
+replicas run one by one.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles, boxBoundaries, circleBoundaries, collision, kernels
+from sim2d.batch import Batch
+from sim2d.polygon import Polygon
+
+
+### FUNCTIONS
+def replica(seed,kind,wall,n=40):
+    rng = np.random.default_rng(seed)
+    if kind == 'circle':
+        rho = np.sqrt(rng.uniform(0.0, 1.0, n))*(wall - 0.2)
+        a = rng.uniform(0.0, 2.0*np.pi, n)
+        x, y = rho*np.cos(a), rho*np.sin(a)
+    elif kind == 'box':
+        bL, bR, bD, bU = wall
+        x, y = rng.uniform(bL + 0.2, bR - 0.2, n), rng.uniform(bD + 0.2, bU - 0.2, n)
+    else:
+        x, y = rng.uniform(-1.5, 1.5, n), rng.uniform(-1.5, 1.5, n)
+    v = rng.normal(0.0, 2.0, (n, 2))
+    return Particles(x, y, v[:,0], v[:,1], rng.uniform(0.05, 0.1, n))
+
+def alone(pars,kind,wall,steps):
+    """
+    One replica stepped by itself: move, walls, collisions. Returns the
+    store and the impulse on the walls.
+    """
+    impulse = 0.0
+    for _ in range(steps):
+        dt = pars.timeStep()
+        pars.move(dt)
+        if kind == 'box':
+            impulse += boxBoundaries(pars, *wall)
+        elif kind == 'circle':
+            impulse += circleBoundaries(pars, wall, dt)
+        else:
+            impulse += wall.boundaries(pars)
+        collision(pars)
+    return pars, impulse
+
+WALLS = {'box':    [(0.0, 6.0 + k, 0.0, 5.0 + 0.5*k) for k in range(3)],
+         'circle': [3.0 + 0.5*k for k in range(3)],
+         'poly':   [Polygon.regular(5, 3.0)]*3}
+
+@pytest.mark.parametrize('jit', [True, False])
+@pytest.mark.parametrize('kind', sorted(WALLS))
+def test_batch_equals_replicas(monkeypatch,jit,kind):
+    monkeypatch.setattr(kernels, 'useJit', jit and kernels.available)
+    walls = WALLS[kind]
+    stores = [replica(k, kind, w) for k, w in enumerate(walls)]
+    if kind == 'box':
+        b = Batch(stores, box=walls)
+    elif kind == 'circle':
+        b = Batch(stores, bcR=walls)
+    else:
+        b = Batch(stores, poly=walls[0])
+    for _ in range(200):
+        b.step(b.timeStep())
+    impulse = []
+    for k, w in enumerate(walls):
+        p, i = alone(replica(k, kind, w), kind, w, 200)
+        np.testing.assert_allclose(b.r[k], p.r, rtol=0.0, atol=1e-10)
+        np.testing.assert_allclose(b.v[k], p.v, rtol=0.0, atol=1e-10)
+        assert b.t[k] == pytest.approx(p.t)
+        impulse.append(i)
+    assert (np.array(impulse) > 0.0).all()
+    np.testing.assert_allclose(b.impulse, impulse, rtol=1e-12)
+### END: FUNCTIONS
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_collisions
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+The batched narrow phase (collisions.resolvePairs, rounds of disjoint
+pairs) against the sequential double loop it replaces.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import kernels
+from sim2d.collisions import resolvePairs
+from sim2d.grid import allPairs, cellPairs
+
+
+### FUNCTIONS
+def sequential(r,v,radius,mass,I,J):
+    """
+    Reference: the pairs overlapping at the start are handled one after
+    the other, each seeing the corrections of the earlier ones.
+    """
+    d = radius[I] + radius[J]
+    start = np.hypot(*(r[I] - r[J]).T) <= d
+    done = []
+    for i, j in zip(I[start], J[start]):
+        rij = r[i] - r[j]
+        rijN = np.hypot(*rij)
+        d = radius[i] + radius[j]
+        if rijN > d:
+            continue
+        rijU = rij/rijN
+        dr = (d - rijN)/2.0*rijU
+        r[i] += dr
+        r[j] -= dr
+        dv = 2.0*np.dot(v[i] - v[j], rijU)*rijU/(mass[i] + mass[j])
+        v[i] -= mass[j]*dv
+        v[j] += mass[i]*dv
+        done.append((i, j))
+    return done
+
+@pytest.mark.parametrize('packing', [0.2, 0.6])
+@pytest.mark.parametrize('cells', [False, True])
+def test_rounds_equal_sequential(gas,monkeypatch,packing,cells):
+    monkeypatch.setattr(kernels, 'useJit', False)
+    p, q = gas(packing=packing), gas(packing=packing)
+    I, J = cellPairs(p.r, p.radius) if cells else allPairs(len(p))
+    ref = sequential(q.r, q.v, q.radius, q.mass, I, J)
+    Ip, Jp = resolvePairs(p.r, p.v, p.radius, p.mass, I, J)
+    assert len(ref) > 0
+    assert list(zip(Ip.tolist(), Jp.tolist())) == [(int(i), int(j)) for i, j in ref]
+    np.testing.assert_allclose(p.r, q.r, rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(p.v, q.v, rtol=0.0, atol=1e-12)
+
+def test_momentum_energy(gas,monkeypatch):
+    monkeypatch.setattr(kernels, 'useJit', False)
+    p = gas(packing=0.6)
+    P0 = p.mass @ p.v
+    E0 = 0.5*np.dot(p.mass, (p.v**2).sum(axis=1))
+    resolvePairs(p.r, p.v, p.radius, p.mass, *allPairs(len(p)))
+    np.testing.assert_allclose(p.mass @ p.v, P0, atol=1e-12)
+    assert 0.5*np.dot(p.mass, (p.v**2).sum(axis=1)) == pytest.approx(E0, rel=1e-12)
+### END: FUNCTIONS
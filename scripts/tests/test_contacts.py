@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_contacts
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Contact logs (see sim2d.contacts) of restarted and repeated runs.
+"""
+
+### IMPORTS
+import argparse
+import os
+import numpy as np
+from sim2d import Particles
+from sim2d.contacts import ContactLog, load, infectionTree, FIELDS
+from sim2d.scenario import Engine, BoxWalls, Infection
+
+
+### FUNCTIONS
+def outbreak(path,steps,restart=False,checkpoint=None):
+    """
+    Headless infection run logging every contact to path/log.
+    """
+    args = argparse.Namespace(headless=True, steps=steps, stride=10, out=None,
+                              checkpoint=checkpoint, every=20, restart=restart,
+                              obs=None, obsEvery=None, profile=False, trace=None, quiet=True,
+                              contacts=str(path/'log'), allContacts=True)
+    rng = np.random.default_rng(4)
+    r = np.stack(np.meshgrid(np.arange(0.5, 10.0, 0.5), np.arange(0.5, 10.0, 0.5)),
+                 -1).reshape(-1, 2)
+    v = rng.normal(0.0, 3.0, r.shape)
+    tag = np.zeros(len(r), dtype=int)
+    tag[:3] = 1
+    pars = Particles(r[:,0], r[:,1], v[:,0], v[:,1], 0.2, tag=tag)
+    Engine(pars, BoxWalls(0.0, 10.0, 0.0, 10.0), Infection()).runHeadless(args)
+    return args.contacts
+
+def test_rerun_replaces(tmp_path,capsys):
+    a = load(outbreak(tmp_path, 30))
+    b = load(outbreak(tmp_path, 30))
+    assert (a['kind'] == 1).sum() > 3 and (a['kind'] == 0).any()
+    for k in a:
+        np.testing.assert_array_equal(a[k], b[k])
+    assert (infectionTree(b)['generation'] == 0).sum() == 3
+
+def garbage(log,n=1001):
+    # A write stopped half-way.
+    for k, d in FIELDS:
+        with open(os.path.join(log, k + '.bin'), 'ab') as f:
+            f.write(b'\xff'*n)
+
+def test_continue_after_partial_write(tmp_path):
+    path = str(tmp_path/'log')
+    pars = Particles(np.arange(4.0), 0.0)
+    def add(log,I):
+        log.append(I, I + 1, 1.0, pars.r[I], 0)
+    log = ContactLog(path, pars, seeds=[0])
+    add(log, np.arange(3))
+    log.close()
+    garbage(path)
+    log = ContactLog(path, pars, append=True)
+    add(log, np.arange(2))
+    log.close()
+    rows = load(path)
+    np.testing.assert_array_equal(rows['src'], [-1, 0, 1, 2, 0, 1])
+    np.testing.assert_array_equal(rows['dst'], [0, 1, 2, 3, 1, 2])
+    assert os.path.getsize(os.path.join(path, 'x.bin')) == 6*8
+
+def test_restart_after_partial_write(tmp_path,capsys):
+    ck = str(tmp_path/'c.npz')
+    full = load(outbreak(tmp_path/'full', 60))
+    log = outbreak(tmp_path, 40, checkpoint=ck)
+    garbage(log)
+    part = load(outbreak(tmp_path, 60, restart=True, checkpoint=ck))
+    assert 'Restart from step 40' in capsys.readouterr().out
+    for k in full:
+        np.testing.assert_array_equal(full[k], part[k])
+        assert os.path.getsize(os.path.join(log, k + '.bin')) == full[k].nbytes
+### END: FUNCTIONS
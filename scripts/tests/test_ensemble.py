@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_ensemble
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Replica statistics (see sim2d.ensemble).
+"""
+
+### IMPORTS
+import numpy as np
+from sim2d.ensemble import Ensemble, _sample
+
+
+### FUNCTIONS
+def test_sample_in_range():
+    series = dict(t=np.array([0.0, 0.4, 0.9, 1.3]), n=np.array([5.0, 4.0, 2.0, 1.0]))
+    s = _sample(series, [0.0, 0.5, 0.9, 1.2])
+    np.testing.assert_array_equal(s['t'], [0.0, 0.4, 0.9, 0.9])
+    np.testing.assert_array_equal(s['n'], [5.0, 4.0, 2.0, 2.0])
+
+def test_sample_out_of_range():
+    # Before the first snapshot and after the end of a replica: no value.
+    series = dict(t=np.array([0.1, 0.4, 0.9]), n=np.array([5.0, 4.0, 2.0]))
+    s = _sample(series, np.array([0.0, 0.5, 0.9, 1.2]))
+    np.testing.assert_array_equal(s['n'], [np.nan, 4.0, 2.0, np.nan])
+
+def test_stats_skip_missing():
+    ens = Ensemble(None, seeds=np.arange(4), frames=3)
+    rows = np.array([[1.0, 2.0, 3.0],
+                     [3.0, 4.0, np.nan],
+                     [5.0, 6.0, np.nan],
+                     [7.0, np.nan, np.nan]])
+    for k, row in enumerate(rows):
+        ens.add(k, dict(x=row))
+    s = ens.stats(q=(0.5,))['x']
+    np.testing.assert_array_equal(s['n'], [4, 3, 1])
+    np.testing.assert_allclose(s['mean'], [4.0, 4.0, 3.0])
+    np.testing.assert_allclose(s['std'][:2], [np.std(rows[:,0], ddof=1), 2.0])
+    np.testing.assert_allclose(s['q'][0], [4.0, 4.0, 3.0])
+
+def test_stats_no_value():
+    ens = Ensemble(None, seeds=np.arange(2), frames=2)
+    ens.add(0, dict(x=np.array([1.0, np.nan])))
+    s = ens.stats(q=(0.5,))['x']
+    np.testing.assert_array_equal(s['mean'], [1.0, np.nan])
+    np.testing.assert_array_equal(s['q'][0], [1.0, np.nan])
+### END: FUNCTIONS
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_epidemic
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Infection spread (scenario.spread) against the sequential pair loop, and
+the stages of the Epidemic interaction.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import kernels
+from sim2d.scenario import Epidemic, spread
+
+
+### FUNCTIONS
+def sequential(I,J,source,target,chain,keep):
+    """
+    Reference: the pairs one after the other; keep are the pairs that may
+    transmit.
+    """
+    isSource, isTarget = source.copy(), target.copy()
+    src, dst = [], []
+    for i, j, k in zip(I, J, keep):
+        if not k:
+            continue
+        if isSource[i] and isTarget[j]:
+            s, d = i, j
+        elif isSource[j] and isTarget[i]:
+            s, d = j, i
+        else:
+            continue
+        isTarget[d] = False
+        if chain:
+            isSource[d] = True
+        src.append(s)
+        dst.append(d)
+    return src, dst
+
+@pytest.mark.parametrize('jit', [True, False])
+@pytest.mark.parametrize('chain', [True, False])
+@pytest.mark.parametrize('p', [1.0, 0.4])
+def test_spread_equals_sequential(monkeypatch,jit,chain,p):
+    monkeypatch.setattr(kernels, 'useJit', jit and kernels.available)
+    rng = np.random.default_rng(3)
+    n, K = 300, 2000
+    I = rng.integers(0, n, K)
+    J = (I + rng.integers(1, n, K)) % n
+    source = rng.random(n) < 0.05
+    target = ~source & (rng.random(n) < 0.8)
+    np.random.seed(11)
+    keep = np.random.random_sample(K) < p if p < 1.0 else np.ones(K, dtype=bool)
+    np.random.seed(11)                       # The same draws in spread.
+    src, dst = spread(I, J, source, target, chain, p)
+    s, d = sequential(I, J, source, target, chain, keep)
+    assert len(d) > 10
+    np.testing.assert_array_equal(src, s)
+    np.testing.assert_array_equal(dst, d)
+
+def test_chain():
+    S, I_ = Epidemic.SUSCEPTIBLE, Epidemic.INFECTED
+    tag = np.array([I_, S, S])
+    Epidemic().react(tag, [0, 1], [1, 2])    # 1 is infected, then infects 2.
+    np.testing.assert_array_equal(tag, [I_, I_, I_])
+    tag = np.array([I_, S, S])
+    Epidemic().react(tag, [1, 0], [2, 1])    # 1 meets 2 before it is infected.
+    np.testing.assert_array_equal(tag, [I_, I_, S])
+    tag = np.array([I_, S, S])
+    Epidemic(incubation=1.0).react(tag, [0, 1], [1, 2])   # Exposed do not infect.
+    np.testing.assert_array_equal(tag, [I_, Epidemic.EXPOSED, S])
+
+def test_stages():
+    S, E, I_, R = (Epidemic.SUSCEPTIBLE, Epidemic.EXPOSED, Epidemic.INFECTED,
+                   Epidemic.RECOVERED)
+    epi = Epidemic(incubation=1.0, infectious=2.0)
+    tag = np.array([I_, S, S, S])
+    assert epi.react(tag, [0], [1], 0.0) == 1
+    np.testing.assert_array_equal(tag, [I_, E, S, S])
+    np.testing.assert_array_equal(epi.until[:2], [2.0, 1.0])
+    epi.react(tag, [1], [2], 0.5)            # Still incubating.
+    np.testing.assert_array_equal(tag, [I_, E, S, S])
+    epi.react(tag, [1], [2], 1.0)            # Infectious from now on.
+    np.testing.assert_array_equal(tag, [I_, I_, E, S])
+    np.testing.assert_array_equal(epi.until[:3], [2.0, 3.0, 2.0])
+    assert epi.react(tag, [0], [3], 2.0) == 0   # 0 has recovered.
+    np.testing.assert_array_equal(tag, [R, I_, I_, S])
+    epi.react(tag, [], [], 4.0)
+    np.testing.assert_array_equal(tag, [R, R, R, S])
+    assert epi.counts(tag) == dict(susceptible=1, infected=0, exposed=0, recovered=3)
+    # The stage ends are checkpointed.
+    again = Epidemic(incubation=1.0, infectious=2.0)
+    again.restore(epi.state())
+    np.testing.assert_array_equal(again.until, epi.until)
+
+def test_pInfect():
+    n = 4000
+    tag = np.tile([Epidemic.INFECTED, Epidemic.SUSCEPTIBLE], n)
+    I = np.arange(0, 2*n, 2)
+    np.random.seed(2)
+    infected = Epidemic(pInfect=0.3).react(tag, I, I + 1)
+    assert infected/n == pytest.approx(0.3, abs=0.03)
+### END: FUNCTIONS
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_events
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Event-driven hard disks (events.EventDriven): exact, so energy is
+conserved and no two circles ever overlap.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles
+from sim2d.events import EventDriven
+
+
+### FUNCTIONS
+def kinetic(pars):
+    return 0.5*np.dot(pars.mass, (pars.v**2).sum(axis=1))
+
+def lattice(n,radius,box=None,bcR=None):
+    """
+    First n points of a square lattice (spacing three radii) inside the
+    box or bounding circle.
+    """
+    c = np.arange(-5.0, 5.0, 3.0*radius)
+    x, y = (a.ravel() for a in np.meshgrid(c, c))
+    if box is None:
+        keep = np.hypot(x, y) + radius < bcR
+    else:
+        x, y = x + 0.5*(box[0] + box[1]), y + 0.5*(box[2] + box[3])
+        keep = ((x - radius > box[0]) & (x + radius < box[1]) &
+                (y - radius > box[2]) & (y + radius < box[3]))
+    return np.column_stack((x[keep], y[keep]))[:n]
+
+def overlap(pars):
+    """
+    Deepest overlap of two circles or of a circle and the walls [m].
+    """
+    i, j = np.triu_indices(len(pars), 1)
+    gap = np.hypot(*(pars.r[i] - pars.r[j]).T) - pars.radius[i] - pars.radius[j]
+    return max(-gap.min(), 0.0)
+
+@pytest.mark.parametrize('walls', [dict(box=(0.0, 10.0, 0.0, 10.0)), dict(bcR=5.0)])
+def test_energy_conserved(walls):
+    rng = np.random.default_rng(5)
+    n, radius = 150, 0.2
+    r = lattice(n, radius, **walls)
+    assert len(r) == n
+    v = rng.normal(0.0, 2.0, (n, 2))
+    pars = Particles(r[:,0], r[:,1], v[:,0], v[:,1], radius*rng.uniform(0.8, 1.0, n))
+    E0 = kinetic(pars)
+    ed = EventDriven(pars, **walls)
+    for _ in range(20):
+        ed.step(0.05)
+        assert overlap(pars) < 1e-9
+        assert kinetic(pars) == pytest.approx(E0, rel=1e-10)
+    assert ed.nPair > 0 and ed.nWall > 0
+    assert pars.t == pytest.approx(1.0)
+    if 'box' in walls:
+        assert (pars.r - pars.radius[:,None] >= -1e-9).all()
+        assert (pars.r + pars.radius[:,None] <= 10.0 + 1e-9).all()
+    else:
+        assert (np.hypot(*pars.r.T) + pars.radius <= 5.0 + 1e-9).all()
+### END: FUNCTIONS
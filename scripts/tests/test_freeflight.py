@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_freeflight
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Closed-form free flight of ghosts (freeflight.FreeFlight) against stepping
+the circles wall hit by wall hit.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles, kernels
+from sim2d.boundaries import boxBoundaries
+from sim2d.freeflight import FreeFlight
+
+
+### FUNCTIONS
+def ghosts(n=100,seed=1,centered=False):
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(0.05, 0.2, n)
+    if centered:
+        rho = np.sqrt(rng.uniform(0.0, 1.0, n))*(5.0 - radius)*0.99
+        a = rng.uniform(0.0, 2.0*np.pi, n)
+        x, y = rho*np.cos(a), rho*np.sin(a)
+    else:
+        x = rng.uniform(radius, 10.0 - radius)
+        y = rng.uniform(radius, 8.0 - radius)
+    v = rng.uniform(-3.0, 3.0, (n, 2))
+    return Particles(x, y, v[:,0], v[:,1], radius)
+
+def bounce(s,vs,lo,hi,T):
+    # One coordinate between free walls lo and hi, wall hit by wall hit.
+    t = 0.0
+    while True:
+        th = ((hi if vs > 0 else lo) - s)/vs
+        if t + th > T:
+            return s + vs*(T - t)
+        s = s + vs*th
+        t += th
+        vs = -vs
+
+@pytest.mark.parametrize('T', [0.3, 77.7])
+def test_box_equals_hits(T):
+    pars = ghosts()
+    x, y, radius = pars.r[:,0].copy(), pars.r[:,1].copy(), pars.radius
+    v = pars.v.copy()
+    r, _ = FreeFlight(pars, box=(0.0, 10.0, 0.0, 8.0)).at(T)
+    for i in range(len(pars)):
+        assert r[i,0] == pytest.approx(bounce(x[i], v[i,0], radius[i], 10.0 - radius[i], T), abs=1e-9)
+        assert r[i,1] == pytest.approx(bounce(y[i], v[i,1], radius[i], 8.0 - radius[i], T), abs=1e-9)
+
+@pytest.mark.parametrize('jit', [True, False])
+def test_box_stepping_converges(monkeypatch,jit):
+    # Step-by-step reflection (circles placed on the wall) approaches the
+    # closed form as the time-step shrinks.
+    monkeypatch.setattr(kernels, 'useJit', jit and kernels.available)
+    box = (0.0, 10.0, 0.0, 8.0)
+    r, v = FreeFlight(ghosts(), box=box).at(2.0)
+    err = []
+    for dt in (1e-2, 1e-3):
+        pars = ghosts()
+        for _ in range(int(round(2.0/dt))):
+            pars.move(dt)
+            boxBoundaries(pars, *box)
+        np.testing.assert_array_equal(np.sign(pars.v), np.sign(v))
+        err.append(np.abs(pars.r - r).max())
+    assert err[1] < 0.2*err[0]
+    assert err[1] < 0.05
+
+def hitByHit(p,v,R,T):
+    # One circle in a bounding circle of free radius R, wall hit by wall hit.
+    t = 0.0
+    while True:
+        pv, vv, pp = p @ v, v @ v, p @ p
+        th = (np.sqrt(max(pv*pv - vv*(pp - R*R), 0.0)) - pv)/vv
+        if t + th > T:
+            return p + v*(T - t), v
+        p = p + v*th
+        t += th
+        u = p/R
+        v = v - 2.0*(v @ u)*u
+
+@pytest.mark.parametrize('T', [0.3, 7.7, 123.4])
+def test_circle_equals_hits(T):
+    pars = ghosts(centered=True)
+    ff = FreeFlight(pars, bcR=5.0)
+    r, v = ff.at(T)
+    for i in range(len(pars)):
+        ri, vi = hitByHit(ff.r0[i], ff.v0[i], 5.0 - pars.radius[i], T)
+        np.testing.assert_allclose(r[i], ri, rtol=0.0, atol=1e-8)
+        np.testing.assert_allclose(v[i], vi, rtol=0.0, atol=1e-8)
+
+def test_long_times():
+    pars = ghosts(centered=True)
+    speed = np.hypot(*pars.v.T)
+    ff = FreeFlight(pars, bcR=5.0)
+    r, v = ff.at(1e6)
+    assert (np.hypot(*r.T) + pars.radius <= 5.0 + 1e-9).all()
+    np.testing.assert_allclose(np.hypot(*v.T), speed, rtol=1e-12)
+    # Re-anchoring on the way gives the same state.
+    f2 = FreeFlight(ghosts(centered=True), bcR=5.0)
+    f2.seek(5000.0)
+    f2.anchor()
+    np.testing.assert_allclose(f2.at(1e4)[0], ff.at(1e4)[0], rtol=0.0, atol=1e-6)
+### END: FUNCTIONS
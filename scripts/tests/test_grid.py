@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_grid
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+The cell-list broad phase (grid.cellPairs) against all pairs: it must not
+miss any overlapping pair, whatever the radii and the cell size.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d.grid import allPairs, cellPairs
+
+
+### FUNCTIONS
+def overlapping(r,radius,I,J):
+    """
+    The pairs of I, J that overlap, as a set.
+    """
+    hit = np.hypot(*(r[I] - r[J]).T) <= radius[I] + radius[J]
+    return set(zip(I[hit].tolist(), J[hit].tolist()))
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('scale', [1.0, 1.7, 4.0])
+def test_cells_find_all_overlaps(seed,scale):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 400))
+    radius = rng.uniform(0.01, 1.0, n)**3   # Sizes over two orders of magnitude.
+    r = rng.uniform(-5.0, 5.0, (n, 2))*rng.uniform(0.2, 2.0, 2)
+    cellSize = None if scale == 1.0 else scale*2.0*radius.max()
+    I, J = cellPairs(r, radius, cellSize)
+    assert (I < J).all()
+    assert len(set(zip(I.tolist(), J.tolist()))) == len(I)   # No pair twice.
+    assert overlapping(r, radius, I, J) == overlapping(r, radius, *allPairs(n))
+
+def test_cells_few_circles():
+    r = np.array([[0.0, 0.0], [0.5, 0.0]])
+    radius = np.array([0.3, 0.3])
+    assert overlapping(r, radius, *cellPairs(r, radius)) == {(0, 1)}
+    I, J = cellPairs(r[:1], radius[:1])
+    assert len(I) == len(J) == 0
+### END: FUNCTIONS
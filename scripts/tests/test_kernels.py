@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_kernels
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+The compiled kernels (see sim2d.kernels) against the NumPy code they
+replace: every step function is run with the JIT on and off on copies of
+the same store and must give the same result.
+"""
+
+### IMPORTS
+import copy
+import numpy as np
+import pytest
+from sim2d import kernels
+from sim2d.boundaries import boxBoundaries, circleBoundaries
+from sim2d.collisions import resolvePairs
+from sim2d.grid import allPairs
+from sim2d.scenario import spread
+
+pytestmark = pytest.mark.skipif(not kernels.available,
+                                reason='numba not installed (or SIM2D_NUMBA=0)')
+
+
+### FUNCTIONS
+def both(fn,pars):
+    """
+    fn(copy of pars) with the compiled kernels and with NumPy: the two
+    stores and results.
+    """
+    out = []
+    for jit in (True, False):
+        p = copy.deepcopy(pars)
+        old, kernels.useJit = kernels.useJit, jit
+        try:
+            out.append((p, fn(p)))
+        finally:
+            kernels.useJit = old
+    return out
+
+def assertSame(a,b):
+    np.testing.assert_allclose(a.r, b.r, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(a.v, b.v, rtol=1e-12, atol=1e-12)
+
+def test_integrate(gas):
+    for a in (None, np.array([0.0, -9.81])):
+        (p, _), (q, _) = both(lambda s: s.move(0.01, a), gas())
+        assertSame(p, q)
+        assert p.t == q.t
+
+@pytest.mark.parametrize('dt', [None, 0.05])
+def test_reflectBox(gas,dt):
+    pars = gas()
+    pars.move(0.5)                           # Many circles past the walls.
+    (p, ip), (q, iq) = both(lambda s: boxBoundaries(s, 0.0, 10.0, 0.0, 10.0, dt), pars)
+    assertSame(p, q)
+    assert ip > 0.0
+    assert ip == pytest.approx(iq, rel=1e-12)
+
+def test_reflectCircle(gas):
+    pars = gas()
+    pars.r -= 5.0                            # Centered on the origin.
+    pars.move(0.5)
+    (p, ip), (q, iq) = both(lambda s: circleBoundaries(s, 5.0, 0.5), pars)
+    assertSame(p, q)
+    assert ip > 0.0
+    assert ip == pytest.approx(iq, rel=1e-12)
+
+@pytest.mark.parametrize('dt', [None, 0.05])
+def test_reflectBox_rows(gas,dt):
+    # Walls, time-step and impulses per row (see batch.Batch).
+    pars = gas()
+    pars.move(0.5)
+    n = len(pars)
+    walls = (np.linspace(0.0, 1.0, n), np.linspace(10.0, 9.0, n), 0.5, 9.5)
+    step = None if dt is None else np.full(n, dt)
+    def reflect(s):
+        imp = np.zeros(n)
+        return boxBoundaries(s, *walls, step, impulses=imp), imp
+    (p, (ip, rp)), (q, (iq, rq)) = both(reflect, pars)
+    assertSame(p, q)
+    np.testing.assert_allclose(rp, rq, rtol=1e-12)
+    assert rp.sum() == pytest.approx(ip, rel=1e-12)
+    assert ip == pytest.approx(iq, rel=1e-12)
+
+def test_reflectCircle_rows(gas):
+    pars = gas()
+    pars.r -= 5.0
+    pars.move(0.5)
+    n = len(pars)
+    def reflect(s):
+        imp = np.zeros(n)
+        return circleBoundaries(s, np.linspace(4.5, 5.0, n), np.full(n, 0.5),
+                                impulses=imp), imp
+    (p, (ip, rp)), (q, (iq, rq)) = both(reflect, pars)
+    assertSame(p, q)
+    np.testing.assert_allclose(rp, rq, rtol=1e-12)
+    assert rp.sum() == pytest.approx(ip, rel=1e-12)
+
+def test_collidePairs(gas):
+    pars = gas(packing=0.6)                  # Crowded: circles in several pairs.
+    I, J = allPairs(len(pars))
+    (p, (Ip, Jp)), (q, (Iq, Jq)) = both(
+        lambda s: resolvePairs(s.r, s.v, s.radius, s.mass, I, J), pars)
+    assert len(Ip) > 0
+    np.testing.assert_array_equal(Ip, Iq)
+    np.testing.assert_array_equal(Jp, Jq)
+    assertSame(p, q)
+
+@pytest.mark.parametrize('chain', [True, False])
+def test_spreadPairs(chain):
+    rng = np.random.default_rng(3)
+    n, k = 300, 2000
+    I = rng.integers(0, n, k)
+    J = (I + rng.integers(1, n, k)) % n
+    source = rng.random(n) < 0.05
+    target = ~source & (rng.random(n) < 0.8)
+    out = []
+    for jit in (True, False):
+        old, kernels.useJit = kernels.useJit, jit
+        try:
+            out.append(spread(I, J, source, target, chain))
+        finally:
+            kernels.useJit = old
+    (sp, dp), (sq, dq) = out
+    assert len(dp) > 0
+    np.testing.assert_array_equal(sp, sq)
+    np.testing.assert_array_equal(dp, dq)
+### END: FUNCTIONS
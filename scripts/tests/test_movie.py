@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_movie
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Movie frames and encoding (see sim2d.movie).
+"""
+
+### IMPORTS
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+from PIL import ImageSequence
+from sim2d.movie import encodeGif, renderFrames
+from sim2d.trajectory import TrajectoryWriter
+
+
+### FUNCTIONS
+def frames(n):
+    for k in range(n):
+        img = np.full((40, 60, 4), 255, dtype=np.uint8)
+        img[5:15, 10*k:10*k + 10, :3] = (200, 30*k, 10)
+        yield img
+
+def test_gif_frames(tmp_path):
+    fileName = str(tmp_path/'m.gif')
+    encodeGif(frames(5), fileName, 10)
+    gif = Image.open(fileName)
+    assert gif.n_frames == 5
+    assert gif.info['loop'] == 0
+    for fr, img in zip(ImageSequence.Iterator(gif), frames(5)):
+        assert fr.info['duration'] == 100
+        np.testing.assert_array_equal(np.asarray(fr.convert('RGB')), img[...,:3])
+
+def test_gif_streams(tmp_path):
+    # Each frame is on disk before the next one is asked for.
+    fileName = str(tmp_path/'m.gif')
+    sizes = []
+    def watched():
+        for img in frames(4):
+            yield img
+            sizes.append(os.path.getsize(fileName))
+    encodeGif(watched(), fileName, 10)
+    assert 0 < sizes[0] and all(a < b for a, b in zip(sizes, sizes[1:]))
+
+def test_import_keeps_backend():
+    code = ('import matplotlib; matplotlib.use("template"); '
+            'import sim2d.movie; print(matplotlib.get_backend())')
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == 'template'
+
+def test_workers_draw_the_same(tmp_path):
+    path = str(tmp_path/'traj')
+    rng = np.random.default_rng(0)
+    with TrajectoryWriter(path, info=dict(box=[0.0, 10.0, 0.0, 10.0]),
+                          static=dict(radius=np.full(20, 0.3))) as w:
+        for k in range(4):
+            w(dict(step=k, t=0.1*k, r=rng.uniform(0.0, 10.0, (20, 2))))
+    here = list(renderFrames(path, range(4), workers=1, size=(2,2), dpi=40))
+    pool = list(renderFrames(path, range(4), workers=2, size=(2,2), dpi=40))
+    assert here[0].shape == (80, 80, 4)
+    assert not np.array_equal(here[0], here[1])
+    for a, b in zip(here, pool):
+        np.testing.assert_array_equal(a, b)
+### END: FUNCTIONS
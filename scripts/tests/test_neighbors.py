@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_neighbors
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Verlet list (neighbors.VerletList) against a fresh cell list every step,
+and the displacement rule that rebuilds it.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import kernels
+from sim2d.boundaries import boxBoundaries
+from sim2d.collisions import collision
+from sim2d.neighbors import VerletList
+
+
+### FUNCTIONS
+@pytest.mark.parametrize('jit', [True, False])
+@pytest.mark.parametrize('skin', [0.5, 1.5])
+def test_same_as_cell_list(gas,monkeypatch,jit,skin):
+    monkeypatch.setattr(kernels, 'useJit', jit and kernels.available)
+    p, q = gas(packing=0.4), gas(packing=0.4)
+    nl = VerletList(skin)
+    hits = 0
+    for _ in range(300):
+        for pars in (p, q):
+            pars.move(pars.timeStep())
+            boxBoundaries(pars, 0.0, 10.0, 0.0, 10.0)
+        hits += len(collision(p, neighbors=nl)[0])
+        collision(q)
+    assert hits > 0
+    assert 1 < nl.builds < nl.calls                # Rebuilt, but not every step.
+    np.testing.assert_array_equal(p.r, q.r)
+    np.testing.assert_array_equal(p.v, q.v)
+
+def test_rebuild_rule(gas):
+    pars = gas()
+    skin = 0.1
+    nl = VerletList(skin)
+    nl(pars)
+    assert nl.builds == 1
+    r0 = pars.r.copy()
+    pars.r[3,0] += 0.99*skin                        # One circle alone: kept.
+    nl(pars)
+    assert nl.builds == 1
+    pars.r[3,0] = r0[3,0] + 0.6*skin                # Two largest: 0.6 + 0.39 skin.
+    pars.r[7,1] = r0[7,1] - 0.39*skin
+    nl(pars)
+    assert nl.builds == 1
+    pars.r[7,1] = r0[7,1] - 0.41*skin               # Sum past the skin.
+    nl(pars)
+    assert nl.builds == 2
+    np.testing.assert_array_equal(nl.r0, pars.r)
+    nl(pars)                                        # Measured from the new build.
+    assert nl.builds == 2
+### END: FUNCTIONS
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_observables
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Observables (see sim2d.observables): conserved kinetic energy and
+momentum, the wall pressure of a single circle and g(r) of an ideal gas.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles
+from sim2d.observables import Observables, rdf
+from sim2d.scenario import Engine, BoxWalls, Hard
+from sim2d.trajectory import TrajectoryReader
+
+
+### FUNCTIONS
+def series(tmp_path,engine,walls,steps,every):
+    obs = Observables(engine.pars, str(tmp_path/'obs'), every, walls.area(),
+                      walls.perimeter(), lambda: engine.impulse)
+    step = obs.wrap(engine.step)
+    for _ in range(steps):
+        step()
+    obs.close()
+    return TrajectoryReader(str(tmp_path/'obs'))
+
+def test_energy_conserved(gas,tmp_path):
+    walls = BoxWalls(0.0, 10.0, 0.0, 10.0)
+    engine = Engine(gas(), walls, Hard())
+    s = series(tmp_path, engine, walls, 300, 10)
+    assert len(s) == 31
+    assert engine.impulse > 0.0                       # Walls were hit.
+    np.testing.assert_allclose(s['ke'], s['ke'][0], rtol=1e-12)
+
+def test_momentum_conserved(gas,tmp_path):
+    # Collisions only: the walls are too far away to be reached.
+    walls = BoxWalls(-20.0, 30.0, -20.0, 30.0)
+    engine = Engine(gas(packing=0.5), walls, Hard())
+    speed = np.hypot(*engine.pars.v.T)
+    s = series(tmp_path, engine, walls, 100, 10)
+    assert engine.impulse == 0.0
+    assert not np.allclose(np.hypot(*engine.pars.v.T), speed)   # Collided.
+    np.testing.assert_allclose(s['p'], np.broadcast_to(s['p'][0], s['p'].shape),
+                               rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(s['ke'], s['ke'][0], rtol=1e-12)
+
+def test_pressure_one_circle():
+    # One circle bouncing between the left and right walls.
+    m, vx = 2.0, 3.0
+    walls = BoxWalls(0.0, 10.0, 0.0, 8.0)
+    pars = Particles(np.array([5.0]), np.array([4.0]), np.array([vx]), np.array([0.0]),
+                     0.5, mass=np.array([m]))
+    engine = Engine(pars, walls, dtMax=0.01)
+    obs = Observables(pars, perimeter=walls.perimeter(), impulse=lambda: engine.impulse)
+    obs.sample()
+    hits = 0
+    for _ in range(2000):
+        v = pars.v[0,0]
+        engine.step()
+        hits += pars.v[0,0] != v
+    s = obs.sample()
+    assert hits == 7                              # At t = 1.5, 4.5, ..., 19.5 s.
+    assert s['pressure'] == pytest.approx(2.0*m*vx*hits/(walls.perimeter()*pars.t),
+                                          rel=1e-12)
+
+def test_rdf_ideal_gas():
+    rng = np.random.default_rng(0)
+    L, n = 100.0, 40000
+    r = rng.uniform(0.0, L, (n, 2))
+    g = rdf(r, np.linspace(0.2, 1.0, 9), L*L)
+    np.testing.assert_allclose(g, 1.0, atol=0.05)
+    assert np.mean(g) == pytest.approx(1.0, abs=0.02)
+### END: FUNCTIONS
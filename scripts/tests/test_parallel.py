@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_parallel
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Runs split over worker processes (--procs, see parallel.Decomposed)
+against the serial engine.
+"""
+
+### IMPORTS
+from multiprocessing import shared_memory
+import numpy as np
+import pytest
+from sim2d import Particles, boxBoundaries, circleBoundaries, collision
+from sim2d.parallel import Decomposed
+from sim2d.placement import poissonDisk
+from sim2d.scenario import Engine, BoxWalls, Hard
+
+
+### FUNCTIONS
+def hardGas(packing,walls,n=300,seed=1):
+    rng = np.random.default_rng(seed)
+    area = 100.0 if 'box' in walls else np.pi*walls['bcR']**2
+    radius = np.sqrt(packing*area/(np.pi*n))
+    r = poissonDisk(n, radius, rng=rng, **walls)
+    v = rng.normal(0.0, 1.0, (n, 2))
+    return Particles(r[:,0], r[:,1], v[:,0], v[:,1], radius*rng.uniform(0.8, 1.0, n))
+
+def run(pars,walls,numProcs,steps=100,dt=0.005):
+    """
+    steps time-steps in this process (numProcs None) or split over worker
+    processes.
+    """
+    if numProcs is None:
+        for _ in range(steps):
+            pars.move(dt)
+            if 'box' in walls:
+                boxBoundaries(pars, *walls['box'])
+            else:
+                circleBoundaries(pars, walls['bcR'], dt)
+            collision(pars)
+        return pars, None
+    with Decomposed(pars, numProcs, **walls) as dd:
+        for _ in range(steps):
+            dd.step(dt)
+    return pars, dd.nPair
+
+def kinetic(pars):
+    return 0.5*np.dot(pars.mass, (pars.v**2).sum(axis=1))
+
+WALLS = [dict(box=(0.0, 10.0, 0.0, 10.0)), dict(bcR=5.0)]
+
+@pytest.mark.parametrize('walls', WALLS)
+def test_dilute_equals_serial(walls):
+    # Few circles touch more than one other per step, so the pair order
+    # does not matter and the runs agree.
+    p, _ = run(hardGas(0.1, walls), walls, None)
+    q, nPair = run(hardGas(0.1, walls), walls, 2)
+    assert nPair > 0
+    assert p.t == q.t
+    np.testing.assert_allclose(q.r, p.r, rtol=0.0, atol=1e-10)
+    np.testing.assert_allclose(q.v, p.v, rtol=0.0, atol=1e-10)
+
+@pytest.mark.parametrize('walls', WALLS)
+def test_dense_reproducible(walls):
+    # The result depends on the number of workers but not on timing; the
+    # collisions and walls conserve energy.
+    E0 = kinetic(hardGas(0.4, walls))
+    p, nP = run(hardGas(0.4, walls), walls, 2)
+    q, nQ = run(hardGas(0.4, walls), walls, 2)
+    assert nP == nQ
+    np.testing.assert_array_equal(p.r, q.r)
+    np.testing.assert_array_equal(p.v, q.v)
+    assert kinetic(p) == pytest.approx(E0, rel=1e-10)
+
+def test_close_frees_workers():
+    # Stores split one after the other in a process leave no workers or
+    # shared memory behind.
+    walls = WALLS[0]
+    for _ in range(3):
+        pars = hardGas(0.2, walls)
+        with Decomposed(pars, 2, **walls) as dd:
+            procs = list(dd.procs)
+            names = [shm.name for shm in dd.blocks]
+            dd.step(0.005)
+        assert len(procs) == 2 and not any(p.is_alive() for p in procs)
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name)
+        pars.move(0.005)                      # Private arrays again.
+
+def test_engine_close():
+    pars = hardGas(0.2, WALLS[0])
+    with Engine(pars, BoxWalls(0.0, 10.0, 0.0, 10.0), Hard(), numProcs=2) as engine:
+        procs = list(engine.dd.procs)
+        engine.step()
+    assert engine.dd is None
+    assert not any(p.is_alive() for p in procs)
+    engine.step()                             # Serial from here on.
+### END: FUNCTIONS
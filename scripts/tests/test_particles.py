@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_particles
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Adaptive time-step (Particles.timeStep): no circle moves more than
+radius/fac in a step, with or without acceleration, and the bound follows
+the current velocities.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles
+
+
+### FUNCTIONS
+def moved(pars,dt,a=None):
+    """
+    Distance every circle moves in a step of dt.
+    """
+    r = pars.r.copy()
+    pars.move(dt, a)
+    return np.hypot(*(pars.r - r).T)
+
+@pytest.mark.parametrize('fac', [1.0, 2.0, 4.0])
+def test_bound(gas,fac):
+    pars = gas()
+    dt = pars.timeStep(fac)
+    step = moved(pars, dt)
+    assert (step <= pars.radius/fac*(1.0 + 1e-12)).all()
+    assert (step/(pars.radius/fac)).max() == pytest.approx(1.0, rel=1e-12)
+
+@pytest.mark.parametrize('a', [(0.0, -9.81), (3.0, 40.0)])
+def test_bound_accelerated(gas,a):
+    pars = gas()
+    pars.v[0] = 0.0                          # At rest, yet accelerated.
+    dt = pars.timeStep(2.0, a=a)
+    # Worst case (velocity along a) reaches the bound for one circle.
+    worst = np.hypot(*pars.v.T)*dt + np.hypot(*a)*dt*dt/2.0
+    assert (worst/(pars.radius/2.0)).max() == pytest.approx(1.0, rel=1e-12)
+    step = moved(pars, dt, np.array(a))
+    assert (step <= pars.radius/2.0*(1.0 + 1e-12)).all()
+
+def test_follows_velocities(gas):
+    pars = gas()
+    dt = pars.timeStep()
+    pars.v *= 4.0                            # E.g. sped up by collisions.
+    assert pars.timeStep() == pytest.approx(dt/4.0, rel=1e-12)
+    assert pars.timeStep(dtMax=dt/8.0) == dt/8.0
+
+def test_at_rest():
+    pars = Particles(np.zeros(3), np.arange(3.0), radius=0.1)
+    assert pars.timeStep() == np.inf
+    assert pars.timeStep(dtMax=0.5) == 0.5
+    assert pars.timeStep(2.0, 0.5, a=(0.0, -9.81)) == pytest.approx(np.sqrt(2.0*0.05/9.81))
+### END: FUNCTIONS
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_placement
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Initial positions (see sim2d.placement).
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d.placement import poissonDisk
+
+
+### FUNCTIONS
+@pytest.mark.parametrize('walls', [dict(box=(0.0, 10.0, 0.0, 10.0)), dict(bcR=5.0)])
+def test_poissonDisk_apart(walls):
+    r = poissonDisk(500, 0.1, rng=np.random.default_rng(1), **walls)
+    i, j = np.triu_indices(len(r), 1)
+    assert len(r) == 500
+    assert np.hypot(*(r[i] - r[j]).T).min() >= 0.2
+
+def test_poissonDisk_global_seed():
+    # Without rng the global np.random state decides (np.random.seed).
+    np.random.seed(7)
+    a = poissonDisk(200, 0.1, bcR=5.0)
+    np.random.seed(7)
+    b = poissonDisk(200, 0.1, bcR=5.0)
+    c = poissonDisk(200, 0.1, bcR=5.0)
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(b, c)
+### END: FUNCTIONS
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_polygon
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Polygon walls (polygon.Polygon): which circles are between the walls, and
+reflections off the outer and the inner faces of a hallway.
+"""
+
+### IMPORTS
+import numpy as np
+import pytest
+from sim2d import Particles
+from sim2d.polygon import Polygon
+
+
+### FUNCTIONS
+def hallway():
+    # Square hallway: outer faces at +-5, inner faces at +-2.
+    return Polygon([[-5.0, -5.0], [5.0, -5.0], [5.0, 5.0], [-5.0, 5.0]],
+                   [[-2.0, 2.0], [2.0, 2.0], [2.0, -2.0], [-2.0, -2.0]])   # Clockwise
+
+def one(x,y,vx,vy,radius=0.1,mass=2.0):
+    return Particles(np.array([x]), np.array([y]), np.array([vx]), np.array([vy]),
+                     radius, mass=np.array([mass]))
+
+def test_inside():
+    poly = hallway()
+    r = np.array([[3.5, 0.0], [0.0, -4.95], [1.0, 1.0], [6.0, 0.0], [2.05, 0.5]])
+    np.testing.assert_array_equal(poly.inside(r), [True, True, False, False, True])
+    np.testing.assert_array_equal(poly.inside(r, 0.1), [True, False, False, False, False])
+    assert poly.area == pytest.approx(100.0 - 16.0)
+    assert poly.perimeter == pytest.approx(40.0 + 16.0)
+
+def test_outer_face():
+    # Past the right outer face: back along the velocity to the wall, then
+    # the normal velocity is reversed.
+    pars = one(4.95, 3.0, 2.0, 1.0)
+    impulse = hallway().boundaries(pars)
+    np.testing.assert_allclose(pars.r[0], [4.9, 2.975], rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(pars.v[0], [-2.0, 1.0], rtol=0.0, atol=1e-12)
+    assert impulse == pytest.approx(2.0*2.0*2.0)
+
+def test_inner_face():
+    pars = one(2.05, 0.5, -2.0, 1.0)
+    impulses = np.zeros(1)
+    impulse = hallway().boundaries(pars, impulses)
+    np.testing.assert_allclose(pars.r[0], [2.1, 0.475], rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(pars.v[0], [2.0, 1.0], rtol=0.0, atol=1e-12)
+    assert impulse == pytest.approx(2.0*2.0*2.0)
+    assert impulses[0] == pytest.approx(impulse)
+
+def test_corner():
+    # Equally far past two faces: pushed off the corner, straight back.
+    pars = one(4.95, 4.95, 1.0, 1.0)
+    hallway().boundaries(pars)
+    np.testing.assert_allclose(pars.r[0], 4.95 - 0.1/np.sqrt(2.0), rtol=0.0, atol=1e-12)
+    np.testing.assert_allclose(pars.v[0], [-1.0, -1.0], rtol=0.0, atol=1e-12)
+
+def test_gas_stays_between_walls():
+    poly = Polygon.regular(5, 5.0, 2.0)
+    rng = np.random.default_rng(0)
+    n = 500
+    rho = np.sqrt(rng.uniform(2.5**2, 3.5**2, n))
+    a = rng.uniform(0.0, 2.0*np.pi, n)
+    v = rng.normal(0.0, 2.0, (n, 2))
+    pars = Particles(rho*np.cos(a), rho*np.sin(a), v[:,0], v[:,1], rng.uniform(0.02, 0.1, n))
+    speed = np.hypot(*pars.v.T)
+    impulse = 0.0
+    for _ in range(1000):
+        pars.move(pars.timeStep())
+        impulse += poly.boundaries(pars)
+        assert poly.inside(pars.r, pars.radius - 1e-12).all()
+    np.testing.assert_allclose(np.hypot(*pars.v.T), speed, rtol=1e-12)
+    assert impulse > 0.0
+### END: FUNCTIONS
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_profiling
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Phase timers and step counts (see sim2d.profiling), and profiled engine
+steps against unprofiled ones.
+"""
+
+### IMPORTS
+import json
+import numpy as np
+import pytest
+from sim2d import Particles
+from sim2d.profiling import Profiler, phase
+from sim2d.scenario import Engine, BoxWalls, CircleWalls, PolygonWalls, Hard, Epidemic
+
+
+### FUNCTIONS
+def test_phases_and_counts():
+    prof = Profiler()
+    for n in (3, 0, 5):
+        with prof.phase('a'):
+            pass
+        prof.count('hits', n)
+        prof.tick()
+    assert prof.wrap('b', lambda x: 2*x)(21) == 42
+    assert prof.steps == 3
+    assert prof.times['a'][0] == 3 and prof.times['b'][0] == 1
+    assert prof.counts['hits'] == [8, 5]
+    table = prof.table()
+    assert '3 time-steps' in table and 'hits' in table
+    with phase(None, 'a'):                   # No profiler: nothing timed.
+        pass
+    assert prof.times['a'][0] == 3
+
+def test_trace(tmp_path):
+    prof = Profiler(trace=True, maxEvents=5)
+    for _ in range(4):
+        with prof.phase('a'):
+            pass
+        prof.count('hits')
+        prof.tick()
+    fileName = str(tmp_path/'trace.json')
+    prof.saveTrace(fileName)
+    with open(fileName) as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == 5                  # The first maxEvents.
+    assert [e['ph'] for e in events] == ['X', 'C', 'X', 'C', 'X']
+    assert events[1]['args'] == {'hits': 1}
+
+def gas(n=200,seed=1,tag=False):
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(0.0, 2.0*np.pi, n)
+    rho = rng.uniform(2.3, 4.7, n)
+    v = rng.normal(0.0, 1.0, (n, 2))
+    pars = Particles(rho*np.cos(a), rho*np.sin(a), v[:,0], v[:,1], 0.1)
+    if tag:
+        pars.tag[:5] = Epidemic.INFECTED
+    return pars
+
+SCENARIOS = {'ghost':    lambda: Engine(gas(), CircleWalls(5.0)),
+             'hard':     lambda: Engine(gas(), BoxWalls(-5.0, 5.0, -5.0, 5.0), Hard()),
+             'fresh':    lambda: Engine(gas(), CircleWalls(5.0), Hard(skin=0.0)),
+             'epidemic': lambda: Engine(gas(tag=True), PolygonWalls.regular(5, 6.0, 2.0),
+                                        Epidemic(pInfect=0.5, incubation=0.2,
+                                                 infectious=1.0)),
+             'event':    lambda: Engine(gas(), CircleWalls(5.0), Hard(), dtMax=0.01,
+                                        eventDriven=True)}
+
+@pytest.mark.parametrize('kind', sorted(SCENARIOS))
+def test_profiled_equals_plain(kind):
+    engines = []
+    for prof in (None, Profiler(trace=True)):
+        np.random.seed(5)                    # Epidemic draws transmissions.
+        e = SCENARIOS[kind]()
+        e.profile(prof)
+        for _ in range(300):
+            e.step()
+        engines.append(e)
+    e, f = engines
+    for key in ('r', 'v', 'tag'):
+        np.testing.assert_array_equal(getattr(e.pars, key), getattr(f.pars, key))
+    assert e.t == f.t
+    np.testing.assert_array_equal(e.impulse, f.impulse)
+    assert f.prof.steps == 300
+    if kind in ('hard', 'fresh', 'epidemic'):
+        assert f.prof.counts['collisions'][0] > 0
+    if kind == 'epidemic':
+        assert f.prof.counts['infections'][0] > 0
+### END: FUNCTIONS
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Program: test_trajectory
+Created: Oct 2026
+@author: Ryan Clement (RRCC)
+         scisoft@outlook.com
+
+Trajectory files (see sim2d.trajectory) and the headless runs writing them
+(see runner.runHeadless): new runs replace the output, restarts continue
+it.
+"""
+
+### IMPORTS
+import argparse
+import os
+import numpy as np
+from sim2d import Particles
+from sim2d.runner import Progress
+from sim2d.scenario import Engine, BoxWalls, Hard
+from sim2d.trajectory import TrajectoryWriter, TrajectoryReader, truncate
+
+
+### FUNCTIONS
+def write(path,steps,append=False,**kwargs):
+    with TrajectoryWriter(path, append=append, **kwargs) as w:
+        for k in steps:
+            w(dict(step=k, x=np.full(3, float(k))))
+
+def test_writer_replaces(tmp_path):
+    path = str(tmp_path/'traj')
+    write(path, range(5), chunk=2)
+    write(path, range(3), chunk=2)
+    traj = TrajectoryReader(path)
+    np.testing.assert_array_equal(traj['step'], [0, 1, 2])
+    np.testing.assert_array_equal(traj['x'][:,0], [0.0, 1.0, 2.0])
+
+def test_writer_appends(tmp_path):
+    path = str(tmp_path/'traj')
+    write(path, range(3), chunk=2)
+    write(path, range(3, 5), append=True, chunk=2)
+    np.testing.assert_array_equal(TrajectoryReader(path)['step'], np.arange(5))
+
+def garbage(path,names=('step', 'x'),n=13):
+    # Bytes of a write that stopped before meta.json was updated.
+    for k in names:
+        with open(os.path.join(path, k + '.bin'), 'ab') as f:
+            f.write(b'\xff'*n)
+
+def test_truncate_exact(tmp_path):
+    path = str(tmp_path/'traj')
+    write(path, range(4))
+    garbage(path)
+    truncate(path, 4)                        # Nothing to drop but the garbage.
+    assert os.path.getsize(os.path.join(path, 'x.bin')) == 4*3*8
+    truncate(path, 2)
+    assert os.path.getsize(os.path.join(path, 'x.bin')) == 2*3*8
+    np.testing.assert_array_equal(TrajectoryReader(path)['step'], [0, 1])
+
+def test_append_after_partial_write(tmp_path):
+    path = str(tmp_path/'traj')
+    write(path, range(3))
+    garbage(path)
+    write(path, range(3, 5), append=True)
+    traj = TrajectoryReader(path)
+    np.testing.assert_array_equal(traj['step'], np.arange(5))
+    np.testing.assert_array_equal(traj['x'][:,2], np.arange(5.0))
+    assert os.path.getsize(os.path.join(path, 'x.bin')) == 5*3*8
+
+def headless(tmp_path,steps,restart=False,**kwargs):
+    """
+    Headless hard_box style run (see runner.runArgs for the arguments).
+    """
+    args = argparse.Namespace(headless=True, steps=steps, stride=10,
+                              out=str(tmp_path/'out'), checkpoint=None, every=1000,
+                              restart=restart, obs=None, obsEvery=None,
+                              profile=False, trace=None, quiet=False)
+    vars(args).update(kwargs)
+    rng = np.random.default_rng(2)
+    r = np.stack(np.meshgrid(np.arange(1.0, 10.0), np.arange(1.0, 10.0)), -1).reshape(-1, 2)
+    v = rng.normal(0.0, 1.0, r.shape)
+    pars = Particles(r[:,0], r[:,1], v[:,0], v[:,1], 0.2)
+    Engine(pars, BoxWalls(0.0, 10.0, 0.0, 10.0), Hard()).runHeadless(args)
+    return args
+
+def test_progress_throttled(capsys):
+    snaps = [dict(step=i, t=0.1*i) for i in range(0, 101, 10)]
+    show = Progress(100, interval=3600.0)
+    for snap in snaps:
+        show(snap)
+    lines = capsys.readouterr().out.splitlines()
+    assert [l.split()[2] for l in lines] == ['0', '100']   # First and last.
+    show = Progress(100, interval=0.0)
+    for snap in snaps:
+        show(snap)
+    assert len(capsys.readouterr().out.splitlines()) == len(snaps)
+
+def test_quiet(tmp_path,capsys):
+    headless(tmp_path, 20, quiet=True)
+    assert capsys.readouterr().out == ''
+
+def test_rerun_replaces(tmp_path,capsys):
+    headless(tmp_path, 20, obs=str(tmp_path/'obs'))
+    args = headless(tmp_path, 20, obs=str(tmp_path/'obs'))
+    np.testing.assert_array_equal(TrajectoryReader(args.out)['step'], [0, 10, 20])
+    np.testing.assert_array_equal(TrajectoryReader(args.obs)['step'], [0, 10, 20])
+
+def test_restart_continues(tmp_path,capsys):
+    ck = str(tmp_path/'c.npz')
+    full = headless(tmp_path/'full', 60, obs=str(tmp_path/'full'/'obs'))
+    headless(tmp_path, 40, checkpoint=ck, every=20, obs=str(tmp_path/'obs'))
+    part = headless(tmp_path, 60, checkpoint=ck, every=20, obs=str(tmp_path/'obs'),
+                    restart=True)
+    assert 'Restart from step 40' in capsys.readouterr().out
+    a, b = TrajectoryReader(full.out), TrajectoryReader(part.out)
+    np.testing.assert_array_equal(b['step'], np.arange(0, 70, 10))
+    np.testing.assert_array_equal(a['r'], b['r'])
+    np.testing.assert_array_equal(TrajectoryReader(full.obs)['ke'],
+                                  TrajectoryReader(part.obs)['ke'])
+
+def test_restart_after_partial_write(tmp_path,capsys):
+    ck = str(tmp_path/'c.npz')
+    full = headless(tmp_path/'full', 60)
+    part = headless(tmp_path, 40, checkpoint=ck, every=20)
+    garbage(part.out, ('step', 't', 'r', 'v'), 1000)
+    part = headless(tmp_path, 60, checkpoint=ck, every=20, restart=True)
+    a, b = TrajectoryReader(full.out), TrajectoryReader(part.out)
+    for k in ('step', 't', 'r', 'v'):
+        np.testing.assert_array_equal(a[k], b[k])
+        assert os.path.getsize(os.path.join(part.out, k + '.bin')) == \
+               os.path.getsize(os.path.join(full.out, k + '.bin'))
+### END: FUNCTIONS